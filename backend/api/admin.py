@@ -8,6 +8,7 @@ from .models import (
     GalleryImage,
     User,
     PasswordSetupToken,
+    QueuedEmail,
 )
 
 
@@ -163,3 +164,14 @@ class GalleryImageAdmin(admin.ModelAdmin):
     list_display = ("id", "page", "section", "display_order", "created_at")
     list_filter = ("page", "section")
     ordering = ("page", "section", "display_order")
+
+
+# ===============================
+# QUEUED EMAIL
+# ===============================
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "subject", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = ("created_at", "sent_at")
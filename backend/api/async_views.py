@@ -0,0 +1,74 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.functional import classproperty
+
+
+# ======================================================
+# ASYNC DRF VIEWS (ASGI_MODE, see config/asgi.py)
+# ======================================================
+class AsyncViewMixin:
+    """
+    Lets a DRF view / viewset define `async def` handlers.
+
+    With ASGI_MODE the view is a coroutine: async handlers are awaited on
+    the event loop (blocking work inside them goes through sync_to_async),
+    while sync handlers run together with authentication, permission and
+    throttle checks in the request's thread. One worker keeps serving other
+    requests while an upload waits on S3.
+
+    Under WSGI the view stays sync and async handlers run via async_to_sync,
+    so the sync handlers (public GETs) don't pay for an event loop.
+    """
+
+    @classproperty
+    def view_is_async(cls):
+        return settings.ASGI_MODE
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if settings.ASGI_MODE and not iscoroutinefunction(view):
+            # ViewSetMixin.as_view doesn't go through django's View.as_view
+            markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if settings.ASGI_MODE:
+            return self.adispatch(request, *args, **kwargs)
+
+        method = request.method.lower()
+        handler = getattr(self, method, None)
+        if iscoroutinefunction(handler):
+            setattr(self, method, async_to_sync(handler))
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        # APIView.dispatch with the handler awaited
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        method = request.method.lower()
+        if method in self.http_method_names:
+            handler = getattr(self, method, self.http_method_not_allowed)
+        else:
+            handler = self.http_method_not_allowed
+
+        try:
+            if iscoroutinefunction(handler):
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(self._handle)(handler, request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def _handle(self, handler, request, *args, **kwargs):
+        # Checks and a sync handler share one thread hop
+        self.initial(request, *args, **kwargs)
+        return handler(request, *args, **kwargs)
@@ -0,0 +1,135 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+# ======================================================
+# PER-PROCESS USER CACHE (full model, short TTL)
+# ======================================================
+class UserCache:
+    """
+    LRU of User rows keyed by id. Entries live AUTH_USER_CACHE_TTL seconds;
+    saves/deletes in this process drop them at once (see api.signals),
+    other workers see the change when their entry expires. Ids are keyed
+    as strings: tokens carry the id as a string, signals pass the pk.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Each request gets its own instance, the cached one is never handed out
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        ttl = settings.AUTH_USER_CACHE_TTL
+        if ttl <= 0:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            self._entries[user_id] = (copy.copy(user), time.monotonic() + ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.AUTH_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def invalidate_cached_user(user_id):
+    user_cache.invalidate(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication with the User lookup served from `user_cache`:
+    one SELECT per user per TTL instead of one per request. request.user
+    is a real User, so views that write through it keep working.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            user = user_cache.get(user_id)
+            if user is not None:
+                return user
+
+        user = super().get_user(validated_token)
+        user_cache.set(user_id, user)
+        return user
+
+
+# ======================================================
+# CLAIMS USER (no query, read-only endpoints)
+# ======================================================
+# Claims put in every token by CustomTokenObtainPairSerializer.get_token
+USER_CLAIMS = ("username", "email", "role")
+
+
+class ClaimsUser(TokenUser):
+    """
+    Stateless user built from a verified access token. Carries what the
+    dashboard permission checks read (id, username, email, role); it is
+    as fresh as the token, i.e. at most ACCESS_TOKEN_LIFETIME old.
+    """
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    """
+    For read-only endpoints: request.user is a ClaimsUser, no DB query.
+    Tokens issued before the claims existed fall back to the cached User.
+    """
+
+    def get_user(self, validated_token):
+        if all(claim in validated_token for claim in (jwt_settings.USER_ID_CLAIM, *USER_CLAIMS)):
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+
+class ClaimsOnReadMixin:
+    """
+    GET/HEAD/OPTIONS authenticate from token claims; writes keep the
+    default (cached full User) authentication. Actions that pass their own
+    authentication_classes (e.g. bulk exports) keep those.
+    """
+
+    def get_authenticators(self):
+        # @action(authentication_classes=...) lands on the instance
+        if self.request.method in SAFE_METHODS and "authentication_classes" not in vars(self):
+            return [ClaimsJWTAuthentication()]
+        return super().get_authenticators()
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from .models import Category, Event, GalleryImage, SystemSettings
+from .serializers import CategorySerializer, EventSerializer, GalleryImageSerializer
+
+
+# ======================================================
+# HEALTH / MAINTENANCE SNAPSHOT
+# ======================================================
+HEALTH_CACHE_KEY = "api:health:snapshot"
+
+
+def get_health_snapshot():
+    """
+    Returns the cached health/maintenance snapshot.
+    The DB is only probed (SELECT 1 + SystemSettings) when the snapshot
+    is missing, i.e. at most once per HEALTH_CHECK_INTERVAL seconds.
+    Raises whatever the DB raises on a failed probe (nothing is cached then).
+    """
+    snapshot = cache.get(HEALTH_CACHE_KEY)
+    if snapshot is not None:
+        return snapshot
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1;")
+
+    settings_obj = SystemSettings.get_settings()
+
+    # Date only matters when under maintenance is true
+    snapshot = {
+        "status": "ok",
+        "db": "ok",
+        "under_maintenance": settings_obj.under_maintenance,
+        "date_of_online": settings_obj.date_of_online if settings_obj.under_maintenance else None,
+    }
+    cache.set(HEALTH_CACHE_KEY, snapshot, getattr(settings, "HEALTH_CHECK_INTERVAL", 30))
+    return snapshot
+
+
+def invalidate_health_snapshot():
+    cache.delete(HEALTH_CACHE_KEY)
+
+
+# ======================================================
+# REGISTRATION STATS (exhibitors / visitors)
+# ======================================================
+def _stats_cache_key(model):
+    return f"api:stats:{model._meta.model_name}"
+
+
+def get_registration_stats(model):
+    """
+    Status counts plus per-event_location and per-day breakdowns for a
+    registration model. Computed from one GROUP BY query and cached until
+    a registration is created, changed or deleted; other workers only see
+    that with a shared CACHE_BACKEND, otherwise within
+    REGISTRATION_STATS_CACHE_TIMEOUT seconds.
+    """
+    key = _stats_cache_key(model)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+
+    rows = (
+        model.objects
+        .order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("status", "event_location", "day")
+        .annotate(count=Count("id"))
+    )
+
+    by_status = {value: 0 for value, _ in model.STATUS_CHOICES}
+    by_location = {}
+    by_day = {}
+    total = 0
+
+    for row in rows:
+        count = row["count"]
+        total += count
+        by_status[row["status"]] = by_status.get(row["status"], 0) + count
+        by_location[row["event_location"]] = by_location.get(row["event_location"], 0) + count
+        by_day[row["day"]] = by_day.get(row["day"], 0) + count
+
+    stats = {
+        "total": total,
+        "status": by_status,
+        "event_location": by_location,
+        "daily": [
+            {"date": day.isoformat(), "count": count}
+            for day, count in sorted(by_day.items())
+        ],
+    }
+    cache.set(key, stats, getattr(settings, "REGISTRATION_STATS_CACHE_TIMEOUT", 60))
+    return stats
+
+
+def invalidate_registration_stats(model):
+    cache.delete(_stats_cache_key(model))
+
+
+# ======================================================
+# PUBLIC RESPONSE CACHE (categories / events / gallery)
+# ======================================================
+# Entries are keyed under a per-resource stamp; invalidating replaces the
+# stamp so every cached page/filter of that resource goes stale at once.
+# Keep in sync with the viewsets' public_cache_resource.
+PUBLIC_CACHE_RESOURCES = {
+    Category: "categories",
+    Event: "events",
+    GalleryImage: "gallery",
+}
+
+
+def _public_stamp_key(resource):
+    return f"api:public:{resource}:stamp"
+
+
+def _new_stamp():
+    return {"version": time.time_ns(), "modified": int(time.time())}
+
+
+def get_public_stamp(resource):
+    key = _public_stamp_key(resource)
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, _new_stamp(), None)
+        stamp = cache.get(key) or _new_stamp()
+    return stamp
+
+
+def get_public_stamps(resources):
+    stamps = cache.get_many([_public_stamp_key(r) for r in resources])
+    return [stamps.get(_public_stamp_key(r)) or get_public_stamp(r) for r in resources]
+
+
+def invalidate_public_cache(resource):
+    # Only the stamp moves (once the change is visible to other connections,
+    # so nothing older gets cached under it); the bundle is rebuilt by the
+    # next GET that needs it
+    transaction.on_commit(lambda: cache.set(_public_stamp_key(resource), _new_stamp(), None))
+
+
+def get_public_response(resource, url, params, build):
+    """
+    Returns (data, etag, last_modified) for a public GET, calling `build()`
+    for the response data only on a miss. A hit costs two cache reads and
+    no DB queries.
+    """
+    stamp = get_public_stamp(resource)
+    digest = hashlib.md5(f"{url}?{urlencode(params, doseq=True)}".encode()).hexdigest()
+    key = f"api:public:{resource}:{stamp['version']}:{digest}"
+
+    entry = cache.get(key)
+    if entry is None:
+        data = build()
+        body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+        entry = (data, hashlib.md5(body).hexdigest())
+        cache.set(key, entry, getattr(settings, "PUBLIC_CACHE_TIMEOUT", 60 * 5))
+
+    return entry[0], entry[1], stamp["modified"]
+
+
+# ======================================================
+# PUBLIC BUNDLE (events + categories + gallery, one response)
+# ======================================================
+BUNDLE_RESOURCES = ("events", "categories", "gallery")
+# Last bundle built, served while another request rebuilds the current one
+BUNDLE_LAST_KEY = "api:public:bundle:last"
+# A rebuild that dies only holds the others on the last bundle this long
+BUNDLE_BUILD_TIMEOUT = 30
+
+
+def _bundle_key(stamps):
+    return "api:public:bundle:" + ":".join(str(stamp["version"]) for stamp in stamps)
+
+
+def build_public_bundle():
+    """
+    Active events, categories and every gallery image grouped as
+    {page: {section: [...]}}, serialized once to compact JSON bytes.
+    """
+    gallery = {}
+    images = GalleryImage.objects.order_by("page", "section", "display_order", "id")
+    for image in GalleryImageSerializer(images, many=True).data:
+        gallery.setdefault(image["page"], {}).setdefault(image["section"], []).append(image)
+
+    data = {
+        "events": EventSerializer(Event.objects.filter(is_active=True).order_by("start_date"), many=True).data,
+        "categories": CategorySerializer(Category.objects.order_by("id"), many=True).data,
+        "gallery": gallery,
+    }
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+def refresh_public_bundle(stamps=None):
+    stamps = stamps or get_public_stamps(BUNDLE_RESOURCES)
+    body = build_public_bundle()
+    entry = (body, hashlib.md5(body).hexdigest(), max(stamp["modified"] for stamp in stamps))
+    timeout = getattr(settings, "PUBLIC_CACHE_TIMEOUT", 60 * 5)
+    cache.set_many({_bundle_key(stamps): entry, BUNDLE_LAST_KEY: entry}, timeout)
+    return entry
+
+
+def get_public_bundle():
+    """
+    Returns (body_bytes, etag, last_modified). Writes only move the stamps,
+    so a batch of saves costs one rebuild: the first GET after a change
+    takes the build slot (cache.add) and the others get the last bundle
+    (with its own ETag/Last-Modified) until the new one is in.
+    """
+    stamps = get_public_stamps(BUNDLE_RESOURCES)
+    key = _bundle_key(stamps)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    if not cache.add(f"{key}:building", 1, BUNDLE_BUILD_TIMEOUT):
+        entry = cache.get(BUNDLE_LAST_KEY)
+        if entry is not None:
+            return entry
+    return refresh_public_bundle(stamps)
+
+
+# ======================================================
+# IDEMPOTENT SUBMISSIONS (Idempotency-Key header)
+# ======================================================
+# Needs a shared cache (CACHE_BACKEND) to hold across workers
+IDEMPOTENCY_PENDING = "pending"
+# A request that dies mid-way only blocks its key this long
+IDEMPOTENCY_PENDING_TIMEOUT = 30
+
+
+def _idempotency_key(scope, key):
+    return f"api:idempotency:{scope}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def begin_idempotent(scope, key):
+    """
+    Claims `key` with one atomic cache.add. Returns None when this request
+    owns it, IDEMPOTENCY_PENDING while the first request is still running,
+    or the stored {"status", "data"} of the finished one.
+    """
+    cache_key = _idempotency_key(scope, key)
+    if cache.add(cache_key, IDEMPOTENCY_PENDING, IDEMPOTENCY_PENDING_TIMEOUT):
+        return None
+    return cache.get(cache_key)
+
+
+def finish_idempotent(scope, key, status, data):
+    cache.set(
+        _idempotency_key(scope, key),
+        {"status": status, "data": data},
+        getattr(settings, "REGISTRATION_IDEMPOTENCY_TTL", 600),
+    )
+
+
+def abort_idempotent(scope, key):
+    # Failed requests (e.g. validation errors) may be retried with the same key
+    cache.delete(_idempotency_key(scope, key))
@@ -0,0 +1,369 @@
+import csv
+import io
+import zipfile
+from collections import defaultdict
+from contextlib import nullcontext
+from decimal import Decimal, InvalidOperation
+from xml.etree import ElementTree
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import models, transaction
+from rest_framework import serializers
+
+from .cache import invalidate_registration_stats
+from .models import ExhibitorRegistration, VisitorRegistration
+from .serializers import clean_email_address, clean_phone_number
+
+
+IMPORT_BATCH_SIZE = 2000
+# Per-row errors returned in the report; the counts are always exact
+IMPORT_MAX_REPORTED_ERRORS = 500
+
+# Model field holding the phone number, and the label the serializers use
+PHONE_FIELDS = {
+    ExhibitorRegistration: ("contact_number", "Contact number"),
+    VisitorRegistration: ("phone_number", "Phone number"),
+}
+
+# Spreadsheet headers (normalised, see _header_key) -> model field
+HEADER_ALIASES = {
+    "email": "email_address",
+    "e_mail": "email_address",
+    "location": "event_location",
+    "event": "event_location",
+    "company": "company_name",
+    "contact_person": "contact_person_name",
+    "address": "company_address",
+    "industry": "industry_interest",
+}
+PHONE_ALIASES = ("phone", "mobile", "phone_number", "contact_number", "mobile_number")
+
+
+class ImportFileError(Exception):
+    """The file as a whole can't be imported (bad format, missing columns)."""
+
+
+# ======================================================
+# READERS: yield (row_number, [cell, ...]) one row at a time
+# ======================================================
+def _csv_rows(file_obj):
+    text = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
+    try:
+        yield from enumerate(csv.reader(text), start=1)
+    except UnicodeDecodeError:
+        raise ImportFileError("CSV files must be UTF-8 encoded")
+    finally:
+        text.detach()  # leave the underlying upload open for its owner
+
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def _first_sheet(archive):
+    names = set(archive.namelist())
+    try:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        rel_id = workbook.find(f"{_NS}sheets/{_NS}sheet").get(f"{_REL_NS}id")
+        target = next(rel.get("Target") for rel in rels if rel.get("Id") == rel_id)
+        path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+        if path in names:
+            return path
+    except (KeyError, AttributeError, StopIteration, ElementTree.ParseError):
+        pass
+
+    sheets = sorted(n for n in names if n.startswith("xl/worksheets/") and n.endswith(".xml"))
+    if not sheets:
+        raise ImportFileError("No worksheet found in the XLSX file")
+    return sheets[0]
+
+
+def _shared_strings(archive):
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as fh:
+        for _, element in ElementTree.iterparse(fh):
+            if element.tag == f"{_NS}si":
+                strings.append("".join(t.text or "" for t in element.iter(f"{_NS}t")))
+                element.clear()
+    return strings
+
+
+def _column_index(ref):
+    # "C12" -> 2
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _xlsx_value(cell, strings):
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_NS}t"))
+
+    value = cell.findtext(f"{_NS}v") or ""
+    if kind == "s":
+        return strings[int(value)] if value else ""
+    if kind in (None, "n") and value:
+        # Phone numbers typed into Excel come back as 9812345678.0 / 9.812345678E9
+        try:
+            number = Decimal(value)
+        except InvalidOperation:
+            return value
+        if number == number.to_integral_value():
+            return str(int(number))
+    return value
+
+
+def _xlsx_rows(file_obj):
+    try:
+        archive = zipfile.ZipFile(file_obj)
+    except zipfile.BadZipFile:
+        raise ImportFileError("Not a valid XLSX file")
+
+    with archive:
+        strings = _shared_strings(archive)
+        with archive.open(_first_sheet(archive)) as sheet:
+            number = 0
+            for _, element in ElementTree.iterparse(sheet):
+                if element.tag != f"{_NS}row":
+                    continue
+
+                number = int(element.get("r") or number + 1)
+                values = []
+                for position, cell in enumerate(element.iter(f"{_NS}c")):
+                    ref = cell.get("r")
+                    column = _column_index(ref) if ref else position
+                    values.extend([""] * (column - len(values)))
+                    values.append(_xlsx_value(cell, strings))
+
+                yield number, values
+                element.clear()
+
+
+READERS = {
+    "csv": _csv_rows,
+    "xlsx": _xlsx_rows,
+}
+
+
+def detect_format(name, file_format=None):
+    if not file_format:
+        file_format = name.rsplit(".", 1)[-1] if "." in (name or "") else ""
+    file_format = file_format.lower()
+    if file_format not in READERS:
+        raise ImportFileError("Unsupported file type; upload a .csv or .xlsx file")
+    return file_format
+
+
+# ======================================================
+# COLUMN RULES (same as the serializers, applied per column)
+# ======================================================
+def _import_fields(model):
+    return [f for f in model._meta.concrete_fields if f.editable and not f.primary_key]
+
+
+def _header_key(value):
+    return "_".join(str(value).strip().lower().replace("-", " ").split())
+
+
+def _map_headers(model, header):
+    """Returns ({field name: column index}, [ignored headers])."""
+    names = {f.name for f in _import_fields(model)}
+    phone_field = PHONE_FIELDS[model][0]
+
+    columns, ignored = {}, []
+    for index, raw in enumerate(header):
+        key = _header_key(raw)
+        if key in PHONE_ALIASES:
+            key = phone_field
+        key = HEADER_ALIASES.get(key, key)
+
+        if key in names and key not in columns:
+            columns[key] = index
+        elif str(raw).strip():
+            ignored.append(str(raw).strip())
+    return columns, ignored
+
+
+def _uncell(value):
+    # Undo the formula guard added by api.exports so exports re-import cleanly
+    text = str(value).strip()
+    if text[:1] == "'" and text[1:2] in ("=", "@", "+", "-"):
+        return text[1:]
+    return text
+
+
+def _cleaner(model, field):
+    required = not field.blank and not field.has_default()
+    default = field.get_default() if field.has_default() else ""
+    choices = {}
+    for value, label in field.choices or ():
+        choices[str(value).lower()] = value
+        choices[str(label).lower()] = value
+
+    if field.name == "email_address":
+        specific = clean_email_address
+    elif field.name == PHONE_FIELDS[model][0]:
+        label = PHONE_FIELDS[model][1]
+        specific = lambda value: clean_phone_number(value, label=label)  # noqa: E731
+    else:
+        specific = None
+
+    def clean(value):
+        value = _uncell(value)
+        if specific:
+            value = specific(value)
+        if not value:
+            if required:
+                raise serializers.ValidationError("This field is required.")
+            return default
+        if choices:
+            if value.lower() not in choices:
+                raise serializers.ValidationError(f'"{value}" is not a valid choice.')
+            return choices[value.lower()]
+        if field.max_length and len(value) > field.max_length:
+            raise serializers.ValidationError(f"Ensure this field has no more than {field.max_length} characters.")
+        if isinstance(field, models.EmailField):
+            try:
+                validate_email(value)
+            except DjangoValidationError:
+                raise serializers.ValidationError("Enter a valid email address.")
+        return value
+
+    return clean
+
+
+def _validate_batch(model, names, cleaners, batch):
+    """
+    Cleans a batch column by column. Returns (instances, errors) where
+    errors is [(row_number, {field: message}), ...].
+    """
+    numbers = [number for number, _ in batch]
+    cleaned_columns = []
+    errors = defaultdict(dict)
+
+    for name, clean, column in zip(names, cleaners, zip(*(values for _, values in batch))):
+        cleaned = []
+        for i, value in enumerate(column):
+            try:
+                cleaned.append(clean(value))
+            except serializers.ValidationError as e:
+                errors[i][name] = str(e.detail[0])
+                cleaned.append(None)
+        cleaned_columns.append(cleaned)
+
+    instances = [
+        model(**dict(zip(names, values))).set_dedupe_key()
+        for i, values in enumerate(zip(*cleaned_columns))
+        if i not in errors
+    ]
+    return instances, [(numbers[i], errors[i]) for i in sorted(errors)]
+
+
+def _drop_duplicates(model, instances):
+    """
+    Leaves out rows whose dedupe_key is already stored or repeats within
+    the batch (dedupe_key is unique). Returns (instances, skipped).
+    """
+    stored = set(
+        model.objects
+        .filter(dedupe_key__in=[instance.dedupe_key for instance in instances])
+        .values_list("dedupe_key", flat=True)
+    )
+    fresh = {}
+    for instance in instances:
+        if instance.dedupe_key not in stored:
+            fresh.setdefault(instance.dedupe_key, instance)
+    return list(fresh.values()), len(instances) - len(fresh)
+
+
+# ======================================================
+# IMPORT
+# ======================================================
+def import_registrations(model, file_obj, file_format="csv", dry_run=False, atomic=False, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Streams rows from a CSV/XLSX file into `model` with bulk_create.
+    Invalid rows are skipped and reported, rows matching a stored
+    registration (or an earlier row) are counted as duplicates and
+    skipped; every batch commits on its own
+    unless `atomic`, in which case any invalid row rolls the whole import
+    back. `dry_run` validates without writing.
+    """
+    rows = READERS[file_format](file_obj)
+
+    header = next((values for _, values in rows if any(str(v).strip() for v in values)), None)
+    if header is None:
+        raise ImportFileError("The file is empty")
+
+    columns, ignored = _map_headers(model, header)
+    fields = _import_fields(model)
+    missing = [
+        f.name for f in fields
+        if f.name not in columns and not f.blank and not f.has_default()
+    ]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}")
+
+    names = list(columns)
+    indexes = [columns[name] for name in names]
+    cleaners = [_cleaner(model, model._meta.get_field(name)) for name in names]
+
+    report = {
+        "rows": 0,
+        "valid": 0,
+        "created": 0,
+        "failed": 0,
+        "duplicates": 0,
+        "errors": [],
+        "ignored_columns": ignored,
+        "dry_run": dry_run,
+        "atomic": atomic,
+    }
+
+    def flush(batch):
+        instances, errors = _validate_batch(model, names, cleaners, batch)
+        report["failed"] += len(errors)
+        room = IMPORT_MAX_REPORTED_ERRORS - len(report["errors"])
+        report["errors"].extend({"row": number, "errors": e} for number, e in errors[:max(room, 0)])
+
+        report["valid"] += len(instances)
+        instances, duplicates = _drop_duplicates(model, instances)
+        report["duplicates"] += duplicates
+        if instances and not dry_run:
+            with transaction.atomic():
+                model.objects.bulk_create(instances, batch_size=batch_size)
+            report["created"] += len(instances)
+
+    with transaction.atomic() if atomic else nullcontext():
+        batch = []
+        for number, values in rows:
+            if not any(str(v).strip() for v in values):
+                continue
+            values = list(values) + [""] * (len(header) - len(values))
+            batch.append((number, [values[i] for i in indexes]))
+            report["rows"] += 1
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        if atomic and report["failed"]:
+            transaction.set_rollback(True)
+
+    if atomic and report["failed"]:
+        report["created"] = 0
+    elif report["created"]:
+        # bulk_create skips post_save, so refresh cached stats here
+        invalidate_registration_stats(model)
+
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+    return report
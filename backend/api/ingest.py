@@ -0,0 +1,322 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, transaction
+
+from .cache import invalidate_registration_stats
+from .metrics import REGISTRATIONS_CREATED, event_location_label
+from .models import ExhibitorRegistration, VisitorRegistration
+
+
+logger = logging.getLogger(__name__)
+
+INGEST_MODELS = {
+    "exhibitor": ExhibitorRegistration,
+    "visitor": VisitorRegistration,
+}
+_KINDS = {model: kind for kind, model in INGEST_MODELS.items()}
+
+# A segment is flushed this long after it closes, so a write that started
+# just before the rollover has landed
+SEGMENT_GRACE_SECONDS = 2
+# A claimed segment untouched this long belongs to a flusher that died
+CLAIM_STALE_SECONDS = 300
+
+
+def buffered_ingest_enabled():
+    return settings.REGISTRATION_INGEST_MODE == "buffered"
+
+
+# ======================================================
+# JOURNAL (append side, called from the request)
+# ======================================================
+class Journal:
+    """
+    Append-only JSON-lines files, one per process per time segment:
+    <segment end>-<host>-<pid>.jsonl. A segment is never written after it
+    ends, so the flusher can take it without coordinating with writers.
+
+    sync="fsync" makes each record durable before the request is answered
+    (survives a host crash); sync="write" only hands it to the OS
+    (survives a worker crash, not a power loss).
+    """
+
+    def __init__(self, directory, sync="fsync", segment_seconds=1.0):
+        self.directory = Path(directory)
+        self.sync = sync
+        self.segment_seconds = segment_seconds
+        self._lock = threading.Lock()
+        self._file = None
+        self._segment_end = None
+        self._pid = None
+
+    def _open(self, now):
+        end = (int(now // self.segment_seconds) + 1) * self.segment_seconds
+        if self._file and self._segment_end == end and self._pid == os.getpid():
+            return self._file
+
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{end:.3f}-{socket.gethostname()}-{os.getpid()}.jsonl"
+        self._file = open(path, "ab", buffering=0)
+        self._segment_end, self._pid = end, os.getpid()
+        if self.sync == "fsync":
+            # Make the new directory entry durable too
+            fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return self._file
+
+    def append(self, record):
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode()
+        with self._lock:
+            fh = self._open(time.time())
+            fh.write(line)  # unbuffered: one write() per record
+            if self.sync == "fsync":
+                os.fsync(fh.fileno())
+
+    def close(self):
+        if self._file and self._pid == os.getpid():
+            self._file.close()
+        self._file = None
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    global _journal
+    config = (
+        settings.REGISTRATION_JOURNAL_DIR,
+        settings.REGISTRATION_JOURNAL_SYNC,
+        settings.REGISTRATION_JOURNAL_SEGMENT_SECONDS,
+    )
+    with _journal_lock:
+        if _journal is None or (str(_journal.directory), _journal.sync, _journal.segment_seconds) != config:
+            if _journal:
+                _journal.close()
+            _journal = Journal(*config)
+        return _journal
+
+
+def journal_registration(model, data):
+    """
+    Appends validated serializer data for `model` to the journal. Raises
+    OSError when the journal can't be written (caller falls back to a
+    direct save).
+    """
+    get_journal().append({
+        "kind": _KINDS[model],
+        "data": data,
+        "received_at": time.time(),
+    })
+    if settings.REGISTRATION_FLUSH_IN_PROCESS:
+        start_background_flusher()
+
+
+# ======================================================
+# FLUSH (flusher thread / `manage.py flush_registrations`)
+# ======================================================
+def _ready_segments(directory, now):
+    for path in sorted(directory.glob("*.jsonl")):
+        try:
+            end = float(path.name.split("-", 1)[0])
+        except ValueError:
+            continue
+        if end + SEGMENT_GRACE_SECONDS <= now:
+            yield path
+
+    # Claimed by a flusher that never finished: retry (stored rows are skipped by dedupe key)
+    for path in sorted(directory.glob("*.jsonl.flushing")):
+        try:
+            if path.stat().st_mtime + CLAIM_STALE_SECONDS <= now:
+                yield path
+        except FileNotFoundError:
+            continue
+
+
+def _claim(path):
+    claimed = path if path.suffix == ".flushing" else path.with_name(path.name + ".flushing")
+    try:
+        os.replace(path, claimed)
+        os.utime(claimed)
+    except FileNotFoundError:
+        return None  # another flusher got it first
+    return claimed
+
+
+def _read_records(path):
+    records = defaultdict(list)
+    with open(path, "rb") as fh:
+        for number, line in enumerate(fh, start=1):
+            try:
+                record = json.loads(line)
+                records[INGEST_MODELS[record["kind"]]].append(record)
+            except (ValueError, KeyError, TypeError):
+                # Torn last line after a crash, or a foreign file
+                logger.warning("Skipping unreadable journal line %s:%s", path.name, number)
+    return records
+
+
+def _received_at(record):
+    received_at = record.get("received_at")
+    return datetime.fromtimestamp(received_at, tz=timezone.utc) if received_at else None
+
+
+def _backdate(model, instances, batch_size):
+    # bulk_create stamps auto_now_add created_at with the flush time; list
+    # order, cursor pages and per-day stats need the time of the request
+    instances = [i for i in instances if i.pk and i._received_at]
+    for instance in instances:
+        instance.created_at = instance._received_at
+    model.objects.bulk_update(instances, ["created_at"], batch_size=batch_size)
+
+
+def _rejection(record, error):
+    # Readable by _read_records, so a requeued file flushes like a segment
+    return {**record, "error": str(error)}
+
+
+def _insert(model, records, batch_size, rejected):
+    fresh = {}
+    for record in records:
+        try:
+            instance = model(**record["data"]).set_dedupe_key()
+        except (TypeError, ValueError) as e:
+            rejected.append(_rejection(record, e))
+            continue
+        instance._received_at = _received_at(record)
+        fresh.setdefault(instance.dedupe_key, (instance, record))
+
+    # Duplicate submissions (and a replayed segment) are already stored
+    stored = model.objects.filter(dedupe_key__in=list(fresh)).values_list("dedupe_key", flat=True)
+    for dedupe_key in stored:
+        fresh.pop(dedupe_key, None)
+
+    try:
+        with transaction.atomic():
+            instances = model.objects.bulk_create([instance for instance, _ in fresh.values()], batch_size=batch_size)
+            _backdate(model, instances, batch_size)
+        return [record["data"] for _, record in fresh.values()]
+    except DatabaseError:
+        pass
+
+    # Find the bad rows one by one; the rest still go in
+    inserted = []
+    for instance, record in fresh.values():
+        try:
+            with transaction.atomic():
+                _backdate(model, model.objects.bulk_create([instance]), batch_size)
+            inserted.append(record["data"])
+        except DatabaseError as e:
+            if isinstance(e, IntegrityError) and model.objects.filter(dedupe_key=instance.dedupe_key).exists():
+                continue  # the same submission was stored directly in the meantime
+            rejected.append(_rejection(record, e))
+    return inserted
+
+
+def flush_journal(batch_size=None, now=None):
+    """
+    Bulk-inserts every closed journal segment. Returns (created, rejected).
+    Rows the database refuses are kept in <segment>.rejected until an
+    operator requeues them (see rejected_segments / requeue_rejected).
+    """
+    directory = Path(settings.REGISTRATION_JOURNAL_DIR)
+    if not directory.is_dir():
+        return 0, 0
+
+    batch_size = batch_size or settings.REGISTRATION_FLUSH_BATCH_SIZE
+    now = time.time() if now is None else now
+    created = rejected_count = 0
+
+    for path in _ready_segments(directory, now):
+        claimed = _claim(path)
+        if claimed is None:
+            continue
+
+        rejected = []
+        for model, records in _read_records(claimed).items():
+            for start in range(0, len(records), batch_size):
+                inserted = _insert(model, records[start:start + batch_size], batch_size, rejected)
+                created += len(inserted)
+
+                # bulk_create skips post_save, so do what the signal would
+                invalidate_registration_stats(model)
+                for location, count in Counter(row.get("event_location") for row in inserted).items():
+                    REGISTRATIONS_CREATED.labels(_KINDS[model], event_location_label(location)).inc(count)
+
+        if rejected:
+            rejected_count += len(rejected)
+            with open(claimed.with_name(claimed.name.replace(".flushing", ".rejected")), "a") as fh:
+                fh.writelines(json.dumps(r, default=str) + "\n" for r in rejected)
+            logger.error("%s journal rows rejected by the database (%s)", len(rejected), claimed.name)
+
+        claimed.unlink()
+
+    return created, rejected_count
+
+
+def rejected_segments():
+    """[(path, rows), ...] for every <segment>.rejected file in the journal."""
+    directory = Path(settings.REGISTRATION_JOURNAL_DIR)
+    if not directory.is_dir():
+        return []
+
+    segments = []
+    for path in sorted(directory.glob("*.jsonl.rejected")):
+        try:
+            with open(path, "rb") as fh:
+                segments.append((path, sum(1 for _ in fh)))
+        except FileNotFoundError:
+            continue  # requeued meanwhile
+    return segments
+
+
+def requeue_rejected():
+    """
+    Puts every .rejected file back in the journal as a closed segment, so
+    the next flush retries its rows (once the cause is fixed). Returns the
+    number of rows requeued.
+    """
+    requeued = 0
+    for path, rows in rejected_segments():
+        os.replace(path, path.with_name(path.name.removesuffix(".rejected")))
+        requeued += rows
+    return requeued
+
+
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def _flush_forever():
+    while True:
+        time.sleep(settings.REGISTRATION_FLUSH_INTERVAL)
+        try:
+            flush_journal()
+        except Exception:
+            logger.exception("Registration journal flush failed")
+        finally:
+            close_old_connections()
+
+
+def start_background_flusher():
+    """Starts this process's flusher thread once (after fork, on first use)."""
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_forever, name="registration-flusher", daemon=True)
+            _flusher.start()
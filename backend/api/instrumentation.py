@@ -0,0 +1,125 @@
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+
+
+# ======================================================
+# PER-REQUEST TIMINGS (set by RequestTimingMiddleware)
+# ======================================================
+# Components reported in Server-Timing / logs, in display order
+TIMED_COMPONENTS = ("db", "s3", "smtp")
+
+_current = ContextVar("api_request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Call counts and seconds spent per component for one request.
+    Pool threads share the instance through contextvars.copy_context(),
+    so their time is summed (it can exceed the wall time).
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.counts = dict.fromkeys(TIMED_COMPONENTS, 0)
+        self.seconds = dict.fromkeys(TIMED_COMPONENTS, 0.0)
+        self._lock = threading.Lock()
+
+    def add(self, component, seconds):
+        with self._lock:
+            self.counts[component] += 1
+            self.seconds[component] += seconds
+
+    def elapsed(self):
+        return perf_counter() - self.started
+
+
+def start_request_timings():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def stop_request_timings(token):
+    _current.reset(token)
+
+
+@contextmanager
+def track(component):
+    """
+    Times the enclosed block as `component` ("db", "s3", "smtp") when a
+    request is being timed; a no-op otherwise (workers, shell, tests).
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(component, perf_counter() - start)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    # Installed with connection.execute_wrapper() for the whole request
+    with track("db"):
+        return execute(sql, params, many, context)
+
+
+# ======================================================
+# ROLLING PERCENTILES PER ROUTE (in-process)
+# ======================================================
+class RouteStats:
+    """
+    Keeps the last `window` samples per route and reports p50/p95/p99.
+    Every gunicorn worker has its own copy.
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, db_queries):
+        with self._lock:
+            self._samples[route].append((seconds, db_queries))
+            self._totals[route] += 1
+
+    @staticmethod
+    def _percentile(ordered, pct):
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def snapshot(self):
+        with self._lock:
+            samples = {route: list(values) for route, values in self._samples.items()}
+            totals = dict(self._totals)
+
+        report = {}
+        for route, values in sorted(samples.items()):
+            durations = sorted(v[0] for v in values)
+            queries = sorted(v[1] for v in values)
+            report[route] = {
+                "requests": totals[route],
+                "window": len(values),
+                "p50_ms": round(self._percentile(durations, 50) * 1000, 2),
+                "p95_ms": round(self._percentile(durations, 95) * 1000, 2),
+                "p99_ms": round(self._percentile(durations, 99) * 1000, 2),
+                "max_ms": round(durations[-1] * 1000, 2),
+                "p95_db_queries": self._percentile(queries, 95),
+            }
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+route_stats = RouteStats(window=getattr(settings, "REQUEST_TIMING_WINDOW", 1000))
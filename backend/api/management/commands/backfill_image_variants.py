@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Category, GalleryImage
+from api.utils import schedule_image_variants
+
+
+class Command(BaseCommand):
+    help = (
+        "Build responsive variants for categories and gallery images that have none "
+        "(e.g. jobs lost when a web process restarted before encoding finished)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Stop after this many rows per model.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that need variants.")
+
+    def handle(self, *args, **options):
+        total_failed = 0
+        for model in (Category, GalleryImage):
+            pending = (
+                model.objects
+                .filter(variants={})
+                .exclude(image__isnull=True)
+                .exclude(image="")
+                .order_by("id")
+            )
+            if options["limit"]:
+                pending = pending[:options["limit"]]
+
+            if options["dry_run"]:
+                self.stdout.write(f"{model.__name__}: {pending.count()} without variants")
+                continue
+
+            built = failed = 0
+            for instance in pending.iterator():
+                try:
+                    # Inline, so a failure is reported here instead of on the thread pool
+                    schedule_image_variants(instance, sync=True)
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f"{model.__name__} {instance.pk} ({instance.image}): {e}"))
+                    failed += 1
+                    continue
+                built += bool(instance.variants)
+
+            self.stdout.write(f"{model.__name__}: built={built} failed={failed}")
+            total_failed += failed
+
+        if total_failed:
+            raise CommandError(f"{total_failed} image(s) could not be processed")
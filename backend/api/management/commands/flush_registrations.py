@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from api.ingest import flush_journal, rejected_segments, requeue_rejected
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert buffered registration submissions from the local journal (REGISTRATION_INGEST_MODE=buffered)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--loop", action="store_true", help="Keep flushing instead of exiting once the journal is drained.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep between flushes.")
+        parser.add_argument(
+            "--requeue-rejected",
+            action="store_true",
+            help="Move rows the database refused (<segment>.rejected) back into the journal before flushing.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue_rejected"]:
+            self.stdout.write(f"requeued={requeue_rejected()}")
+
+        while True:
+            created, rejected = flush_journal(batch_size=options["batch_size"])
+
+            if created or rejected:
+                self.stdout.write(f"created={created} rejected={rejected}")
+            if rejected:
+                self.report_rejected()
+
+            if not options["loop"]:
+                break
+
+            close_old_connections()
+            try:
+                time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                break
+
+        # One-off runs (cron, deploy hooks) fail while refused rows are waiting
+        total = sum(rows for _, rows in rejected_segments())
+        if total and not options["loop"]:
+            if not rejected:
+                self.report_rejected()
+            raise CommandError(f"{total} registration(s) rejected; fix the cause and rerun with --requeue-rejected")
+
+    def report_rejected(self):
+        for path, rows in rejected_segments():
+            self.stderr.write(self.style.ERROR(f"{path}: {rows} rejected row(s)"))
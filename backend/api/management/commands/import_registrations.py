@@ -0,0 +1,59 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import IMPORT_BATCH_SIZE, ImportFileError, detect_format, import_registrations
+from api.models import ExhibitorRegistration, VisitorRegistration
+
+
+MODELS = {
+    "exhibitors": ExhibitorRegistration,
+    "visitors": VisitorRegistration,
+}
+
+
+class Command(BaseCommand):
+    help = "Bulk import exhibitor/visitor registrations from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(MODELS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "xlsx"], help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing.")
+        parser.add_argument("--atomic", action="store_true", help="Import nothing if any row is invalid.")
+        parser.add_argument("--errors-file", help="Write the per-row errors to this JSON file.")
+
+    def handle(self, *args, **options):
+        try:
+            file_format = detect_format(options["path"], options["format"])
+            started = time.perf_counter()
+            with open(options["path"], "rb") as fh:
+                report = import_registrations(
+                    MODELS[options["kind"]],
+                    fh,
+                    file_format=file_format,
+                    dry_run=options["dry_run"],
+                    atomic=options["atomic"],
+                    batch_size=options["batch_size"],
+                )
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"rows={report['rows']} valid={report['valid']} created={report['created']} "
+            f"failed={report['failed']} duplicates={report['duplicates']} in {elapsed:.2f}s"
+        )
+        if report["ignored_columns"]:
+            self.stdout.write(f"ignored columns: {', '.join(report['ignored_columns'])}")
+
+        if options["errors_file"]:
+            with open(options["errors_file"], "w") as fh:
+                json.dump(report["errors"], fh, indent=2)
+        else:
+            for error in report["errors"][:20]:
+                self.stderr.write(f"row {error['row']}: {error['errors']}")
+            if report["failed"] > 20:
+                self.stderr.write(f"... {report['failed'] - 20} more (use --errors-file)")
@@ -0,0 +1,161 @@
+import datetime
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import PUBLIC_CACHE_RESOURCES, invalidate_public_cache, invalidate_registration_stats
+from api.models import Category, Event, ExhibitorRegistration, GalleryImage, VisitorRegistration
+
+
+FIRST_NAMES = ["Ravi", "Anita", "Rahul", "Priya", "Arjun", "Meera", "Vikram", "Sneha", "Karan", "Divya"]
+LAST_NAMES = ["Shah", "Patel", "Sharma", "Iyer", "Gupta", "Reddy", "Singh", "Nair", "Das", "Mehta"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell", "Soylent", "Cyberdyne"]
+LOCATIONS = ["Delhi", "Mumbai", "Bengaluru", "Dubai"]
+STATUSES = ["pending", "contacted", "paid", "rejected"]
+PRODUCT_CATEGORIES = ["Apparel", "Home Textiles", "Technical Textiles", "Yarn", "Fabric", "Machinery"]
+
+# (page, section) pairs the site actually renders
+GALLERY_SECTIONS = [
+    ("home", "hero"),
+    ("home", "below_hero"),
+    ("about", "banner"),
+    ("about", "why_exhibit"),
+    ("about", "why_choose_igtf"),
+    ("gallery", "main"),
+    ("gallery", "exhibition_moments"),
+]
+
+
+# ======================================================
+# ROW GENERATORS (deterministic for a given index / seed)
+# ======================================================
+def visitor_rows(count, start=0):
+    for i in range(start, start + count):
+        row = VisitorRegistration(
+            event_location=LOCATIONS[i % len(LOCATIONS)],
+            first_name=FIRST_NAMES[i % len(FIRST_NAMES)],
+            last_name=LAST_NAMES[(i // 10) % len(LAST_NAMES)],
+            company_name=f"{COMPANIES[(i // 100) % len(COMPANIES)]} {i % 997}",
+            email_address=f"visitor{i}@example.com",
+            phone_number=f"98{i:08d}",
+            industry_interest="Textiles",
+            status=STATUSES[i % len(STATUSES)],
+        )
+        yield row.set_dedupe_key()
+
+
+def exhibitor_rows(count, start=0):
+    for i in range(start, start + count):
+        row = ExhibitorRegistration(
+            event_location=LOCATIONS[i % len(LOCATIONS)],
+            company_name=f"{COMPANIES[i % len(COMPANIES)]} {i % 991}",
+            contact_person_name=f"{FIRST_NAMES[(i // 10) % len(FIRST_NAMES)]} {LAST_NAMES[i % len(LAST_NAMES)]}",
+            designation="Director",
+            email_address=f"exhibitor{i}@example.com",
+            contact_number=f"97{i:08d}",
+            product_category=PRODUCT_CATEGORIES[i % len(PRODUCT_CATEGORIES)],
+            company_address=f"{i} Industrial Area, {LOCATIONS[i % len(LOCATIONS)]}",
+            status=STATUSES[(i // 3) % len(STATUSES)],
+        )
+        yield row.set_dedupe_key()
+
+
+def event_rows(count, rng):
+    first = datetime.date.today()
+    for i in range(count):
+        start = first + datetime.timedelta(days=30 * i + rng.randrange(7))
+        yield Event(
+            title=f"IGTF {LOCATIONS[i % len(LOCATIONS)]} {start.year} #{i}",
+            location=LOCATIONS[i % len(LOCATIONS)],
+            venue=f"Expo Centre Hall {i % 5 + 1}",
+            start_date=start,
+            end_date=start + datetime.timedelta(days=2),
+            is_active=i % 4 != 3,
+            description="Seeded event",
+        )
+
+
+def gallery_rows(count):
+    # Fake URLs: nothing is uploaded, the list endpoints only return them
+    for i in range(count):
+        page, section = GALLERY_SECTIONS[i % len(GALLERY_SECTIONS)]
+        yield GalleryImage(
+            page=page,
+            section=section,
+            image=f"https://example.com/seed/gallery/{i}.jpg",
+            display_order=i // len(GALLERY_SECTIONS) + 1,
+        )
+
+
+def category_rows(count):
+    for i in range(count):
+        yield Category(
+            name=f"{PRODUCT_CATEGORIES[i % len(PRODUCT_CATEGORIES)]} {i}",
+            image=f"https://example.com/seed/categories/{i}.jpg",
+        )
+
+
+def bulk_insert(model, rows, batch_size):
+    """bulk_create in batches without materialising every row; returns the count."""
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+class Command(BaseCommand):
+    help = "Fill the database with synthetic registrations, events, categories and gallery images (for benchmarks / local testing)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exhibitors", type=int, default=1000)
+        parser.add_argument("--visitors", type=int, default=5000)
+        parser.add_argument("--events", type=int, default=8)
+        parser.add_argument("--categories", type=int, default=12)
+        parser.add_argument("--gallery", type=int, default=35)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, so runs are reproducible.")
+        parser.add_argument("--clear", action="store_true", help="Delete existing rows of the seeded models first.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        models = [ExhibitorRegistration, VisitorRegistration, Event, Category, GalleryImage]
+
+        with transaction.atomic():
+            if options["clear"]:
+                for model in models:
+                    model.objects.all().delete()
+
+            # Continue numbering after existing rows so emails stay unique
+            created = {
+                "exhibitors": bulk_insert(
+                    ExhibitorRegistration,
+                    exhibitor_rows(options["exhibitors"], start=ExhibitorRegistration.objects.count()),
+                    batch_size,
+                ),
+                "visitors": bulk_insert(
+                    VisitorRegistration,
+                    visitor_rows(options["visitors"], start=VisitorRegistration.objects.count()),
+                    batch_size,
+                ),
+                "events": bulk_insert(Event, event_rows(options["events"], rng), batch_size),
+                "categories": bulk_insert(Category, category_rows(options["categories"]), batch_size),
+                "gallery": bulk_insert(GalleryImage, gallery_rows(options["gallery"]), batch_size),
+            }
+
+            # bulk_create skips the post_save signals that normally do this
+            invalidate_registration_stats(ExhibitorRegistration)
+            invalidate_registration_stats(VisitorRegistration)
+            for resource in PUBLIC_CACHE_RESOURCES.values():
+                invalidate_public_cache(resource)
+
+        self.stdout.write(" ".join(f"{name}={count}" for name, count in created.items()))
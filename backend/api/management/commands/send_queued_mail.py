@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.emails import purge_queued_mail, send_queued_mail
+
+
+# Seconds between retention purges while looping
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails (invitations, OTPs, password resets) with retries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when the queue is empty.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep between polls when idle.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        next_purge = 0
+
+        while True:
+            if time.monotonic() >= next_purge:
+                # Delivered/failed rows past EMAIL_QUEUE_RETENTION_DAYS
+                purged = purge_queued_mail()
+                if purged:
+                    self.stdout.write(f"purged={purged}")
+                next_purge = time.monotonic() + PURGE_INTERVAL
+
+            sent, failed = send_queued_mail(batch_size=batch_size)
+
+            if sent or failed:
+                self.stdout.write(f"sent={sent} failed={failed}")
+                continue
+
+            if not options["loop"]:
+                break
+
+            try:
+                time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                break
@@ -0,0 +1,145 @@
+import os
+import time
+
+from django.db.models import Count
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .models import Event, QueuedEmail
+
+
+# ======================================================
+# METRICS (Prometheus client)
+# ======================================================
+# With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py) every worker
+# writes to its own mmap file and a scrape merges them; updates are a
+# lock + memory write, cheap enough for the request path.
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds",
+    "Request latency by view, method and status",
+    ["view", "method", "status"],
+)
+
+REGISTRATIONS_CREATED = Counter(
+    "api_registrations_created_total",
+    "Exhibitor/visitor registrations created",
+    ["kind", "event_location"],
+)
+
+UPLOAD_BYTES = Counter(
+    "api_upload_bytes_total",
+    "Bytes written to S3 by image uploads (deduplicated uploads send none)",
+    ["folder", "result"],
+)
+
+UPLOAD_LATENCY = Histogram(
+    "api_upload_duration_seconds",
+    "Time spent storing an upload (hashing, dedupe lookup, S3 transfer)",
+    ["folder", "result"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+OTP_EVENTS = Counter(
+    "api_otp_events_total",
+    "OTP sends and verification outcomes",
+    ["action", "outcome"],
+)
+
+DB_CONNECTIONS_OPENED = Counter(
+    "api_db_connections_opened_total",
+    "New database connections; compare with request count for reuse",
+    ["alias"],
+)
+
+
+# event_location is free text on a public form: only the locations of
+# active events become label values, anything else is "other"
+EVENT_LOCATIONS_TTL = 300
+_event_locations = (0.0, frozenset())
+
+
+def _active_event_locations():
+    global _event_locations
+    expires, locations = _event_locations
+    if expires <= time.monotonic():
+        locations = frozenset(
+            location.strip().lower()
+            for location in Event.objects.filter(is_active=True).values_list("location", flat=True)
+        )
+        _event_locations = (time.monotonic() + EVENT_LOCATIONS_TTL, locations)
+    return locations
+
+
+def invalidate_event_locations():
+    global _event_locations
+    _event_locations = (0.0, frozenset())
+
+
+def event_location_label(value):
+    value = (value or "").strip().lower()
+    if not value:
+        return "unknown"
+    return value if value in _active_event_locations() else "other"
+
+
+# ======================================================
+# SCRAPE-TIME GAUGES (read from the DB, not the hot path)
+# ======================================================
+class EmailQueueCollector:
+    def describe(self):
+        # Nothing to describe up front, so registering doesn't query the DB
+        return []
+
+    def collect(self):
+        counts = dict(
+            QueuedEmail.objects.order_by()
+            .values_list("status")
+            .annotate(count=Count("id"))
+        )
+        gauge = GaugeMetricFamily(
+            "api_email_queue_depth",
+            "Queued emails by status",
+            labels=["status"],
+        )
+        for status, _ in QueuedEmail.STATUS_CHOICES:
+            gauge.add_metric([status], counts.get(status, 0))
+        yield gauge
+
+
+class RejectedRegistrationsCollector:
+    # Per host: the journal is local to each web server
+    def describe(self):
+        return []
+
+    def collect(self):
+        from .ingest import rejected_segments  # ingest imports this module
+
+        yield GaugeMetricFamily(
+            "api_registrations_rejected_rows",
+            "Buffered registrations the database refused, waiting in <segment>.rejected files",
+            value=sum(rows for _, rows in rejected_segments()),
+        )
+
+
+_scrape_registry = CollectorRegistry(auto_describe=False)
+_scrape_registry.register(EmailQueueCollector())
+_scrape_registry.register(RejectedRegistrationsCollector())
+
+
+def render_metrics():
+    """Returns (body, content_type) in the Prometheus text format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry) + generate_latest(_scrape_registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,121 @@
+import json
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from .instrumentation import (
+    TIMED_COMPONENTS,
+    db_execute_wrapper,
+    route_stats,
+    start_request_timings,
+    stop_request_timings,
+)
+from .metrics import REQUEST_LATENCY
+
+
+logger = logging.getLogger("api.timing")
+
+
+# ======================================================
+# REQUEST TIMING (enabled with REQUEST_TIMING=True)
+# ======================================================
+class RequestTimingMiddleware:
+    """
+    Times every request: wall time, DB queries (count + time), S3 and
+    SMTP time. Adds a Server-Timing header, logs one JSON line per request
+    and feeds the per-route percentiles behind /api/metrics/timings/.
+    Streaming responses are timed until the first byte is ready.
+    Sync only: the DB wrappers must sit in the thread that runs the queries
+    (under ASGI that costs one thread hop per request).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings, token = start_request_timings()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(db_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            stop_request_timings(token)
+
+        total = timings.elapsed()
+        route = self._route(request)
+        route_stats.record(route, total, timings.counts["db"])
+
+        metrics = [f'total;dur={total * 1000:.1f}']
+        for component in TIMED_COMPONENTS:
+            if timings.counts[component]:
+                metrics.append(
+                    f'{component};dur={timings.seconds[component] * 1000:.1f};'
+                    f'desc="{timings.counts[component]} calls"'
+                )
+        response["Server-Timing"] = ", ".join(metrics)
+
+        logger.info(json.dumps({
+            "event": "request",
+            "method": request.method,
+            "route": route,
+            "path": request.path,
+            "status": response.status_code,
+            "ms": round(total * 1000, 2),
+            **{f"{c}_calls": timings.counts[c] for c in TIMED_COMPONENTS},
+            **{f"{c}_ms": round(timings.seconds[c] * 1000, 2) for c in TIMED_COMPONENTS},
+        }))
+        return response
+
+    @staticmethod
+    def _route(request):
+        return f"{request.method} {view_label(request)}"
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    return (match.view_name or match.route) if match else "unmatched"
+
+
+# ======================================================
+# PROMETHEUS REQUEST METRICS (enabled with METRICS_ENABLED=True)
+# ======================================================
+class PrometheusMetricsMiddleware:
+    """
+    Observes api_request_duration_seconds{view, method, status}; one
+    histogram update per request, nothing inside the views.
+    Sync and async capable, so ASGI requests don't hop threads here.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    @staticmethod
+    def _observe(request, response, started):
+        REQUEST_LATENCY.labels(
+            view_label(request),
+            request.method,
+            str(response.status_code),
+        ).observe(perf_counter() - started)
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_alter_category_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exhibitorregistration',
+            index=models.Index(fields=['-created_at'], name='exhibitor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exhibitorregistration',
+            index=models.Index(fields=['status', '-created_at'], name='exhibitor_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exhibitorregistration',
+            index=models.Index(fields=['event_location', '-created_at'], name='exhibitor_location_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exhibitorregistration',
+            index=models.Index(fields=['email_address'], name='exhibitor_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorregistration',
+            index=models.Index(fields=['-created_at'], name='visitor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorregistration',
+            index=models.Index(fields=['status', '-created_at'], name='visitor_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorregistration',
+            index=models.Index(fields=['event_location', '-created_at'], name='visitor_location_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorregistration',
+            index=models.Index(fields=['email_address'], name='visitor_email_idx'),
+        ),
+    ]
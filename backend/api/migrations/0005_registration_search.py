@@ -0,0 +1,109 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+TABLES = {
+    "api_exhibitorregistration": "ExhibitorRegistration",
+    "api_visitorregistration": "VisitorRegistration",
+}
+
+# Frozen copies of api.search as of this migration; later edits there
+# must not change what replaying this migration builds
+SEARCH_FIELDS = {
+    "api_exhibitorregistration": (
+        "company_name",
+        "contact_person_name",
+        "email_address",
+        "contact_number",
+    ),
+    "api_visitorregistration": (
+        "first_name",
+        "last_name",
+        "company_name",
+        "email_address",
+        "phone_number",
+    ),
+}
+
+
+def search_index(table):
+    return GinIndex(
+        SearchVector(*SEARCH_FIELDS[table], config="simple"),
+        name=f"{table[4:]}_search_idx",
+    )
+
+
+def sqlite_fts_sql(table):
+    fts = f"{table}_fts"
+    cols = SEARCH_FIELDS[table]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', prefix='2 3')",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def sqlite_fts_drop_sql(table):
+    fts = f"{table}_fts"
+    return [
+        f"DROP TRIGGER IF EXISTS {fts}_ai",
+        f"DROP TRIGGER IF EXISTS {fts}_ad",
+        f"DROP TRIGGER IF EXISTS {fts}_au",
+        f"DROP TABLE IF EXISTS {fts}",
+    ]
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    for table, model_name in TABLES.items():
+        if vendor == "postgresql":
+            model = apps.get_model("api", model_name)
+            schema_editor.add_index(model, search_index(table))
+        elif vendor == "sqlite":
+            try:
+                for sql in sqlite_fts_sql(table):
+                    schema_editor.execute(sql)
+            except Exception:
+                # SQLite built without FTS5 - search falls back to icontains
+                for sql in sqlite_fts_drop_sql(table):
+                    schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    for table, model_name in TABLES.items():
+        if vendor == "postgresql":
+            model = apps.get_model("api", model_name)
+            schema_editor.remove_index(model, search_index(table))
+        elif vendor == "sqlite":
+            for sql in sqlite_fts_drop_sql(table):
+                schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_registration_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
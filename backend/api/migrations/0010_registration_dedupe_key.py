@@ -0,0 +1,123 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:36
+
+import hashlib
+
+from django.db import migrations, models
+
+
+PHONE_FIELDS = {
+    "ExhibitorRegistration": "contact_number",
+    "VisitorRegistration": "phone_number",
+}
+
+# Frozen copies of api.models.registration_dedupe_key and the FTS5 setup
+# from 0005_registration_search, as of this migration
+SEARCH_FIELDS = {
+    "api_exhibitorregistration": (
+        "company_name",
+        "contact_person_name",
+        "email_address",
+        "contact_number",
+    ),
+    "api_visitorregistration": (
+        "first_name",
+        "last_name",
+        "company_name",
+        "email_address",
+        "phone_number",
+    ),
+}
+
+
+def registration_dedupe_key(email, phone, event_location):
+    raw = "|".join((
+        (email or "").strip().lower(),
+        "".join(filter(str.isdigit, phone or "")),
+        (event_location or "").strip().lower(),
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def sqlite_fts_sql(table):
+    fts = f"{table}_fts"
+    cols = SEARCH_FIELDS[table]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', prefix='2 3')",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def backfill_dedupe_keys(apps, schema_editor):
+    for model_name, phone_field in PHONE_FIELDS.items():
+        model = apps.get_model("api", model_name)
+        batch = []
+        for row in model.objects.only("id", "email_address", phone_field, "event_location").iterator(chunk_size=2000):
+            row.dedupe_key = registration_dedupe_key(row.email_address, getattr(row, phone_field), row.event_location)
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ["dedupe_key"])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ["dedupe_key"])
+
+
+def restore_sqlite_search(apps, schema_editor):
+    # Adding a NOT NULL column remakes the table on SQLite, dropping the FTS triggers
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for model_name in PHONE_FIELDS:
+        table = apps.get_model("api", model_name)._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [f"{table}_fts"])
+            if cursor.fetchone() is None:
+                continue  # built without FTS5
+        for sql in sqlite_fts_sql(table):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_storedfile'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after RemoveField has remade the tables
+        migrations.RunPython(migrations.RunPython.noop, restore_sqlite_search),
+        migrations.AddField(
+            model_name='exhibitorregistration',
+            name='dedupe_key',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='visitorregistration',
+            name='dedupe_key',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='exhibitorregistration',
+            index=models.Index(fields=['dedupe_key'], name='exhibitor_dedupe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visitorregistration',
+            index=models.Index(fields=['dedupe_key'], name='visitor_dedupe_idx'),
+        ),
+        migrations.RunPython(restore_sqlite_search, migrations.RunPython.noop),
+        migrations.RunPython(backfill_dedupe_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_registration_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedfile',
+            name='pending',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def clear_bodies(apps, schema_editor):
+    # Delivered/failed bodies still hold OTP codes and password links
+    QueuedEmail = apps.get_model("api", "QueuedEmail")
+    QueuedEmail.objects.filter(status__in=["sent", "failed"]).exclude(body="").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_storedfile_pending'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_bodies, migrations.RunPython.noop),
+    ]
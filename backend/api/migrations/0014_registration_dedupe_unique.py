@@ -0,0 +1,131 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:27
+
+import hashlib
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+PHONE_FIELDS = {
+    "ExhibitorRegistration": "contact_number",
+    "VisitorRegistration": "phone_number",
+}
+
+# Frozen copies of api.models.registration_dedupe_key and the FTS5 setup
+# from 0005_registration_search, as of this migration
+SEARCH_FIELDS = {
+    "api_exhibitorregistration": (
+        "company_name",
+        "contact_person_name",
+        "email_address",
+        "contact_number",
+    ),
+    "api_visitorregistration": (
+        "first_name",
+        "last_name",
+        "company_name",
+        "email_address",
+        "phone_number",
+    ),
+}
+
+
+def registration_dedupe_key(email, phone, event_location):
+    raw = "|".join((
+        (email or "").strip().lower(),
+        "".join(filter(str.isdigit, phone or "")),
+        (event_location or "").strip().lower(),
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def sqlite_fts_sql(table):
+    fts = f"{table}_fts"
+    cols = SEARCH_FIELDS[table]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', prefix='2 3')",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def collapse_duplicates(apps, schema_editor):
+    for model_name, phone_field in PHONE_FIELDS.items():
+        model = apps.get_model("api", model_name)
+
+        # Rows saved without a key (none expected) get one first
+        blank = list(model.objects.filter(dedupe_key="").only("id", "email_address", phone_field, "event_location"))
+        for row in blank:
+            row.dedupe_key = registration_dedupe_key(row.email_address, getattr(row, phone_field), row.event_location)
+        model.objects.bulk_update(blank, ["dedupe_key"], batch_size=2000)
+
+        duplicated = (
+            model.objects.values("dedupe_key")
+            .annotate(rows=Count("id"))
+            .filter(rows__gt=1)
+            .values_list("dedupe_key", flat=True)
+        )
+        for dedupe_key in list(duplicated):
+            rows = list(model.objects.filter(dedupe_key=dedupe_key).order_by("id").values("id", "status"))
+            # Keep the oldest row someone already worked on, else the oldest
+            keep = next((row for row in rows if row["status"] != "pending"), rows[0])
+            model.objects.filter(dedupe_key=dedupe_key).exclude(id=keep["id"]).delete()
+
+
+def restore_sqlite_search(apps, schema_editor):
+    # Adding/removing the constraint remakes the table on SQLite, dropping the FTS triggers
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for model_name in PHONE_FIELDS:
+        table = apps.get_model("api", model_name)._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [f"{table}_fts"])
+            if cursor.fetchone() is None:
+                continue  # built without FTS5
+        for sql in sqlite_fts_sql(table):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_queuedemail_sending'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after RemoveConstraint has remade the tables
+        migrations.RunPython(migrations.RunPython.noop, restore_sqlite_search),
+        migrations.RunPython(collapse_duplicates, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='exhibitorregistration',
+            name='exhibitor_dedupe_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='visitorregistration',
+            name='visitor_dedupe_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='exhibitorregistration',
+            constraint=models.UniqueConstraint(fields=('dedupe_key',), name='exhibitor_dedupe_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='visitorregistration',
+            constraint=models.UniqueConstraint(fields=('dedupe_key',), name='visitor_dedupe_uniq'),
+        ),
+        migrations.RunPython(restore_sqlite_search, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+import hashlib
 import uuid
 from django.db import models
 from django.utils import timezone
@@ -62,10 +63,64 @@ class PasswordSetupToken(models.Model):
         return f"{self.user.email} - {self.token}"
 
 
+# =====================================================
+# ONE-TIME PASSWORD (used by api.otp.DatabaseOTPStore)
+# =====================================================
+class OneTimePassword(models.Model):
+    email = models.EmailField(unique=True)
+    code_hash = models.CharField(max_length=128)
+    attempts = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"OTP for {self.email}"
+
+
+# =====================================================
+# REGISTRATION DEDUPE KEY (email + phone digits + event location)
+# =====================================================
+def normalize_email(value):
+    return (value or "").strip().lower()
+
+
+def phone_digits(value):
+    return "".join(filter(str.isdigit, value or ""))
+
+
+def registration_dedupe_key(email, phone, event_location):
+    raw = "|".join((normalize_email(email), phone_digits(phone), (event_location or "").strip().lower()))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class DedupeKeyMixin:
+    """
+    Keeps `dedupe_key` in sync on save(); bulk_create callers call
+    set_dedupe_key() themselves.
+    """
+    dedupe_phone_field = None
+
+    def set_dedupe_key(self):
+        self.dedupe_key = registration_dedupe_key(
+            self.email_address,
+            getattr(self, self.dedupe_phone_field),
+            self.event_location,
+        )
+        return self
+
+    def save(self, *args, **kwargs):
+        self.set_dedupe_key()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "dedupe_key"}
+        super().save(*args, **kwargs)
+
+
 # =====================================================
 # EXHIBITOR REGISTRATION
 # =====================================================
-class ExhibitorRegistration(models.Model):
+class ExhibitorRegistration(DedupeKeyMixin, models.Model):
+    dedupe_phone_field = "contact_number"
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('contacted', 'Contacted'),
@@ -82,11 +137,24 @@ class ExhibitorRegistration(models.Model):
     contact_number = models.CharField(max_length=20)
     product_category = models.CharField(max_length=255)
     company_address = models.TextField()
+    # sha256 of the normalised email / phone / location, see registration_dedupe_key
+    dedupe_key = models.CharField(max_length=64, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Dashboard list/filter paths always sort by newest first
+        indexes = [
+            models.Index(fields=['-created_at'], name='exhibitor_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='exhibitor_status_created_idx'),
+            models.Index(fields=['event_location', '-created_at'], name='exhibitor_location_created_idx'),
+            models.Index(fields=['email_address'], name='exhibitor_email_idx'),
+        ]
+        constraints = [
+            # One row per person and event, even for concurrent submissions
+            models.UniqueConstraint(fields=['dedupe_key'], name='exhibitor_dedupe_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.company_name} - {self.contact_person_name}"
@@ -95,7 +163,9 @@ class ExhibitorRegistration(models.Model):
 # =====================================================
 # VISITOR REGISTRATION
 # =====================================================
-class VisitorRegistration(models.Model):
+class VisitorRegistration(DedupeKeyMixin, models.Model):
+    dedupe_phone_field = "phone_number"
+
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('contacted', 'Contacted'),
@@ -111,11 +181,24 @@ class VisitorRegistration(models.Model):
     email_address = models.EmailField()
     phone_number = models.CharField(max_length=20)
     industry_interest = models.CharField(max_length=255)
+    # sha256 of the normalised email / phone / location, see registration_dedupe_key
+    dedupe_key = models.CharField(max_length=64, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Dashboard list/filter paths always sort by newest first
+        indexes = [
+            models.Index(fields=['-created_at'], name='visitor_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='visitor_status_created_idx'),
+            models.Index(fields=['event_location', '-created_at'], name='visitor_location_created_idx'),
+            models.Index(fields=['email_address'], name='visitor_email_idx'),
+        ]
+        constraints = [
+            # One row per person and event, even for concurrent submissions
+            models.UniqueConstraint(fields=['dedupe_key'], name='visitor_dedupe_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.company_name}"
@@ -127,6 +210,9 @@ class VisitorRegistration(models.Model):
 class Category(models.Model):
     name = models.CharField(max_length=200)
     image = models.URLField(max_length=500, null=True, blank=True)
+    # Filled in by api.utils.schedule_image_variants: {"webp": {"480": url, ...}, ...}
+    variants = models.JSONField(default=dict, blank=True)
+    placeholder = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -193,6 +279,9 @@ class GalleryImage(models.Model):
     section = models.CharField(max_length=50, choices=SECTION_CHOICES)
 
     image = models.URLField(max_length=500, null=True, blank=True)
+    # Filled in by api.utils.schedule_image_variants: {"webp": {"480": url, ...}, ...}
+    variants = models.JSONField(default=dict, blank=True)
+    placeholder = models.TextField(blank=True)
 
     display_order = models.PositiveIntegerField(default=1)
 
@@ -205,6 +294,25 @@ class GalleryImage(models.Model):
         return f"{self.page} - {self.section}"
  
 
+# =====================================================
+# CONTENT-ADDRESSED S3 OBJECTS (shared by identical uploads)
+# =====================================================
+class StoredFile(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    key = models.CharField(max_length=500, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    content_type = models.CharField(max_length=100, blank=True)
+    # Rows (Category/GalleryImage) currently pointing at this object;
+    # 0 is a tombstone (object deleted, or its delete failed)
+    ref_count = models.PositiveIntegerField(default=1)
+    # Transfers of these bytes in flight (see upload_to_s3)
+    pending = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.key} ({self.ref_count} refs)"
+
+
 # =====================================================
 # SYSTEM STATUS AND DATE OF ONLINE
 # =====================================================
@@ -222,3 +330,41 @@ class SystemSettings(models.Model):
 
     def __str__(self):
         return "System Settings (Singleton)"
+
+
+# =====================================================
+# OUTGOING EMAIL QUEUE (sent by `manage.py send_queued_mail`)
+# =====================================================
+class QueuedEmail(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        # Claimed by a worker; next_attempt_at is when the claim lapses
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="queuedemail_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
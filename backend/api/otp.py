@@ -0,0 +1,173 @@
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.module_loading import import_string
+
+from .models import OneTimePassword
+
+
+# Verification outcomes
+OTP_OK = "ok"
+OTP_NOT_FOUND = "not_found"
+OTP_EXPIRED = "expired"
+OTP_INVALID = "invalid"
+OTP_LOCKED = "locked"
+
+
+# ======================================================
+# BASE STORE
+# ======================================================
+class BaseOTPStore:
+    """
+    Issues and verifies one-time passwords keyed by email.
+    Codes are stored as HMACs, expire after `ttl` seconds and lock after
+    `max_attempts` wrong guesses until a new code is issued.
+    """
+
+    def __init__(self, ttl=300, max_attempts=5, **options):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+
+    @staticmethod
+    def generate_code():
+        return f"{secrets.randbelow(900000) + 100000}"
+
+    @staticmethod
+    def hash_code(email, code):
+        return salted_hmac("api.otp", f"{email}:{code}").hexdigest()
+
+    def issue(self, email):
+        """Stores a fresh code for `email` (resetting attempts) and returns it."""
+        raise NotImplementedError
+
+    def verify(self, email, code):
+        """Returns one of the OTP_* outcomes; wrong codes count as attempts."""
+        raise NotImplementedError
+
+    def discard(self, email):
+        raise NotImplementedError
+
+
+# ======================================================
+# CACHE BACKEND (locmem / file / DB cache / Redis)
+# ======================================================
+class CacheOTPStore(BaseOTPStore):
+    """
+    Only shared across gunicorn workers when the cache alias is shared (Redis,
+    DB cache, file cache...), not with the default local-memory cache.
+    """
+
+    def __init__(self, cache_alias="default", **options):
+        super().__init__(**options)
+        self.cache = caches[cache_alias]
+
+    def _key(self, email):
+        return f"api:otp:{email}"
+
+    def _attempts_key(self, email):
+        return f"api:otp:attempts:{email}"
+
+    def issue(self, email):
+        code = self.generate_code()
+        expires_at = timezone.now() + timedelta(seconds=self.ttl)
+        # Keep the entry a little past expiry so callers can tell "expired" from "not found"
+        timeout = self.ttl + 60
+        self.cache.set_many(
+            {
+                self._key(email): {"hash": self.hash_code(email, code), "expires_at": expires_at},
+                self._attempts_key(email): 0,
+            },
+            timeout,
+        )
+        return code
+
+    def verify(self, email, code):
+        entry = self.cache.get(self._key(email))
+        if not entry:
+            return OTP_NOT_FOUND
+
+        if timezone.now() > entry["expires_at"]:
+            self.discard(email)
+            return OTP_EXPIRED
+
+        if self.cache.get(self._attempts_key(email), 0) >= self.max_attempts:
+            return OTP_LOCKED
+
+        if not constant_time_compare(entry["hash"], self.hash_code(email, str(code).strip())):
+            try:
+                self.cache.incr(self._attempts_key(email))
+            except ValueError:
+                # Counter evicted independently of the entry
+                self.cache.set(self._attempts_key(email), 1, self.ttl + 60)
+            return OTP_INVALID
+
+        return OTP_OK
+
+    def discard(self, email):
+        self.cache.delete_many([self._key(email), self._attempts_key(email)])
+
+
+# ======================================================
+# DATABASE BACKEND (OneTimePassword table)
+# ======================================================
+class DatabaseOTPStore(BaseOTPStore):
+    """
+    Shared by every worker out of the box; lookups go through the unique
+    email index and expired rows are purged whenever a code is issued.
+    """
+
+    def issue(self, email):
+        now = timezone.now()
+        OneTimePassword.objects.filter(expires_at__lt=now).delete()
+
+        code = self.generate_code()
+        OneTimePassword.objects.update_or_create(
+            email=email,
+            defaults={
+                "code_hash": self.hash_code(email, code),
+                "attempts": 0,
+                "expires_at": now + timedelta(seconds=self.ttl),
+            },
+        )
+        return code
+
+    def verify(self, email, code):
+        entry = OneTimePassword.objects.filter(email=email).first()
+        if entry is None:
+            return OTP_NOT_FOUND
+
+        if timezone.now() > entry.expires_at:
+            entry.delete()
+            return OTP_EXPIRED
+
+        if entry.attempts >= self.max_attempts:
+            return OTP_LOCKED
+
+        if not constant_time_compare(entry.code_hash, self.hash_code(email, str(code).strip())):
+            OneTimePassword.objects.filter(pk=entry.pk).update(attempts=F("attempts") + 1)
+            return OTP_INVALID
+
+        return OTP_OK
+
+    def discard(self, email):
+        OneTimePassword.objects.filter(email=email).delete()
+
+
+# ======================================================
+# CONFIGURED STORE
+# ======================================================
+_store = None
+
+
+def get_otp_store():
+    global _store
+    if _store is None:
+        conf = dict(getattr(settings, "OTP_STORE", {}))
+        backend = import_string(conf.pop("BACKEND", "api.otp.DatabaseOTPStore"))
+        _store = backend(**{key.lower(): value for key, value in conf.items()})
+    return _store
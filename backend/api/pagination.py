@@ -0,0 +1,175 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+# ======================================================
+# KEYSET (CURSOR) PAGINATION
+# ======================================================
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a composite ordering whose last field is unique
+    (e.g. ("-created_at", "-id")). Next/previous pages are a range scan on
+    the ordering index instead of COUNT(*) + OFFSET, so deep pages cost the
+    same as the first one. The total is only counted with ?count=true.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = None
+
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true"):
+            self.count = queryset.count()
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor["reverse"])
+
+        ordering = self._reversed_ordering() if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self._seek_filter(cursor["values"], ordering))
+
+        # One extra row tells us whether there is another page
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ---------------------------
+    # Links
+    # ---------------------------
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def _link(self, row, reverse):
+        values = [self._field_value(row, name) for name in self._field_names()]
+        encoded = self.encode_cursor({"values": values, "reverse": reverse})
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    # ---------------------------
+    # Cursor encoding
+    # ---------------------------
+    def encode_cursor(self, cursor):
+        raw = json.dumps(cursor, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            names = self._field_names()
+            if len(cursor["values"]) != len(names):
+                raise ValueError
+            cursor["values"] = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(names, cursor["values"])
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        return cursor
+
+    # ---------------------------
+    # Ordering helpers
+    # ---------------------------
+    def _field_names(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def _field_value(self, row, name):
+        value = getattr(row, name)
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+    def _reversed_ordering(self):
+        return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering)
+
+    def _seek_filter(self, values, ordering):
+        """
+        Rows strictly after `values` in `ordering`:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            clause = Q(**{f"{name}__{lookup}": values[i]})
+            for prev_field, prev_value in zip(ordering[:i], values[:i]):
+                clause &= Q(**{prev_field.lstrip("-"): prev_value})
+            condition |= clause
+        return condition
+
+
+class RegistrationKeysetPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class GalleryKeysetPagination(KeysetPagination):
+    ordering = ("display_order", "id")
+    page_size = 12
+    max_page_size = 50
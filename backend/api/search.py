@@ -0,0 +1,138 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q
+
+
+# ======================================================
+# SEARCHABLE COLUMNS PER REGISTRATION TABLE
+# ======================================================
+# Changing these needs a migration rebuilding the GIN and FTS5 indexes
+SEARCH_FIELDS = {
+    "api_exhibitorregistration": (
+        "company_name",
+        "contact_person_name",
+        "email_address",
+        "contact_number",
+    ),
+    "api_visitorregistration": (
+        "first_name",
+        "last_name",
+        "company_name",
+        "email_address",
+        "phone_number",
+    ),
+}
+
+SEARCH_CONFIG = "simple"
+
+
+# Email addresses stay one token: Postgres indexes an address as a single
+# lexeme, so its parts alone would never match there
+_TOKEN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+|\w+")
+
+
+def _tokens(q):
+    return _TOKEN.findall(q or "")[:10]
+
+
+# ======================================================
+# POSTGRES: expression GIN index over a tsvector
+# ======================================================
+def search_vector(table):
+    # Must stay identical to the expression indexed by migration 0005
+    # (<model>_search_idx) so the planner uses it
+    return SearchVector(*SEARCH_FIELDS[table], config=SEARCH_CONFIG)
+
+
+def _postgres_search(queryset, tokens):
+    table = queryset.model._meta.db_table
+    # Prefix match every word: "acme del" -> 'acme':* & 'del':*; quoted so
+    # the parser splits an address the same way it did when indexing
+    query = SearchQuery(
+        " & ".join(f"'{t}':*" for t in tokens),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+    return (
+        queryset
+        .annotate(search=search_vector(table))
+        .filter(search=query)
+        .annotate(search_rank=SearchRank(F("search"), query))
+        .order_by("-search_rank", "-created_at")
+    )
+
+
+# ======================================================
+# SQLITE: FTS5 external-content table kept in sync by triggers
+# ======================================================
+def fts_table(table):
+    # Table and triggers are created by migration 0005 (re-created by 0010)
+    return f"{table}_fts"
+
+
+_fts_available = set()
+
+
+def _sqlite_has_fts(table):
+    # Only positive answers are remembered; the table can appear after a migrate
+    if table in _fts_available:
+        return True
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [fts_table(table)],
+        )
+        found = cursor.fetchone() is not None
+
+    if found:
+        _fts_available.add(table)
+    return found
+
+
+def _sqlite_search(queryset, tokens):
+    table = queryset.model._meta.db_table
+    fts = fts_table(table)
+    # Every word must match as a prefix: "acme" * "del" *
+    match = " ".join(f'"{t}"*' for t in tokens)
+    # Join on the FTS table so MATCH drives the scan; its bm25 `rank` is
+    # lower-is-better, negate so higher search_rank = better like Postgres
+    return queryset.extra(
+        tables=[fts],
+        where=[f"{fts}.rowid = {table}.id", f"{fts} MATCH %s"],
+        params=[match],
+        select={"search_rank": f"-{fts}.rank"},
+    ).order_by("-search_rank", "-created_at")
+
+
+# ======================================================
+# ENTRY POINT
+# ======================================================
+def search_registrations(queryset, q):
+    """
+    Ranked full-text search over a registration queryset.
+    Uses the Postgres GIN index or the SQLite FTS5 table; falls back to
+    icontains when neither is available.
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        return queryset
+
+    table = queryset.model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        return _postgres_search(queryset, tokens)
+
+    if connection.vendor == "sqlite" and _sqlite_has_fts(table):
+        return _sqlite_search(queryset, tokens)
+
+    return icontains_search(queryset, q)
+
+
+def icontains_search(queryset, q):
+    condition = Q()
+    for field in SEARCH_FIELDS[queryset.model._meta.db_table]:
+        condition |= Q(**{f"{field}__icontains": q.strip()})
+    return queryset.filter(condition)
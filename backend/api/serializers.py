@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import (
+    phone_digits,
     ExhibitorRegistration,
     VisitorRegistration,
     Category,
@@ -9,6 +10,25 @@ from .models import (
     SystemSettings,
 )
 
+# =====================================================
+# SHARED FIELD RULES (also applied by the bulk import, see api/imports.py)
+# =====================================================
+def clean_email_address(value):
+    if not value:
+        raise serializers.ValidationError("Email address is required")
+    return value.lower()
+
+
+def clean_phone_number(value, label="Phone number"):
+    if not value:
+        raise serializers.ValidationError(f"{label} is required")
+
+    if len(phone_digits(value)) < 10:
+        raise serializers.ValidationError(f"{label} must be at least 10 digits")
+
+    return value
+
+
 # =====================================================
 # EXHIBITOR SERIALIZER (Matches NEW Model)
 # =====================================================
@@ -16,24 +36,15 @@ class ExhibitorRegistrationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ExhibitorRegistration
-        fields = '__all__'
+        exclude = ('dedupe_key',)
         read_only_fields = ('id', 'created_at', 'updated_at')
 
     # field validation
     def validate_email_address(self, value):
-        if not value:
-            raise serializers.ValidationError("Email address is required")
-        return value.lower()
+        return clean_email_address(value)
 
     def validate_contact_number(self, value):
-        if not value:
-            raise serializers.ValidationError("Contact number is required")
-
-        cleaned = "".join(filter(str.isdigit, value))
-        if len(cleaned) < 10:
-            raise serializers.ValidationError("Contact number must be at least 10 digits")
-
-        return value
+        return clean_phone_number(value, label="Contact number")
 
 
 # =====================================================
@@ -59,19 +70,10 @@ class VisitorRegistrationSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at", "updated_at")
 
     def validate_email_address(self, value):
-        if not value:
-            raise serializers.ValidationError("Email address is required")
-        return value.lower()
+        return clean_email_address(value)
 
     def validate_phone_number(self, value):
-        if not value:
-            raise serializers.ValidationError("Phone number is required")
-
-        cleaned = "".join(filter(str.isdigit, value))
-        if len(cleaned) < 10:
-            raise serializers.ValidationError("Phone number must be at least 10 digits")
-
-        return value
+        return clean_phone_number(value)
 
 
 # =====================================================
@@ -83,6 +85,7 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = "__all__"
+        read_only_fields = ("variants", "placeholder")
 
 
 # =====================================================
@@ -104,6 +107,7 @@ class GalleryImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = GalleryImage
         fields = "__all__"
+        read_only_fields = ("variants", "placeholder")
 
     def validate_image(self, value):
         # Accept only S3 URL after upload
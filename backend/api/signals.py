@@ -0,0 +1,83 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .cache import (
+    PUBLIC_CACHE_RESOURCES,
+    invalidate_health_snapshot,
+    invalidate_public_cache,
+    invalidate_registration_stats,
+)
+from .metrics import (
+    DB_CONNECTIONS_OPENED,
+    REGISTRATIONS_CREATED,
+    event_location_label,
+    invalidate_event_locations,
+)
+from .models import (
+    SystemSettings,
+    User,
+    ExhibitorRegistration,
+    VisitorRegistration,
+    Category,
+    Event,
+    GalleryImage,
+)
+
+
+# ======================================================
+# SYSTEM SETTINGS → drop cached health snapshot
+# ======================================================
+@receiver(post_save, sender=SystemSettings)
+def system_settings_saved(sender, instance, **kwargs):
+    # Covers update_system_settings as well as Django admin edits
+    invalidate_health_snapshot()
+
+
+# ======================================================
+# USERS → drop the cached auth user (see api.authentication)
+# ======================================================
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Covers create_password / delete_team_user as well as Django admin edits
+    invalidate_cached_user(instance.pk)
+
+
+# ======================================================
+# REGISTRATIONS → drop cached stats
+# ======================================================
+@receiver(post_save, sender=ExhibitorRegistration)
+@receiver(post_save, sender=VisitorRegistration)
+@receiver(post_delete, sender=ExhibitorRegistration)
+@receiver(post_delete, sender=VisitorRegistration)
+def registration_changed(sender, instance, created=False, **kwargs):
+    invalidate_registration_stats(sender)
+    if created:
+        kind = "exhibitor" if sender is ExhibitorRegistration else "visitor"
+        REGISTRATIONS_CREATED.labels(kind, event_location_label(instance.event_location)).inc()
+
+
+# ======================================================
+# PUBLIC CONTENT → drop cached list/detail responses
+# ======================================================
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=GalleryImage)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=GalleryImage)
+def public_content_changed(sender, instance, **kwargs):
+    invalidate_public_cache(PUBLIC_CACHE_RESOURCES[sender])
+    if sender is Event:
+        # Locations allowed as metric labels
+        invalidate_event_locations()
+
+
+# ======================================================
+# DB CONNECTIONS → reuse metric (see CONN_MAX_AGE)
+# ======================================================
+@receiver(connection_created)
+def db_connection_opened(sender, connection, **kwargs):
+    DB_CONNECTIONS_OPENED.labels(connection.alias).inc()
@@ -0,0 +1,1143 @@
+import csv
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from io import BytesIO, StringIO
+from xml.etree import ElementTree
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models.query import QuerySet
+import hashlib
+from datetime import timedelta
+
+import boto3
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from moto import mock_aws
+from prometheus_client import REGISTRY
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.core import mail
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from .emails import purge_queued_mail, queue_mail, send_queued_mail
+from .exports import stream_export
+from .imports import import_registrations
+from .ingest import flush_journal, journal_registration, rejected_segments
+from .search import search_registrations
+from .authentication import user_cache
+from .cache import get_public_bundle
+from .models import GalleryImage, OneTimePassword, QueuedEmail, StoredFile, User, VisitorRegistration
+from .otp import OTP_EXPIRED, OTP_INVALID, OTP_LOCKED, OTP_NOT_FOUND, OTP_OK, DatabaseOTPStore
+from .utils import delete_from_s3, get_s3_client, hash_upload, reset_s3_client, s3_key_from_url, upload_to_s3
+from .metrics import render_metrics
+from .throttling import LoginIPThrottle
+from .views import ExhibitorRegistrationViewSet, VisitorRegistrationViewSet
+
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-tests",
+    }
+}
+
+
+def make_visitor(i, **fields):
+    return VisitorRegistration.objects.create(**{
+        "event_location": "Delhi",
+        "first_name": "Visitor",
+        "last_name": str(i),
+        "company_name": "Acme",
+        "email_address": f"visitor{i}@example.com",
+        "phone_number": f"98{i:08d}",
+        "industry_interest": "Apparel",
+        **fields,
+    })
+
+
+def bearer(user):
+    return {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+def throttle_rates(num_proxies=None, **rates):
+    """override_settings enabling only the given throttle scopes."""
+    rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+    if num_proxies is not None:
+        rest_framework["NUM_PROXIES"] = num_proxies
+    return override_settings(REST_FRAMEWORK=rest_framework)
+
+
+# ======================================================
+# RATE LIMITING (api/throttling.py)
+# ======================================================
+@override_settings(CACHES=LOCMEM_CACHE)
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self, i=0, **extra):
+        return self.client.post(
+            "/api/login/",
+            {"username": f"nobody{i}", "password": "wrong"},
+            content_type="application/json",
+            **extra,
+        )
+
+    def register(self, i, **extra):
+        return self.client.post(
+            "/api/visitor-registrations/",
+            {
+                "event_location": "Delhi",
+                "first_name": "Visitor",
+                "last_name": str(i),
+                "company_name": "Burst Co",
+                "email_address": "burst@example.com",
+                "phone_number": f"98{i:08d}",
+                "industry_interest": "Apparel",
+            },
+            content_type="application/json",
+            **extra,
+        )
+
+    def test_burst_from_one_ip_gets_exactly_the_limit(self):
+        with throttle_rates(login="5/min"):
+            codes = [self.login(i).status_code for i in range(12)]
+
+        self.assertNotIn(429, codes[:5])
+        self.assertEqual(codes[5:], [429] * 7)
+
+    def test_throttled_response_has_retry_after(self):
+        with throttle_rates(login="1/min"):
+            self.login()
+            response = self.login()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 60)
+
+    def test_rotating_forwarded_for_behind_proxies(self):
+        # Load balancer + nginx: the spoofed entry is ignored
+        with throttle_rates(login="3/min", num_proxies=2):
+            codes = [
+                self.login(HTTP_X_FORWARDED_FOR=f"10.9.{i}.1, 203.0.113.7, 10.0.0.2").status_code
+                for i in range(6)
+            ]
+
+        self.assertEqual(codes.count(429), 3)
+
+    def test_rotating_forwarded_for_without_proxies(self):
+        # NUM_PROXIES=0 (the default): the header isn't trusted at all
+        with throttle_rates(login="3/min", num_proxies=0):
+            codes = [self.login(HTTP_X_FORWARDED_FOR=f"10.9.{i}.1").status_code for i in range(6)]
+
+        self.assertEqual(codes.count(429), 3)
+
+    def test_per_email_limit_holds_across_ips(self):
+        with throttle_rates(registration_email="3/hour"):
+            codes = [self.register(i, REMOTE_ADDR=f"198.51.100.{i}").status_code for i in range(5)]
+
+        self.assertEqual(codes, [201, 201, 201, 429, 429])
+
+    def test_empty_rate_turns_the_scope_off(self):
+        with throttle_rates(login=""):
+            codes = [self.login(i).status_code for i in range(10)]
+
+        self.assertNotIn(429, codes)
+
+    def test_redis_check_is_one_script_call(self):
+        store, calls = {}, []
+
+        def window_script(keys, args):
+            # What _WINDOW_SCRIPT does server-side
+            calls.append(keys)
+            store[keys[0]] = store.get(keys[0], 0) + 1
+            return [store[keys[0]], store.get(keys[1], 0)]
+
+        client = mock.Mock(**{"register_script.return_value": window_script})
+        redis = mock.Mock(**{"Redis.from_url.return_value": client})
+        redis_cache = {"default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://cache.internal:6379/1",
+            "KEY_PREFIX": "igtf",
+        }}
+
+        with mock.patch.dict("sys.modules", redis=redis), mock.patch.dict("api.throttling._redis_scripts", clear=True), \
+                override_settings(CACHES=redis_cache), throttle_rates(login="3/min"):
+            codes = [self.login(i).status_code for i in range(5)]
+
+        redis.Redis.from_url.assert_called_once_with("redis://cache.internal:6379/1")
+        self.assertEqual(len(calls), 5)
+        self.assertTrue(all(key.startswith("igtf:") for key in calls[0]))
+        self.assertEqual(codes.count(429), 2)
+
+    def test_burst_across_window_boundary_is_not_doubled(self):
+        request = RequestFactory().post("/api/login/", REMOTE_ADDR="203.0.113.9")
+        throttle = LoginIPThrottle()
+
+        def burst(at, count):
+            with mock.patch("api.throttling.time.time", return_value=at):
+                return sum(throttle.allow_request(request, None) for _ in range(count))
+
+        with throttle_rates(login="10/min"):
+            # End of one window, then the start of the next
+            self.assertEqual(burst(6000 + 59.5, 10), 10)
+            self.assertEqual(burst(6060 + 0.5, 10), 0)
+            self.assertGreater(throttle.wait(), 0)
+
+            # Room comes back as the previous window slides out
+            self.assertEqual(burst(6120 + 59.9, 1), 1)
+
+
+# ======================================================
+# REGISTRATION LIST QUERIES (indexes from 0004_registration_indexes)
+# ======================================================
+# (query params, lookup, index name suffix); {kind} is exhibitor / visitor
+LIST_FILTERS = [
+    ({}, {}, "created_idx"),
+    ({"status": "paid"}, {"status": "paid"}, "status_created_idx"),
+    ({"event_location": "Delhi"}, {"event_location": "Delhi"}, "location_created_idx"),
+    ({"email": " {kind}7@Example.com "}, {"email_address": "{kind}7@example.com"}, "email_idx"),
+]
+REGISTRATION_ENDPOINTS = [
+    ("exhibitor", "/api/exhibitor-registrations/"),
+    ("visitor", "/api/visitor-registrations/"),
+]
+
+
+def for_kind(values, kind):
+    return {name: value.format(kind=kind) for name, value in values.items()}
+
+
+class RegistrationListQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_data",
+            exhibitors=2000,
+            visitors=2000,
+            events=0,
+            categories=0,
+            gallery=0,
+            stdout=StringIO(),
+        )
+
+    def test_filtered_list_pages_run_two_queries(self):
+        # COUNT + one page; no per-row queries, no auth lookup
+        for kind, path in REGISTRATION_ENDPOINTS:
+            for params, _, _ in LIST_FILTERS:
+                params = for_kind(params, kind)
+                with self.subTest(path=path, params=params), self.assertNumQueries(2):
+                    response = self.client.get(path, params)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertTrue(response.json()["results"])
+
+    def test_list_filters_use_their_index(self):
+        viewsets = {"exhibitor": ExhibitorRegistrationViewSet, "visitor": VisitorRegistrationViewSet}
+        for kind, _ in REGISTRATION_ENDPOINTS:
+            for _, lookup, index in LIST_FILTERS:
+                lookup = for_kind(lookup, kind)
+                with self.subTest(kind=kind, lookup=lookup):
+                    plan = viewsets[kind].queryset.filter(**lookup)[:10].explain()
+                    self.assertIn(f"{kind}_{index}", plan)
+                    if connection.vendor == "sqlite" and "email_address" not in lookup:
+                        # Rows come out of the index already ordered by -created_at
+                        self.assertNotIn("TEMP B-TREE", plan)
+
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for i in range(7):
+            make_visitor(i, company_name="Acme" if i % 2 else "Globex")
+        # Shared timestamps: ties are broken by id
+        for row in VisitorRegistration.objects.all():
+            VisitorRegistration.objects.filter(pk=row.pk).update(created_at=now - timedelta(minutes=row.pk // 2))
+        cls.ordered = list(VisitorRegistration.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def walk(self, url, params, link):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            pages.append([row["id"] for row in body["results"]])
+            if not body[link]:
+                return pages
+            response = self.client.get(body[link])
+
+    def test_next_then_previous_round_trip(self):
+        params = {"pagination": "cursor", "page_size": 3}
+        pages = self.walk("/api/visitor-registrations/", params, "next")
+        self.assertEqual([row for page in pages for row in page], self.ordered)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        # Back from the last page: the same pages in reverse
+        last = self.client.get("/api/visitor-registrations/", params)
+        while last.json()["next"]:
+            last = self.client.get(last.json()["next"])
+        first_back = last.json()["previous"]
+        self.assertEqual(self.walk(first_back, {}, "previous"), pages[-2::-1])
+
+    def test_search_pages_follow_the_keyset_order(self):
+        acme = [pk for pk in self.ordered if VisitorRegistration.objects.get(pk=pk).company_name == "Acme"]
+        params = {"pagination": "cursor", "page_size": 2, "q": "acme"}
+        pages = self.walk("/api/visitor-registrations/", params, "next")
+        # Rank is dropped with a cursor: newest first, every match once
+        self.assertEqual([row for page in pages for row in page], acme)
+
+    def test_tampered_cursor_is_not_found(self):
+        response = self.client.get("/api/visitor-registrations/", {"pagination": "cursor", "cursor": "bm9wZQ"})
+        self.assertEqual(response.status_code, 404)
+
+
+
+# ======================================================
+# AUTH USER CACHE (api/authentication.py)
+# ======================================================
+class CachedUserTests(TestCase):
+    # Loads the User (CachedJWTAuthentication), then fails validation with no query
+    path = "/api/visitor-registrations/bulk-status/"
+
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user("sales", password="x")
+        self.auth = bearer(self.user)
+
+    def post(self):
+        return self.client.post(self.path, {"status": "archived"}, content_type="application/json", **self.auth)
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.post().status_code, 400)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.post().status_code, 400)
+
+    def test_saving_the_user_drops_the_entry(self):
+        self.post()
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.post().status_code, 401)
+
+    def test_deleting_the_user_drops_the_entry(self):
+        self.post()
+        self.user.delete()
+
+        self.assertEqual(self.post().status_code, 401)
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_zero_ttl_disables_the_cache(self):
+        self.post()
+        with self.assertNumQueries(1):
+            self.post()
+
+# ======================================================
+# OTP STORE (api/otp.py)
+# ======================================================
+class DatabaseOTPStoreTests(TestCase):
+    def setUp(self):
+        self.store = DatabaseOTPStore(ttl=300, max_attempts=3)
+
+    def later(self, seconds):
+        return mock.patch("api.otp.timezone.now", return_value=timezone.now() + timedelta(seconds=seconds))
+
+    def test_code_is_stored_hashed_and_verifies(self):
+        code = self.store.issue("a@example.com")
+
+        self.assertNotIn(code, OneTimePassword.objects.get().code_hash)
+        self.assertEqual(self.store.verify("a@example.com", f" {code} "), OTP_OK)
+        self.assertEqual(self.store.verify("b@example.com", code), OTP_NOT_FOUND)
+
+    def test_expired_code_is_removed(self):
+        code = self.store.issue("a@example.com")
+
+        with self.later(301):
+            self.assertEqual(self.store.verify("a@example.com", code), OTP_EXPIRED)
+        self.assertEqual(self.store.verify("a@example.com", code), OTP_NOT_FOUND)
+
+    def test_wrong_guesses_lock_until_a_new_code(self):
+        code = self.store.issue("a@example.com")
+        for _ in range(3):
+            # Codes are 100000-999999
+            self.assertEqual(self.store.verify("a@example.com", "000000"), OTP_INVALID)
+        self.assertEqual(self.store.verify("a@example.com", code), OTP_LOCKED)
+
+        code = self.store.issue("a@example.com")
+        self.assertEqual(OneTimePassword.objects.get().attempts, 0)
+        self.assertEqual(self.store.verify("a@example.com", code), OTP_OK)
+
+    def test_issuing_purges_expired_codes(self):
+        self.store.issue("old@example.com")
+        with self.later(120):
+            self.store.issue("recent@example.com")
+
+        with self.later(400):
+            self.store.issue("new@example.com")
+
+        self.assertEqual(
+            sorted(OneTimePassword.objects.values_list("email", flat=True)),
+            ["new@example.com", "recent@example.com"],
+        )
+
+    def test_discard(self):
+        code = self.store.issue("a@example.com")
+        self.store.discard("a@example.com")
+        self.assertEqual(self.store.verify("a@example.com", code), OTP_NOT_FOUND)
+
+
+# ======================================================
+# EXPORTS (api/exports.py)
+# ======================================================
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            make_visitor(i)
+
+    def export(self, file_format="csv"):
+        return b"".join(stream_export(VisitorRegistration.objects.order_by("id"), file_format))
+
+    def test_csv_has_every_row_with_formulas_neutralised(self):
+        make_visitor(5, company_name="=HYPERLINK(\"http://x\")", last_name="-cmd|calc", phone_number="+919800000005")
+
+        rows = list(csv.DictReader(StringIO(self.export().decode())))
+
+        self.assertEqual(len(rows), 6)
+        self.assertNotIn("dedupe_key", rows[0])
+        self.assertEqual(rows[0]["email_address"], "visitor0@example.com")
+        self.assertEqual(rows[-1]["company_name"], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(rows[-1]["last_name"], "'-cmd|calc")
+        # Numbers keep their sign
+        self.assertEqual(rows[-1]["phone_number"], "+919800000005")
+
+    def test_xlsx_rows_survive_chunking(self):
+        with mock.patch("api.exports.EXPORT_CHUNK_SIZE", 2):
+            chunks = list(stream_export(VisitorRegistration.objects.order_by("id"), "xlsx"))
+        self.assertGreater(len(chunks), 3)
+
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+
+        ns = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        rows = [[t.text or "" for t in row.iterfind(".//s:t", ns)] for row in sheet.iterfind(".//s:row", ns)]
+        self.assertEqual(len(rows), 6)
+        self.assertNotIn("dedupe_key", rows[0])
+        email = rows[0].index("email_address")
+        self.assertEqual([row[email] for row in rows[1:]], [f"visitor{i}@example.com" for i in range(5)])
+
+    def test_endpoint_applies_the_list_filters(self):
+        VisitorRegistration.objects.filter(last_name="3").update(status="contacted")
+        user = User.objects.create_user("sales", password="x")
+
+        response = self.client.get("/api/visitor-registrations/export/", {"status": "contacted"}, **bearer(user))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["last_name"] for row in rows], ["3"])
+
+    def test_endpoint_requires_a_user(self):
+        response = self.client.get("/api/visitor-registrations/export/")
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(ASGI_MODE=True)
+    def test_asgi_export_is_streamed_chunk_by_chunk(self):
+        response = stream_export(VisitorRegistration.objects.order_by("id"))
+        self.assertTrue(response.is_async)
+
+        async def first_chunk():
+            chunks = aiter(response)
+            first = await anext(chunks)
+            await chunks.aclose()
+            return first
+
+        # Only the header row: the body hasn't been read ahead
+        self.assertEqual(async_to_sync(first_chunk)().count(b"\n"), 1)
+
+    def test_asgi_export_matches_wsgi_export(self):
+        async def collect(response):
+            return b"".join([chunk async for chunk in response])
+
+        expected = self.export()
+        with override_settings(ASGI_MODE=True):
+            response = stream_export(VisitorRegistration.objects.order_by("id"))
+            self.assertEqual(async_to_sync(collect)(response), expected)
+
+
+# ======================================================
+# IMPORTS (api/imports.py)
+# ======================================================
+IMPORT_HEADER = "Event,First Name,Last Name,Company,Email,Mobile,Industry\n"
+
+
+def import_csv(*rows):
+    lines = [f"Delhi,Visitor,{i},Acme,{email},98{i:08d},Apparel\n" for i, email in rows]
+    return BytesIO((IMPORT_HEADER + "".join(lines)).encode())
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ImportTests(TestCase):
+    def run_import(self, file_obj, **options):
+        return import_registrations(VisitorRegistration, file_obj, batch_size=2, **options)
+
+    def test_rows_are_created_and_bad_rows_reported(self):
+        report = self.run_import(import_csv((1, "a@example.com"), (2, "not-an-email"), (3, "c@example.com")))
+
+        self.assertEqual((report["rows"], report["valid"], report["created"], report["failed"]), (3, 2, 2, 1))
+        self.assertEqual(report["errors"], [{"row": 3, "errors": {"email_address": "Enter a valid email address."}}])
+        self.assertEqual(
+            sorted(VisitorRegistration.objects.values_list("email_address", flat=True)),
+            ["a@example.com", "c@example.com"],
+        )
+
+    def test_dry_run_writes_nothing(self):
+        report = self.run_import(import_csv((1, "a@example.com"), (2, "b@example.com")), dry_run=True)
+
+        self.assertEqual((report["valid"], report["created"], report["dry_run"]), (2, 0, True))
+        self.assertFalse(VisitorRegistration.objects.exists())
+
+    def test_atomic_import_rolls_back_every_batch(self):
+        # The bad row is in the third batch, after two have been inserted
+        rows = [(i, f"v{i}@example.com") for i in range(1, 5)] + [(5, "bad")]
+
+        report = self.run_import(import_csv(*rows), atomic=True)
+        self.assertEqual((report["failed"], report["created"]), (1, 0))
+        self.assertFalse(VisitorRegistration.objects.exists())
+
+        report = self.run_import(import_csv(*rows))
+        self.assertEqual(report["created"], 4)
+
+    def test_repeated_rows_are_counted_as_duplicates(self):
+        make_visitor(1, email_address="a@example.com")
+
+        report = self.run_import(import_csv((1, "A@Example.com"), (2, "b@example.com"), (2, "b@example.com")))
+
+        self.assertEqual((report["created"], report["duplicates"]), (1, 2))
+        self.assertEqual(VisitorRegistration.objects.count(), 2)
+
+    def test_error_list_is_truncated_but_counted(self):
+        with mock.patch("api.imports.IMPORT_MAX_REPORTED_ERRORS", 2):
+            report = self.run_import(import_csv(*[(i, "bad") for i in range(5)]))
+
+        self.assertEqual(report["failed"], 5)
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        self.assertTrue(report["errors_truncated"])
+
+    def test_export_imports_back(self):
+        make_visitor(1, company_name="=cmd")
+        exported = b"".join(stream_export(VisitorRegistration.objects.all()))
+        VisitorRegistration.objects.all().delete()
+
+        report = self.run_import(BytesIO(exported))
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(VisitorRegistration.objects.get().company_name, "=cmd")
+
+    def test_endpoint_is_admin_only(self):
+        sales = User.objects.create_user("sales", "sales@example.com", "x")
+        admin = User.objects.create_user("boss", "boss@example.com", "x", role=User.ROLE_ADMIN)
+        path = "/api/visitor-registrations/import/"
+
+        def post(user, **data):
+            csv_file = SimpleUploadedFile("rows.csv", import_csv((1, "a@example.com")).read(), content_type="text/csv")
+            return self.client.post(path, {"file": csv_file, **data}, **bearer(user))
+
+        self.assertEqual(post(sales).status_code, 403)
+        self.assertEqual(post(admin, dry_run="1").status_code, 200)
+        response = post(admin)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 1)
+
+
+# ======================================================
+# BULK STATUS (POST /api/<registrations>/bulk-status/)
+# ======================================================
+@override_settings(CACHES=LOCMEM_CACHE)
+class BulkStatusTests(TestCase):
+    path = "/api/visitor-registrations/bulk-status/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rows = [make_visitor(i) for i in range(3)]
+        cls.user = User.objects.create_user("sales", password="x")
+
+    def setUp(self):
+        cache.clear()
+
+    def post(self, body, user=True):
+        auth = bearer(self.user) if user else {}
+        return self.client.post(self.path, body, content_type="application/json", **auth)
+
+    def test_rejects_bad_input(self):
+        cases = [
+            {"ids": [self.rows[0].id], "status": "archived"},
+            {"ids": [], "status": "paid"},
+            {"ids": str(self.rows[0].id), "status": "paid"},
+            {"ids": [self.rows[0].id, "two"], "status": "paid"},
+            {"ids": list(range(1, 1002)), "status": "paid"},
+        ]
+        for body in cases:
+            with self.subTest(body=str(body)[:60]):
+                self.assertEqual(self.post(body).status_code, 400)
+        self.assertFalse(VisitorRegistration.objects.exclude(status="pending").exists())
+
+    def test_reports_each_id(self):
+        first, second, _ = self.rows
+        missing = max(row.id for row in self.rows) + 100
+
+        response = self.post({"ids": [first.id, str(second.id), missing, first.id], "status": "paid"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "status": "paid",
+            "updated": 2,
+            "results": {str(first.id): "updated", str(second.id): "updated", str(missing): "not_found"},
+        })
+        self.assertEqual(
+            list(VisitorRegistration.objects.order_by("id").values_list("status", flat=True)),
+            ["paid", "paid", "pending"],
+        )
+
+    def test_refreshes_cached_stats(self):
+        self.assertEqual(self.client.get("/api/visitor-registrations/stats/").json()["status"]["paid"], 0)
+
+        self.post({"ids": [self.rows[0].id], "status": "paid"})
+
+        self.assertEqual(self.client.get("/api/visitor-registrations/stats/").json()["status"]["paid"], 1)
+
+    @override_settings(REGISTRATION_STATS_CACHE_TIMEOUT=60)
+    def test_stats_missed_by_invalidation_expire(self):
+        stats_path = "/api/visitor-registrations/stats/"
+        self.assertEqual(self.client.get(stats_path).json()["status"]["paid"], 0)
+        # Written through another worker: this process's copy isn't dropped
+        VisitorRegistration.objects.update(status="paid")
+        self.assertEqual(self.client.get(stats_path).json()["status"]["paid"], 0)
+
+        with mock.patch("django.core.cache.backends.locmem.time") as clock:
+            clock.time.return_value = time.time() + 61
+            self.assertEqual(self.client.get(stats_path).json()["status"]["paid"], 3)
+
+    def test_requires_a_user(self):
+        self.assertEqual(self.post({"ids": [self.rows[0].id], "status": "paid"}, user=False).status_code, 401)
+
+
+# ======================================================
+# EMAIL QUEUE (api/emails.py)
+# ======================================================
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_QUEUE_MAX_ATTEMPTS=3,
+    EMAIL_QUEUE_RETRY_DELAY=30,
+)
+class EmailQueueTests(TestCase):
+    def queue(self, i=0):
+        return queue_mail(f"Your code {i}", f"OTP {i}", "noreply@example.com", [f"user{i}@example.com"])
+
+    def make_due(self):
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+
+    def test_sends_and_clears_the_body(self):
+        for i in range(3):
+            self.queue(i)
+
+        self.assertEqual(send_queued_mail(), (3, 0))
+        self.assertEqual([m.body for m in mail.outbox], ["OTP 0", "OTP 1", "OTP 2"])
+        for email in QueuedEmail.objects.all():
+            self.assertEqual((email.status, email.attempts, email.body), (QueuedEmail.STATUS_SENT, 1, ""))
+            self.assertIsNotNone(email.sent_at)
+
+        # Nothing left to send
+        self.assertEqual(send_queued_mail(), (0, 0))
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_failures_back_off_then_give_up(self):
+        email = self.queue()
+
+        with mock.patch("api.emails.EmailMessage.send", side_effect=OSError("smtp down")):
+            before = timezone.now()
+            self.assertEqual(send_queued_mail(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts, email.body), (QueuedEmail.STATUS_PENDING, 1, "OTP 0"))
+            self.assertEqual(email.last_error, "smtp down")
+            self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=30))
+
+            # Not due yet
+            self.assertEqual(send_queued_mail(), (0, 0))
+
+            self.make_due()
+            send_queued_mail()
+            email.refresh_from_db()
+            self.assertGreaterEqual(email.next_attempt_at, timezone.now() + timedelta(seconds=59))
+
+            self.make_due()
+            send_queued_mail()
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.body), (QueuedEmail.STATUS_FAILED, 3, ""))
+
+    def test_rows_are_claimed_while_smtp_runs(self):
+        email = self.queue()
+        seen = []
+
+        def send(message):
+            seen.append(QueuedEmail.objects.get(pk=email.pk).status)
+            # A second worker finds nothing to take
+            self.assertEqual(send_queued_mail(), (0, 0))
+            return 1
+
+        with mock.patch("api.emails.EmailMessage.send", send):
+            send_queued_mail()
+
+        self.assertEqual(seen, [QueuedEmail.STATUS_SENDING])
+
+    def test_lapsed_claim_is_retried(self):
+        email = self.queue()
+        QueuedEmail.objects.update(
+            status=QueuedEmail.STATUS_SENDING,
+            attempts=1,
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        self.assertEqual(send_queued_mail(), (1, 0))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (QueuedEmail.STATUS_SENT, 2))
+
+    def test_purge_keeps_pending_and_recent_rows(self):
+        old, recent, pending = self.queue(0), self.queue(1), self.queue(2)
+        QueuedEmail.objects.filter(pk__in=[old.pk, recent.pk]).update(status=QueuedEmail.STATUS_SENT)
+        QueuedEmail.objects.filter(pk__in=[old.pk, pending.pk]).update(created_at=timezone.now() - timedelta(days=8))
+
+        self.assertEqual(purge_queued_mail(days=7), 1)
+        self.assertCountEqual(QueuedEmail.objects.values_list("pk", flat=True), [recent.pk, pending.pk])
+
+
+# ======================================================
+# SEARCH (api/search.py)
+# ======================================================
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.john = make_visitor(1, first_name="John", email_address="john@example.com")
+        cls.tagged = make_visitor(2, first_name="Jane", email_address="jane.doe+expo@mail.example.co.in")
+        cls.other = make_visitor(3, first_name="Ravi", company_name="Globex", email_address="ravi@globex.com")
+
+    def search(self, q):
+        return list(search_registrations(VisitorRegistration.objects.all(), q))
+
+    def test_full_email_finds_its_row(self):
+        # Same answer from the Postgres GIN index and SQLite FTS5
+        self.assertEqual(self.search("john@example.com"), [self.john])
+        self.assertEqual(self.search(" JOHN@Example.com "), [self.john])
+        self.assertEqual(self.search("jane.doe+expo@mail.example.co.in"), [self.tagged])
+
+    def test_words_match_as_prefixes(self):
+        self.assertEqual(self.search("glob"), [self.other])
+        self.assertEqual(self.search("ravi glob"), [self.other])
+        self.assertEqual(self.search("ravi acme"), [])
+
+
+# ======================================================
+# DUPLICATE SUBMISSIONS (dedupe_key, Idempotency-Key)
+# ======================================================
+@override_settings(CACHES=LOCMEM_CACHE)
+class DuplicateSubmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post(self, headers=None, **fields):
+        return self.client.post(
+            "/api/visitor-registrations/",
+            {
+                "event_location": "Delhi",
+                "first_name": "Asha",
+                "last_name": "Rao",
+                "company_name": "Acme",
+                "email_address": "asha@example.com",
+                "phone_number": "9876543210",
+                "industry_interest": "Apparel",
+                **fields,
+            },
+            content_type="application/json",
+            headers=headers,
+        )
+
+    def test_repeat_with_reformatted_phone_and_email_returns_the_stored_row(self):
+        first = self.post()
+        again = self.post(email_address=" Asha@Example.COM ", phone_number="98765-43210", event_location="delhi ")
+
+        self.assertEqual((first.status_code, again.status_code), (201, 200))
+        self.assertEqual(again.json()["id"], first.json()["id"])
+        self.assertEqual(VisitorRegistration.objects.count(), 1)
+
+    def test_idempotency_key_replays_the_first_response(self):
+        first = self.post(headers={"Idempotency-Key": "abc"})
+        replay = self.post(headers={"Idempotency-Key": "abc"}, email_address="other@example.com")
+
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(VisitorRegistration.objects.count(), 1)
+
+    def test_concurrent_duplicate_loses_to_the_unique_key(self):
+        stored = make_visitor(1, email_address="asha@example.com", phone_number="9876543210")
+        real_first = QuerySet.first
+        lookups = []
+
+        # The other request's row landed between our lookup and our insert
+        def first(queryset):
+            lookups.append(queryset)
+            return None if len(lookups) == 1 else real_first(queryset)
+
+        with mock.patch.object(QuerySet, "first", first):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], stored.id)
+        self.assertEqual(VisitorRegistration.objects.count(), 1)
+
+    def test_database_rejects_a_second_row_with_the_same_key(self):
+        make_visitor(1)
+        with self.assertRaises(IntegrityError):
+            make_visitor(2, email_address="VISITOR1@example.com", phone_number="98 0000 0001")
+
+    def test_editing_into_a_duplicate_is_a_validation_error(self):
+        make_visitor(1)
+        other = make_visitor(2)
+
+        response = self.client.patch(
+            f"/api/visitor-registrations/{other.id}/",
+            {"email_address": "visitor1@example.com", "phone_number": "9800000001"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        other.refresh_from_db()
+        self.assertEqual(other.email_address, "visitor2@example.com")
+
+
+# ======================================================
+# BUFFERED INGEST (api/ingest.py)
+# ======================================================
+def visitor_data(i, **fields):
+    return {
+        "event_location": "Delhi",
+        "first_name": "Visitor",
+        "last_name": str(i),
+        "company_name": "Acme",
+        "email_address": f"visitor{i}@example.com",
+        "phone_number": f"98{i:08d}",
+        "industry_interest": "Apparel",
+        **fields,
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHE, REGISTRATION_FLUSH_IN_PROCESS=False)
+class JournalTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.enterContext(override_settings(REGISTRATION_JOURNAL_DIR=self.directory))
+
+    def files(self):
+        return sorted(os.listdir(self.directory))
+
+    def flush(self, after=10):
+        # Segments are flushed once they have closed
+        return flush_journal(now=time.time() + after)
+
+    def test_buffered_post_is_answered_then_flushed(self):
+        with override_settings(REGISTRATION_INGEST_MODE="buffered"):
+            response = self.client.post("/api/visitor-registrations/", visitor_data(1), content_type="application/json")
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(VisitorRegistration.objects.exists())
+
+        self.assertEqual(flush_journal(), (0, 0))  # segment still open
+        self.assertEqual(self.flush(), (1, 0))
+
+        row = VisitorRegistration.objects.get()
+        self.assertLess(abs((timezone.now() - row.created_at).total_seconds()), 5)
+        self.assertEqual(self.files(), [])
+
+    def test_claimed_segment_is_replayed_only_when_stale(self):
+        journal_registration(VisitorRegistration, visitor_data(1))
+        journal_registration(VisitorRegistration, visitor_data(2))
+        [segment] = self.files()
+        # A flusher claimed it, stored one row, then died
+        os.replace(os.path.join(self.directory, segment), os.path.join(self.directory, segment + ".flushing"))
+        make_visitor(1)
+
+        self.assertEqual(self.flush(), (0, 0))  # the claim is still live
+        self.assertEqual(self.flush(after=400), (1, 0))
+        self.assertEqual(VisitorRegistration.objects.count(), 2)
+        self.assertEqual(self.files(), [])
+
+    def test_refused_rows_are_kept_reported_and_requeued(self):
+        journal_registration(VisitorRegistration, visitor_data(1))
+        journal_registration(VisitorRegistration, visitor_data(2))
+
+        with mock.patch.object(QuerySet, "bulk_create", side_effect=DatabaseError("down")):
+            self.assertEqual(self.flush(), (0, 2))
+        [(path, rows)] = rejected_segments()
+        self.assertEqual(rows, 2)
+        with open(path) as fh:
+            self.assertIn('"received_at"', fh.readline())
+        self.assertIn(b"api_registrations_rejected_rows 2.0", render_metrics()[0])
+
+        stderr = StringIO()
+        with self.assertRaisesMessage(CommandError, "2 registration(s) rejected"):
+            call_command("flush_registrations", stdout=StringIO(), stderr=stderr)
+        self.assertIn(path.name, stderr.getvalue())
+
+        # Cause fixed: the requeued rows are flushed again
+        stdout = StringIO()
+        with mock.patch("api.ingest.time.time", return_value=time.time() + 10):
+            call_command("flush_registrations", "--requeue-rejected", stdout=stdout)
+        self.assertEqual(stdout.getvalue().split(), ["requeued=2", "created=2", "rejected=0"])
+        self.assertEqual(VisitorRegistration.objects.count(), 2)
+        self.assertEqual(self.files(), [])
+        self.assertIn(b"api_registrations_rejected_rows 0.0", render_metrics()[0])
+
+    def test_invalid_rows_do_not_block_the_batch(self):
+        journal_registration(VisitorRegistration, visitor_data(1, first_name=None))
+        journal_registration(VisitorRegistration, visitor_data(2))
+
+        self.assertEqual(self.flush(), (1, 1))
+        [(path, _)] = rejected_segments()
+        with open(path) as fh:
+            self.assertIn("first_name", fh.read())
+
+
+# ======================================================
+# S3 STORAGE (content-addressed uploads, moto)
+# ======================================================
+S3_SETTINGS = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_STORAGE_BUCKET_NAME": "igtf-test",
+    "AWS_S3_REGION_NAME": "us-east-1",
+    "AWS_S3_ENDPOINT_URL": "",
+    "CLOUDFRONT_URL": "",
+}
+
+
+def upload(data, name="photo.jpg"):
+    return SimpleUploadedFile(name, data, content_type="image/jpeg")
+
+
+@override_settings(**S3_SETTINGS)
+class S3TestCase(TestCase):
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        reset_s3_client()
+        self.addCleanup(reset_s3_client)
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="igtf-test")
+
+    def stored_keys(self):
+        listing = get_s3_client().list_objects_v2(Bucket="igtf-test")
+        return sorted(item["Key"] for item in listing.get("Contents", []))
+
+
+class ContentAddressedUploadTests(S3TestCase):
+    def uploaded_bytes(self, result):
+        labels = {"folder": "gallery", "result": result}
+        return REGISTRY.get_sample_value("api_upload_bytes_total", labels) or 0
+
+    def test_identical_uploads_share_one_object(self):
+        before = self.uploaded_bytes("uploaded")
+
+        first = upload_to_s3(upload(b"same bytes"), "gallery")
+        second = upload_to_s3(upload(b"same bytes", "copy.JPG"), "gallery")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.stored_keys(), [s3_key_from_url(first)])
+        self.assertEqual(StoredFile.objects.get().ref_count, 2)
+        # Only the first upload sent anything
+        self.assertEqual(self.uploaded_bytes("uploaded") - before, len(b"same bytes"))
+        self.assertEqual(self.uploaded_bytes("deduplicated"), 0)
+
+    def test_object_is_deleted_with_its_last_reference(self):
+        url = upload_to_s3(upload(b"shared"), "gallery")
+        upload_to_s3(upload(b"shared"), "gallery")
+
+        self.assertFalse(delete_from_s3(url))
+        self.assertEqual(self.stored_keys(), [s3_key_from_url(url)])
+        self.assertEqual(StoredFile.objects.get().ref_count, 1)
+
+        self.assertTrue(delete_from_s3(url))
+        self.assertEqual(self.stored_keys(), [])
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_delete_leaves_an_in_flight_upload_alone(self):
+        url = upload_to_s3(upload(b"racing"), "gallery")
+        # An identical upload has registered its transfer
+        StoredFile.objects.update(pending=1)
+
+        self.assertFalse(delete_from_s3(url))
+        self.assertEqual(self.stored_keys(), [s3_key_from_url(url)])
+        self.assertEqual(StoredFile.objects.get().ref_count, 0)  # tombstone
+
+        # The upload finishing revives it
+        StoredFile.objects.update(pending=0)
+        self.assertEqual(upload_to_s3(upload(b"racing"), "gallery"), url)
+        self.assertEqual(StoredFile.objects.get().ref_count, 1)
+
+    def test_hash_is_read_in_chunks_and_rewinds(self):
+        # Above FILE_UPLOAD_MAX_MEMORY_SIZE uploads are spooled to disk
+        data = b"x" * (3 * 1024 * 1024)
+        file_obj = TemporaryUploadedFile("big.jpg", "image/jpeg", len(data), None)
+        self.addCleanup(file_obj.close)
+        file_obj.write(data)
+        chunks = []
+        real_chunks = file_obj.chunks
+
+        def spy(*args, **kwargs):
+            for chunk in real_chunks(*args, **kwargs):
+                chunks.append(len(chunk))
+                yield chunk
+
+        with mock.patch.object(file_obj, "chunks", spy):
+            self.assertEqual(hash_upload(file_obj), (hashlib.sha256(data).hexdigest(), len(data)))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(file_obj.tell(), 0)
+
+
+
+# 5 MB is the smallest part S3 accepts
+@override_settings(AWS_S3_MULTIPART_THRESHOLD_MB=5, AWS_S3_MULTIPART_CHUNKSIZE_MB=5, AWS_S3_MAX_CONCURRENCY=4)
+class MultipartUploadTests(S3TestCase):
+    def spooled(self, data):
+        file_obj = TemporaryUploadedFile("big.jpg", "image/jpeg", len(data), None)
+        self.addCleanup(file_obj.close)
+        file_obj.write(data)
+        file_obj.seek(0)
+        return file_obj
+
+    def test_large_upload_sends_parts_in_parallel(self):
+        data = bytes(range(256)) * (11 * 4096)  # 11 MB: three parts
+        lock = threading.Lock()
+        parts = {"running": 0, "peak": 0, "count": 0}
+
+        def started(**kwargs):
+            with lock:
+                parts["running"] += 1
+                parts["count"] += 1
+                parts["peak"] = max(parts["peak"], parts["running"])
+            time.sleep(0.05)  # long enough for the other parts to start
+
+        def finished(**kwargs):
+            with lock:
+                parts["running"] -= 1
+
+        events = get_s3_client().meta.events
+        events.register("before-call.s3.UploadPart", started)
+        events.register("after-call.s3.UploadPart", finished)
+
+        url = upload_to_s3(self.spooled(data), "gallery")
+
+        self.assertEqual(parts["count"], 3)
+        self.assertGreater(parts["peak"], 1)
+        stored = get_s3_client().get_object(Bucket="igtf-test", Key=s3_key_from_url(url))
+        self.assertEqual(stored["Body"].read(), data)
+        self.assertTrue(stored["ETag"].strip('"').endswith("-3"))
+        self.assertEqual(stored["ContentType"], "image/jpeg")
+        self.assertEqual(stored["CacheControl"], "max-age=31536000, immutable")
+
+    def test_small_upload_is_a_single_put(self):
+        url = upload_to_s3(upload(b"small"), "gallery")
+
+        stored = get_s3_client().head_object(Bucket="igtf-test", Key=s3_key_from_url(url))
+        self.assertNotIn("-", stored["ETag"])
+
+
+class GalleryDuplicateTests(S3TestCase):
+    def setUp(self):
+        super().setUp()
+        manager = User.objects.create_user("manager", password="x", role=User.ROLE_MANAGER)
+        self.auth = bearer(manager)
+        self.url = upload_to_s3(upload(b"already here"), "gallery")
+        GalleryImage.objects.create(page="home", section="hero", image=self.url, display_order=1)
+
+    def post(self, path, **files):
+        with mock.patch("api.views.aupload_to_s3") as aupload, \
+                mock.patch("api.views.schedule_image_variants"):
+            response = self.client.post(path, {"page": "home", "section": "hero", **files}, **self.auth)
+        return response, aupload
+
+    def test_duplicate_is_rejected_before_upload(self):
+        response, aupload = self.post("/api/gallery/", image=upload(b"already here", "again.jpg"))
+
+        self.assertEqual(response.status_code, 400)
+        aupload.assert_not_called()
+        self.assertEqual(StoredFile.objects.get().ref_count, 1)
+
+    def test_batch_with_a_duplicate_is_rejected_before_upload(self):
+        images = [upload(b"new bytes", "new.jpg"), upload(b"already here", "again.jpg")]
+        response, aupload = self.post("/api/gallery/batch/", images=images)
+
+        self.assertEqual(response.status_code, 400)
+        aupload.assert_not_called()
+        self.assertEqual(self.stored_keys(), [s3_key_from_url(self.url)])
+
+# ======================================================
+# PUBLIC BUNDLE (api/cache.py)
+# ======================================================
+@override_settings(CACHES=LOCMEM_CACHE)
+class PublicBundleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def add_images(self, count, start=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(start, start + count):
+                GalleryImage.objects.create(
+                    page="gallery", section="main", image=f"https://cdn.example.com/{i}.jpg", display_order=i,
+                )
+
+    def test_batch_of_writes_costs_one_rebuild(self):
+        with mock.patch("api.cache.build_public_bundle", return_value=b"{}") as build:
+            self.add_images(50)
+            self.assertEqual(build.call_count, 0)
+
+            get_public_bundle()
+            get_public_bundle()
+        self.assertEqual(build.call_count, 1)
+
+    def test_served_bundle_follows_writes(self):
+        self.add_images(1)
+        self.assertEqual(self.client.get("/api/public/bundle/").json()["gallery"]["gallery"]["main"][0]["display_order"], 0)
+
+        self.add_images(1, start=1)
+        with self.assertNumQueries(3):  # rebuilt once: gallery, events, categories
+            response = self.client.get("/api/public/bundle/")
+        self.assertEqual(len(response.json()["gallery"]["gallery"]["main"]), 2)
+        with self.assertNumQueries(0):
+            self.client.get("/api/public/bundle/")
+
+    def test_last_bundle_is_served_while_another_request_rebuilds(self):
+        self.add_images(1)
+        old_body, old_etag, _ = get_public_bundle()
+        self.add_images(1, start=1)
+
+        # Another worker holds the build slot for the new stamps
+        with mock.patch("api.cache.cache.add", return_value=False):
+            body, etag, _ = get_public_bundle()
+        self.assertEqual((body, etag), (old_body, old_etag))
+
+        body, etag, _ = get_public_bundle()
+        self.assertNotEqual(etag, old_etag)
@@ -0,0 +1,184 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+# ======================================================
+# COUNTERS (one cache round trip per check on Redis)
+# ======================================================
+# INCR the current window (EXPIRE when new) and read the previous one
+_WINDOW_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {current, tonumber(redis.call('GET', KEYS[2]) or '0')}
+"""
+
+_redis_scripts = {}
+
+
+def _redis_window_script(cache):
+    """
+    Registered Lua script for a Redis-backed cache, None for other
+    backends. django-redis hands out its client through
+    get_redis_connection; Django's RedisCache has no public accessor, so
+    a client is opened on its LOCATION.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    location = settings.CACHES["default"].get("LOCATION", "")
+    if (backend, str(location)) not in _redis_scripts:
+        client = None
+        if backend.startswith("django_redis."):
+            from django_redis import get_redis_connection
+            client = get_redis_connection("default")
+        elif isinstance(cache, RedisCache):
+            import redis
+            # First server is the primary, like RedisCache's writes
+            primary = location[0] if isinstance(location, (list, tuple)) else location.split(",")[0]
+            client = redis.Redis.from_url(primary)
+        _redis_scripts[backend, str(location)] = client.register_script(_WINDOW_SCRIPT) if client else None
+    return _redis_scripts[backend, str(location)]
+
+
+def window_counts(current_key, previous_key, timeout):
+    """
+    Adds 1 to `current_key` (created with `timeout` when missing) and
+    returns (new value, value of `previous_key`). On Redis both happen in
+    one atomic script call; other backends use incr (add for the first
+    hit) and a get.
+    """
+    cache = caches["default"]
+
+    script = _redis_window_script(cache)
+    if script is not None:
+        # Same key prefix/version as cache.get/set would use
+        keys = [cache.make_and_validate_key(current_key), cache.make_and_validate_key(previous_key)]
+        current, previous = script(keys=keys, args=[timeout])
+        return current, previous
+
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        if cache.add(current_key, 1, timeout):
+            current = 1
+        else:
+            current = cache.incr(current_key)  # another worker created it first
+    return current, cache.get(previous_key, 0)
+
+
+# ======================================================
+# SLIDING-WINDOW THROTTLES
+# ======================================================
+class WindowThrottle(BaseThrottle):
+    """
+    Sliding-window counter per (scope, ident) held in the shared cache.
+    For the rate "N/period" each period gets a counter; a request is let
+    through while current + previous * (share of the previous window still
+    inside the last period) stays within N. Unlike a fixed window, a burst
+    straddling the boundary can't get 2N through. On Redis the increment
+    and the read are one atomic script call (see window_counts). Rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+    [scope]; a missing/empty rate turns the throttle off.
+    """
+    scope = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return True
+
+        ident = self.get_ident_value(request)
+        if not ident:
+            return True
+
+        limit, period = self.parse_rate(rate)
+        now = time.time()
+        window, offset = divmod(now, period)
+        remaining = 1 - offset / period  # share of the previous window still counted
+
+        digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+        key = f"api:throttle:{self.scope}:{digest}:"
+        # Kept for two periods: it is the "previous" counter of the next window
+        current, previous = window_counts(f"{key}{int(window)}", f"{key}{int(window) - 1}", 2 * period + 1)
+
+        if previous * remaining + current <= limit:
+            return True
+
+        if current > limit:
+            # Only the next window brings room
+            self.wait_seconds = period - offset
+        else:
+            # Room comes back as the previous window slides out
+            self.wait_seconds = (remaining - (limit - current) / previous) * period
+        return False
+
+    @staticmethod
+    def parse_rate(rate):
+        # Same "5/min" syntax as DRF's SimpleRateThrottle
+        num, period = rate.split("/")
+        return int(num), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+
+    def wait(self):
+        return getattr(self, "wait_seconds", None)
+
+
+class IPWindowThrottle(WindowThrottle):
+    # Client IP: REMOTE_ADDR, or the X-Forwarded-For entry added by the
+    # outermost of REST_FRAMEWORK["NUM_PROXIES"] trusted proxies
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class FieldWindowThrottle(WindowThrottle):
+    # Normalised value of a body field (email / username)
+    field = "email"
+
+    def get_ident_value(self, request):
+        try:
+            value = request.data.get(self.field)
+        except AttributeError:
+            return None
+        return str(value).strip().lower() if value else None
+
+
+# Per-endpoint scopes (rates in settings.REST_FRAMEWORK)
+class RegistrationIPThrottle(IPWindowThrottle):
+    scope = "registration"
+
+
+class RegistrationEmailThrottle(FieldWindowThrottle):
+    scope = "registration_email"
+    field = "email_address"
+
+
+class OTPSendIPThrottle(IPWindowThrottle):
+    scope = "otp_send"
+
+
+class OTPSendEmailThrottle(FieldWindowThrottle):
+    scope = "otp_send_email"
+
+
+class OTPVerifyIPThrottle(IPWindowThrottle):
+    scope = "otp_verify"
+
+
+class OTPVerifyEmailThrottle(FieldWindowThrottle):
+    scope = "otp_verify_email"
+
+
+class LoginIPThrottle(IPWindowThrottle):
+    scope = "login"
+
+
+class LoginUsernameThrottle(FieldWindowThrottle):
+    scope = "login_username"
+    field = "username"
@@ -4,7 +4,10 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     health_check,
+    request_timings,
+    metrics_view,
     update_system_settings,
+    public_bundle,
 
     # Auth
     LoginView,
@@ -54,6 +57,8 @@ urlpatterns = [
     # -----------------------------------
     path('', health_check, name='health'),
     path("system/update/", update_system_settings),
+    path('api/metrics/timings/', request_timings, name='request_timings'),
+    path('metrics', metrics_view, name='metrics'),
     # -----------------------------------
     # Authentication (Hybrid Method)
     # -----------------------------------
@@ -89,6 +94,11 @@ urlpatterns = [
     path('api/password/verify-otp/', verify_otp, name='verify_otp'),
     path('api/password/create/', create_password, name='create_password'),
 
+    # -----------------------------------
+    # Public pages (one prebuilt response)
+    # -----------------------------------
+    path('api/public/bundle/', public_bundle, name='public_bundle'),
+
     # -----------------------------------
     # CRUD Router
     # -----------------------------------
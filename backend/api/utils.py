@@ -1,8 +1,27 @@
+import base64
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
 import boto3
-from uuid import uuid4
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from PIL import Image, ImageFilter, ImageOps, features
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cache import PUBLIC_CACHE_RESOURCES, invalidate_public_cache
+from .instrumentation import track
+from .metrics import UPLOAD_BYTES, UPLOAD_LATENCY
+from .models import StoredFile
+
+logger = logging.getLogger(__name__)
 
 
 # ======================================================
@@ -39,7 +58,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 # JWT TOKEN CREATION UTILITY
 # ======================================================
 def create_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    # Same claims as /api/login/, so ClaimsJWTAuthentication can skip the user query
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
@@ -47,68 +67,464 @@ def create_tokens_for_user(user):
 
 
 # ======================================================
-# S3 UPLOAD HELPER (public-read)
+# SHARED S3 CLIENT (created once per process, thread-safe)
 # ======================================================
-def upload_to_s3(file_obj, folder="categories"):
+_s3_client = None
+_s3_lock = threading.Lock()
+
+
+def get_s3_client():
     """
-    Uploads file to S3 and returns CloudFront URL if configured.
+    Returns the process-wide S3 client. boto3 clients are thread-safe, so
+    one client (and its HTTP connection pool) is reused by every request
+    instead of paying credential/endpoint setup on each upload.
     """
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME,
-    )
+    global _s3_client
+    if _s3_client is None:
+        with _s3_lock:
+            if _s3_client is None:
+                _s3_client = boto3.session.Session().client(
+                    "s3",
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+                    region_name=settings.AWS_S3_REGION_NAME or None,
+                    endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", "") or None,
+                    config=Config(
+                        max_pool_connections=getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 20),
+                        tcp_keepalive=True,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                    ),
+                )
+    return _s3_client
+
 
-    file_ext = file_obj.name.split(".")[-1]
-    unique_name = f"{uuid4()}.{file_ext}"
-    file_key = f"{folder}/{unique_name}"
+def reset_s3_client():
+    """Drops the shared client (settings changed, tests, after fork)."""
+    global _s3_client
+    with _s3_lock:
+        _s3_client = None
 
-    s3.upload_fileobj(
-        Fileobj=file_obj,
-        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-        Key=file_key,
-        ExtraArgs={"ContentType": file_obj.content_type}
+
+def get_transfer_config():
+    # Files above the threshold go up as parallel multipart chunks
+    mb = 1024 * 1024
+    return TransferConfig(
+        multipart_threshold=getattr(settings, "AWS_S3_MULTIPART_THRESHOLD_MB", 8) * mb,
+        multipart_chunksize=getattr(settings, "AWS_S3_MULTIPART_CHUNKSIZE_MB", 8) * mb,
+        max_concurrency=getattr(settings, "AWS_S3_MAX_CONCURRENCY", 4),
+        use_threads=True,
     )
 
+
+def _s3_base_url():
+    """Public URL prefix for objects (without CloudFront)."""
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    endpoint = getattr(settings, "AWS_S3_ENDPOINT_URL", "").rstrip("/")
+    if endpoint:
+        # MinIO / local S3 stand-ins use path-style URLs
+        return f"{endpoint}/{bucket}/"
+    return f"https://{bucket}.s3.{settings.AWS_S3_REGION_NAME}.amazonaws.com/"
+
+
+# ======================================================
+# S3 UPLOAD HELPER (public-read, content-addressed)
+# ======================================================
+def hash_upload(file_obj):
+    """
+    SHA-256 and size of an upload, read chunk by chunk (spooled temp files
+    are never loaded whole). Leaves the file rewound for the upload, which
+    streams it again: the key is the hash, so it must be known before any
+    byte is sent (a duplicate then transfers nothing).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    file_obj.seek(0)
+    for chunk in file_obj.chunks() if hasattr(file_obj, "chunks") else iter(lambda: file_obj.read(1 << 20), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest(), size
+
+
+def upload_to_s3(file_obj, folder="categories", content_hash=None):
+    """
+    Uploads file to S3 and returns CloudFront URL if configured.
+    Objects are keyed by content hash: re-uploading identical bytes only
+    bumps the reference count and returns the existing URL. Pass
+    `content_hash` (from hash_upload) to skip hashing the file again.
+    """
+    started = perf_counter()
+    result = "error"
+    sha256, size = content_hash or hash_upload(file_obj)
+    try:
+        url, result = _store_upload(file_obj, folder, sha256, size)
+        return url
+    finally:
+        UPLOAD_LATENCY.labels(folder, result).observe(perf_counter() - started)
+        if result == "uploaded":
+            # Bytes actually sent to S3; a deduplicated upload sends none
+            UPLOAD_BYTES.labels(folder, result).inc(size)
+
+
+def _content_key(folder, sha256, filename):
+    return f"{folder}/{sha256}.{filename.split('.')[-1].lower()}"
+
+
+def content_url(folder, content_hash, filename):
+    """
+    URL upload_to_s3 returns for these bytes, known before anything is
+    sent: the stored object's when the bytes are already in S3.
+    """
+    sha256, _ = content_hash
+    key = StoredFile.objects.filter(sha256=sha256).values_list("key", flat=True).first()
+    return s3_url_for_key(key or _content_key(folder, sha256, filename))
+
+
+def _store_upload(file_obj, folder, sha256, size):
+    rows = StoredFile.objects.filter(sha256=sha256)
+    file_key = _content_key(folder, sha256, file_obj.name)
+
+    # Single-statement updates: a delete_from_s3 holding the row lock
+    # finishes first, and these then see its outcome
+    while True:
+        # Live object: count one more reference
+        if rows.filter(ref_count__gt=0).update(ref_count=F("ref_count") + 1):
+            return s3_url_for_key(rows.values_list("key", flat=True).get()), "deduplicated"
+
+        # Tombstone (ref_count=0) or new bytes: register the transfer first,
+        # so delete_from_s3 leaves the object alone while it is in flight
+        if rows.filter(ref_count=0).update(pending=F("pending") + 1):
+            file_key = rows.values_list("key", flat=True).get()
+            break
+
+        try:
+            with transaction.atomic():
+                StoredFile.objects.create(
+                    sha256=sha256,
+                    key=file_key,
+                    size=size,
+                    content_type=file_obj.content_type or "",
+                    ref_count=0,
+                    pending=1,
+                )
+            break
+        except IntegrityError:
+            # Same bytes registered concurrently: go again
+            continue
+
+    try:
+        with track("s3"):
+            get_s3_client().upload_fileobj(
+                Fileobj=file_obj,
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=file_key,
+                ExtraArgs={
+                    "ContentType": file_obj.content_type,
+                    # The key changes whenever the content does
+                    "CacheControl": "max-age=31536000, immutable",
+                },
+                Config=get_transfer_config(),
+            )
+    except Exception:
+        rows.update(pending=F("pending") - 1)
+        raise
+
+    rows.update(pending=F("pending") - 1, ref_count=F("ref_count") + 1)
+    return s3_url_for_key(file_key), "uploaded"
+
+
+def s3_url_for_key(file_key):
     # 🔥 Use CloudFront URL if configured
     cdn = getattr(settings, "CLOUDFRONT_URL", "").rstrip("/")
     if cdn:
         return f"{cdn}/{file_key}"
 
     # fallback to S3
-    bucket = settings.AWS_STORAGE_BUCKET_NAME
-    region = settings.AWS_S3_REGION_NAME
-    return f"https://{bucket}.s3.{region}.amazonaws.com/{file_key}"
+    return f"{_s3_base_url()}{file_key}"
+
+
+def s3_key_from_url(file_url):
+    # Example: https://bucket.s3.us-east-2.amazonaws.com/categories/uuid.jpg
+    cdn = getattr(settings, "CLOUDFRONT_URL", "").rstrip("/")
+
+    prefix = _s3_base_url()
+    if file_url.startswith(prefix):
+        return file_url.replace(prefix, "", 1)
+    if cdn and file_url.startswith(f"{cdn}/"):
+        return file_url.replace(f"{cdn}/", "", 1)
+    # fallback
+    return file_url.split(".amazonaws.com/")[-1]
+
+
+def _delete_key(file_key):
+    try:
+        with track("s3"):
+            get_s3_client().delete_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=file_key,
+            )
+        return True
+
+    except Exception:
+        logger.exception("Error deleting %s from S3", file_key)
+        return False
 
 
 def delete_from_s3(file_url):
     """
-    Deletes a file from S3 using its full URL.
+    Drops one reference to a file; the S3 object itself is only deleted
+    with its last reference. Returns True when the object was removed.
+    The StoredFile row stays locked until the object is gone (an identical
+    upload waits, then stores the bytes again) and is kept as a tombstone
+    when the delete fails or an identical upload is in flight.
     """
     if not file_url:
-        return
+        return False
 
-    # Example: https://bucket.s3.us-east-2.amazonaws.com/categories/uuid.jpg
-    try:
-        bucket_name = settings.AWS_STORAGE_BUCKET_NAME
-        region = settings.AWS_S3_REGION_NAME
+    file_key = s3_key_from_url(file_url)
+
+    with transaction.atomic():
+        stored = StoredFile.objects.select_for_update().filter(key=file_key).first()
+        if stored is None:
+            # Uploaded before content addressing: one object per row
+            _delete_key(file_key)
+            return True
+
+        if stored.ref_count > 1:
+            StoredFile.objects.filter(pk=stored.pk).update(ref_count=F("ref_count") - 1)
+            return False
+
+        # An upload of the same bytes is about to make the object live again
+        if stored.pending or not _delete_key(file_key):
+            # Tombstone: the next identical upload re-uploads and revives it
+            StoredFile.objects.filter(pk=stored.pk).update(ref_count=0)
+            return False
 
-        prefix = f"https://{bucket_name}.s3.{region}.amazonaws.com/"
-        if file_url.startswith(prefix):
-            key = file_url.replace(prefix, "")
-        else:
-            # fallback
-            key = file_url.split(".amazonaws.com/")[-1]
+        stored.delete()
 
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=region,
-        )
+    return True
 
-        s3.delete_object(Bucket=bucket_name, Key=key)
+
+def is_stored(file_url):
+    """True while at least one row still references the object."""
+    return StoredFile.objects.filter(key=s3_key_from_url(file_url), ref_count__gt=0).exists()
+
+
+def delete_many_from_s3(file_urls):
+    """
+    Deletes several files in one DeleteObjects request (max 1000 keys).
+    """
+    keys = [{"Key": s3_key_from_url(url)} for url in file_urls if url]
+    if not keys:
+        return
+
+    try:
+        with track("s3"):
+            get_s3_client().delete_objects(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Delete={"Objects": keys[:1000], "Quiet": True},
+            )
 
     except Exception as e:
         print("Error deleting from S3:", e)
+
+
+# ======================================================
+# ASYNC S3 HELPERS (async views, see api/async_views.py)
+# ======================================================
+_s3_executor = None
+
+
+def _get_s3_executor():
+    # One pool thread per pooled HTTP connection of the shared client
+    global _s3_executor
+    if _s3_executor is None:
+        with _s3_lock:
+            if _s3_executor is None:
+                _s3_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 20),
+                    thread_name_prefix="s3",
+                )
+    return _s3_executor
+
+
+def _run_on_s3_pool(fn, *args):
+    # Pool threads open their own DB connection (StoredFile ref counts)
+    try:
+        return fn(*args)
+    finally:
+        connections.close_all()
+
+
+async def _offload(fn, *args):
+    """
+    Runs a blocking S3 helper on the S3 pool: the event loop keeps serving
+    other requests meanwhile. There is no async S3 client in use, so the
+    transfer itself still happens on a thread.
+    """
+    run = sync_to_async(_run_on_s3_pool, thread_sensitive=False, executor=_get_s3_executor())
+    return await run(fn, *args)
+
+
+async def aupload_to_s3(file_obj, folder="categories", content_hash=None):
+    return await _offload(upload_to_s3, file_obj, folder, content_hash)
+
+
+async def adelete_from_s3(file_url):
+    return await _offload(delete_from_s3, file_url)
+
+
+async def adelete_many_from_s3(file_urls):
+    return await _offload(delete_many_from_s3, file_urls)
+
+
+# ======================================================
+# IMAGE VARIANTS (responsive WebP/AVIF + blur placeholder)
+# ======================================================
+_image_pool = None
+_image_pool_lock = threading.Lock()
+
+
+def _get_image_pool():
+    global _image_pool
+    if _image_pool is None:
+        with _image_pool_lock:
+            if _image_pool is None:
+                _image_pool = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "IMAGE_PROCESSING_WORKERS", 2),
+                    thread_name_prefix="image-variants",
+                )
+    return _image_pool
+
+
+def _variant_formats():
+    formats = getattr(settings, "IMAGE_VARIANT_FORMATS", ("webp", "avif"))
+    return [fmt for fmt in formats if features.check(fmt)]
+
+
+def variant_urls(variants):
+    """Flattens a `variants` field into a list of URLs."""
+    return [url for by_width in (variants or {}).values() for url in by_width.values()]
+
+
+def build_image_variants(data, base_key):
+    """
+    Decodes `data` once and uploads a resized copy per width and format.
+    Re-encoding drops EXIF/GPS and other metadata. Returns
+    (variants, placeholder) where placeholder is a tiny blurred data URI.
+    """
+    widths = sorted(getattr(settings, "IMAGE_VARIANT_WIDTHS", (480, 960, 1600)))
+    quality = getattr(settings, "IMAGE_VARIANT_QUALITY", 75)
+    client = get_s3_client()
+    stem = base_key.rsplit(".", 1)[0]
+
+    with Image.open(BytesIO(data)) as source:
+        # Let JPEG decode at a reduced scale when the original is huge
+        source.draft("RGB", (widths[-1], widths[-1]))
+        img = ImageOps.exif_transpose(source)
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    # Never upscale: keep widths below the original plus the original width itself
+    targets = [w for w in widths if w < img.width] or [img.width]
+    if img.width < widths[-1] and img.width not in targets:
+        targets.append(img.width)
+
+    variants = {fmt: {} for fmt in _variant_formats()}
+    for width in targets:
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+
+        for fmt in variants:
+            buffer = BytesIO()
+            resized.save(buffer, fmt.upper(), quality=quality)
+            key = f"{stem}-{width}w.{fmt}"
+            client.put_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=key,
+                Body=buffer.getvalue(),
+                ContentType=f"image/{fmt}",
+                CacheControl="max-age=31536000, immutable",
+            )
+            variants[fmt][str(width)] = s3_url_for_key(key)
+
+    thumb = img.copy()
+    thumb.thumbnail((16, 16))
+    thumb = thumb.filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    thumb.save(buffer, "WEBP", quality=40)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+    return variants, placeholder
+
+
+def _save_variants(model, pk, variants, placeholder):
+    # .update() skips post_save, so drop the cached public responses here
+    updated = model.objects.filter(pk=pk).update(variants=variants, placeholder=placeholder)
+    if updated:
+        invalidate_public_cache(PUBLIC_CACHE_RESOURCES[model])
+    return updated
+
+
+def _build_and_save_variants(model, pk, base_key):
+    variants, placeholder = build_image_variants(read_stored_original(base_key), base_key)
+    if _save_variants(model, pk, variants, placeholder):
+        return variants, placeholder
+    if not is_stored(s3_url_for_key(base_key)):
+        # Row (and the last reference to the original) deleted while we were encoding
+        delete_many_from_s3(variant_urls(variants))
+    return None
+
+
+def _process_image_variants(model, pk, base_key):
+    try:
+        _build_and_save_variants(model, pk, base_key)
+    except Exception:
+        logger.exception("Error building image variants for %s %s", model.__name__, pk)
+    finally:
+        connections.close_all()
+
+
+def read_stored_original(file_key):
+    """Downloads the original upload stored under `file_key`."""
+    response = get_s3_client().get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_key)
+    return response["Body"].read()
+
+
+def schedule_image_variants(instance, sync=None):
+    """
+    Queues variant generation (from the original, read back from S3) for
+    a saved Category/GalleryImage so the upload request doesn't wait on
+    encoding or hold the image in memory. Set IMAGE_PROCESSING_SYNC (or pass sync=True) to run
+    inline; `instance` then carries the new variants. Queued jobs live in
+    this process only: rows left at variants={} by a restart are picked
+    up by `manage.py backfill_image_variants`.
+    """
+    if not instance.image:
+        return
+
+    # Identical upload already encoded: variant keys follow the content hash
+    done = (
+        type(instance).objects
+        .filter(image=instance.image)
+        .exclude(pk=instance.pk)
+        .exclude(variants={})
+        .values_list("variants", "placeholder")
+        .first()
+    )
+    if done:
+        _save_variants(type(instance), instance.pk, *done)
+        instance.variants, instance.placeholder = done
+        return
+
+    args = (type(instance), instance.pk, s3_key_from_url(instance.image))
+
+    if sync is None:
+        sync = getattr(settings, "IMAGE_PROCESSING_SYNC", False)
+    if sync:
+        done = _build_and_save_variants(*args)
+        if done:
+            instance.variants, instance.placeholder = done
+        return
+
+    _get_image_pool().submit(_process_image_variants, *args)
@@ -1,21 +1,69 @@
 # api/views.py
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, action, throttle_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny, IsAuthenticated, BasePermission
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.settings import api_settings
 
-from django.core.mail import send_mail
 from django.contrib.auth import get_user_model, authenticate
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, quote_etag
 from django.conf import settings
-from .utils import upload_to_s3, delete_from_s3
-from django.db import connection, models
-import random
+from .utils import (
+    adelete_from_s3,
+    adelete_many_from_s3,
+    aupload_to_s3,
+    content_url,
+    hash_upload,
+    schedule_image_variants,
+    variant_urls,
+)
+from .cache import (
+    get_health_snapshot,
+    get_public_bundle,
+    get_public_response,
+    get_registration_stats,
+    invalidate_public_cache,
+    IDEMPOTENCY_PENDING,
+    abort_idempotent,
+    begin_idempotent,
+    finish_idempotent,
+    invalidate_registration_stats,
+)
+from .pagination import RegistrationKeysetPagination, GalleryKeysetPagination
+from .search import search_registrations
+from .exports import stream_export
+from .imports import ImportFileError, detect_format, import_registrations
+from .ingest import buffered_ingest_enabled, journal_registration
+from .emails import queue_mail
+from .instrumentation import route_stats
+from .metrics import OTP_EVENTS, render_metrics
+from .otp import get_otp_store, OTP_OK, OTP_NOT_FOUND, OTP_EXPIRED, OTP_INVALID, OTP_LOCKED
+from .async_views import AsyncViewMixin
+from .authentication import CachedJWTAuthentication, ClaimsJWTAuthentication, ClaimsOnReadMixin
+from .throttling import (
+    LoginIPThrottle,
+    LoginUsernameThrottle,
+    OTPSendEmailThrottle,
+    OTPSendIPThrottle,
+    OTPVerifyEmailThrottle,
+    OTPVerifyIPThrottle,
+    RegistrationEmailThrottle,
+    RegistrationIPThrottle,
+)
+from django.db import IntegrityError, models, transaction
 import uuid
+import logging
 from datetime import timedelta
+import asyncio
+
+from asgiref.sync import sync_to_async
 
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -28,6 +76,7 @@ from .models import (
     GalleryImage,
     PasswordSetupToken,
     SystemSettings,
+    registration_dedupe_key,
 )
 from .serializers import (
     ExhibitorRegistrationSerializer,
@@ -43,6 +92,7 @@ from .utils import CustomTokenObtainPairSerializer, create_tokens_for_user
 # Helpers
 # -----------------------------------------------------------------------------
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 def _set_refresh_cookie(response: Response, refresh_token: str):
     """
@@ -98,11 +148,10 @@ def _user_payload(user: User):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def health_check(request):
-    # DB check
+    # Served from the cached snapshot; DB is probed at most once per HEALTH_CHECK_INTERVAL.
+    # Kept sync: as an async view it would need two thread hops (auth, cache) instead of one
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1;")
-        db_status = "ok"
+        snapshot = get_health_snapshot()
     except Exception as e:
         return Response({
             "status": "error",
@@ -111,14 +160,36 @@ def health_check(request):
             "date_of_online": None
         }, status=500)
 
-    settings_obj = SystemSettings.get_settings()
+    return Response(snapshot)
+
+
+# Prometheus scrape endpoint: METRICS_TOKEN is required as a Bearer token,
+# without one configured the endpoint stays closed
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if not token:
+        return Response({"detail": "Metrics are disabled until METRICS_TOKEN is set"}, status=403)
+    if not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return Response({"detail": "Invalid metrics token"}, status=401)
+
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+# Rolling per-route latency percentiles (this worker only; REQUEST_TIMING=True)
+@api_view(['GET'])
+@authentication_classes([ClaimsJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def request_timings(request):
+    if not getattr(request.user, "role", None) == "admin" and not request.user.is_superuser:
+        return Response({"detail": "Only admin can view metrics"}, status=403)
 
-    # Apply your rule: date only matters when under maintenance is true
     return Response({
-        "status": "ok",
-        "db": db_status,
-        "under_maintenance": settings_obj.under_maintenance,
-        "date_of_online": settings_obj.date_of_online if settings_obj.under_maintenance else None,
+        "enabled": settings.REQUEST_TIMING,
+        "routes": route_stats.snapshot(),
     })
 
 # -----------------------------------------------------------------------------
@@ -131,6 +202,7 @@ class LoginView(TokenObtainPairView):
     """
     serializer_class = CustomTokenObtainPairSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -201,7 +273,7 @@ def request_password_reset(request):
     reset_link = f"{frontend}/reset-password?token={token_obj.token}"
 
     # Send email
-    send_mail(
+    queue_mail(
         "Reset Your Password",
         f"Hello {user.get_full_name() or user.username},\n"
         f"Use this link to reset your password:\n{reset_link}\n\n"
@@ -254,7 +326,7 @@ def create_team_user(request):
     setup_link = f"{frontend}/create-password?token={token_obj.token}"
 
     # Send email
-    send_mail(
+    queue_mail(
         "Set Your Password",
         f"Hello {name},\nUse this link to set your password:\n{setup_link}\nThis link expires in 24 hours.",
         "no-reply@yourapp.com",
@@ -268,6 +340,7 @@ def create_team_user(request):
     })
 
 @api_view(['GET'])
+@authentication_classes([ClaimsJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def list_team_users(request):
     """List all non-admin team users (managers & sales)."""
@@ -303,10 +376,17 @@ def delete_team_user(request, user_id):
 # -----------------------------------------------------------------------------
 # OTP flow
 # -----------------------------------------------------------------------------
-OTP_STORE = {}
+# Shared across workers; backend chosen by settings.OTP_STORE (see api/otp.py)
+OTP_ERRORS = {
+    OTP_NOT_FOUND: "OTP not found",
+    OTP_EXPIRED: "OTP expired",
+    OTP_INVALID: "Invalid OTP",
+    OTP_LOCKED: "Too many attempts, request a new OTP",
+}
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([OTPSendIPThrottle, OTPSendEmailThrottle])
 def send_otp(request):
     email = request.data.get("email")
     token = request.data.get("token")
@@ -324,15 +404,12 @@ def send_otp(request):
         return Response({"detail": "Email does not match invitation"}, status=403)
 
     # Generate OTP
-    otp = random.randint(100000, 999999)
-    OTP_STORE[email] = {
-        "otp": otp,
-        "created_at": timezone.now()
-    }
+    otp = get_otp_store().issue(email)
+    OTP_EVENTS.labels("send", "sent").inc()
 
-    send_mail(
+    queue_mail(
         "Your OTP Code",
-        f"Your OTP is {otp}. It expires in 5 minutes.",
+        f"Your OTP is {otp}. It expires in {settings.OTP_STORE['TTL'] // 60} minutes.",
         "no-reply@yourapp.com",
         [email]
     )
@@ -341,6 +418,7 @@ def send_otp(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([OTPVerifyIPThrottle, OTPVerifyEmailThrottle])
 def verify_otp(request):
     email = request.data.get("email")
     otp = request.data.get("otp")
@@ -348,18 +426,10 @@ def verify_otp(request):
     if not email or not otp:
         return Response({"detail": "Email & OTP required"}, status=400)
 
-    entry = OTP_STORE.get(email)
-
-    if not entry:
-        return Response({"detail": "OTP not found"}, status=400)
-
-    # Check expiry
-    if timezone.now() > entry["created_at"] + timedelta(minutes=5):
-        OTP_STORE.pop(email, None)
-        return Response({"detail": "OTP expired"}, status=400)
-
-    if entry["otp"] != int(otp):
-        return Response({"detail": "Invalid OTP"}, status=400)
+    result = get_otp_store().verify(email, otp)
+    OTP_EVENTS.labels("verify", result).inc()
+    if result != OTP_OK:
+        return Response({"detail": OTP_ERRORS[result]}, status=400)
 
     return Response({"message": "OTP verified"})
 
@@ -368,6 +438,7 @@ def verify_otp(request):
 # -----------------------------------------------------------------------------
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([OTPVerifyIPThrottle, OTPVerifyEmailThrottle])
 def create_password(request):
     """
     Expected body:
@@ -389,16 +460,10 @@ def create_password(request):
         return Response({"detail": "Missing required fields (email, otp, password, token, username)"}, status=400)
 
     # OTP VALIDATION
-    entry = OTP_STORE.get(email)
-    if not entry:
-        return Response({"detail": "OTP not found"}, status=400)
-
-    if timezone.now() > entry["created_at"] + timedelta(minutes=5):
-        OTP_STORE.pop(email, None)
-        return Response({"detail": "OTP expired"}, status=400)
-
-    if entry["otp"] != int(otp):
-        return Response({"detail": "Invalid OTP"}, status=400)
+    result = get_otp_store().verify(email, otp)
+    OTP_EVENTS.labels("verify", result).inc()
+    if result != OTP_OK:
+        return Response({"detail": OTP_ERRORS[result]}, status=400)
 
     # TOKEN VALIDATION (1 DAY)
     try:
@@ -426,7 +491,7 @@ def create_password(request):
     user.save()
 
     # Cleanup
-    OTP_STORE.pop(email, None)
+    get_otp_store().discard(email)
     token_obj.delete()
 
     # Create tokens and set refresh cookie (so frontend gets access & user only)
@@ -588,49 +653,364 @@ def me_view(request):
 # -----------------------------------------------------------------------------
 # CRUD viewsets (unchanged behaviour except permission classes kept)
 # -----------------------------------------------------------------------------
-class ExhibitorRegistrationViewSet(viewsets.ModelViewSet):
+class KeysetOptInMixin:
+    """
+    ?pagination=cursor switches a list endpoint to keyset pagination;
+    without it the existing page-number pagination is used unchanged.
+    """
+    keyset_pagination_class = None
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, "_paginator")
+            and self.keyset_pagination_class is not None
+            and self.request.query_params.get("pagination") == "cursor"
+        ):
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
+
+
+BULK_STATUS_MAX_IDS = 1000
+
+
+class RegistrationViewSetMixin(ClaimsOnReadMixin, KeysetOptInMixin):
+    """
+    Shared filtering & extra endpoints for exhibitor & visitor registrations.
+    Reads (list, stats) authenticate from the token claims; export, import
+    and bulk-status load the (cached) User.
+    """
+    keyset_pagination_class = RegistrationKeysetPagination
+
+    # FILTERING (?status=, ?event_location=, ?email=) - each backed by an index
+    # SEARCH (?q=) - ranked full-text search, see api/search.py
+    def get_queryset(self):
+        qs = super().get_queryset()
+        params = self.request.query_params
+
+        status_filter = params.get("status")
+        location = params.get("event_location")
+        email = params.get("email")
+        q = params.get("q")
+
+        if status_filter:
+            qs = qs.filter(status=status_filter)
+
+        if location:
+            qs = qs.filter(event_location=location)
+
+        if email:
+            # Stored lowercased by the serializers
+            qs = qs.filter(email_address=email.strip().lower())
+
+        if q:
+            qs = search_registrations(qs, q)
+
+        return qs
+
+    # Public submissions are rate limited per IP and per email (see api/throttling.py)
+    def get_throttles(self):
+        if self.action == "create":
+            return [RegistrationIPThrottle(), RegistrationEmailThrottle()]
+        return super().get_throttles()
+
+    # POST: an Idempotency-Key header replays the first response for that key,
+    # and a submission matching a stored row (see registration_dedupe_key)
+    # returns that row with 200 instead of inserting again
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get("Idempotency-Key", "").strip()
+        if not key:
+            return self._create(request)
+
+        if len(key) > 255:
+            return Response({"detail": "Idempotency-Key is too long"}, status=400)
+
+        scope = self.queryset.model._meta.model_name
+        previous = begin_idempotent(scope, key)
+        if previous == IDEMPOTENCY_PENDING:
+            return Response({"detail": "A request with this Idempotency-Key is in progress"}, status=409)
+        if previous is not None:
+            response = Response(previous["data"], status=previous["status"])
+            response["Idempotent-Replayed"] = "true"
+            return response
+
+        try:
+            response = self._create(request)
+        except Exception:
+            abort_idempotent(scope, key)
+            raise
+
+        if response.status_code < 400:
+            finish_idempotent(scope, key, response.status_code, response.data)
+        else:
+            abort_idempotent(scope, key)
+        return response
+
+    def _create(self, request):
+        model = self.queryset.model
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        dedupe_key = registration_dedupe_key(
+            data.get("email_address"),
+            data.get(model.dedupe_phone_field),
+            data.get("event_location"),
+        )
+        existing = model.objects.filter(dedupe_key=dedupe_key).first()
+        if existing:
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+
+        # REGISTRATION_INGEST_MODE=buffered: append to the journal and answer 202;
+        # the flusher (api.ingest) bulk-inserts the rows a moment later
+        if buffered_ingest_enabled():
+            try:
+                journal_registration(model, dict(data))
+                return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+            except OSError:
+                logger.exception("Error writing registration journal, saving directly")
+
+        try:
+            with transaction.atomic():
+                self.perform_create(serializer)
+        except IntegrityError:
+            # A concurrent identical submission won the unique dedupe_key
+            existing = model.objects.filter(dedupe_key=dedupe_key).first()
+            if existing is None:
+                raise
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            # save() has already set the new dedupe_key on the instance
+            if not type(instance).objects.filter(dedupe_key=instance.dedupe_key).exclude(pk=instance.pk).exists():
+                raise
+            raise ValidationError({
+                "detail": "Another registration has this email, phone number and event location",
+            })
+
+    # GET /api/<registrations>/export/?export_format=csv|xlsx (same filters as the list)
+    # Bulk PII download: checks the user still exists (cached lookup, not token claims)
+    @action(
+        detail=False,
+        methods=["get"],
+        authentication_classes=[CachedJWTAuthentication],
+        permission_classes=[IsAuthenticated],
+    )
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_export(queryset, request.query_params.get("export_format", "csv"))
+
+    # POST /api/<registrations>/import/  multipart: file=<.csv|.xlsx>, dry_run=1, atomic=1
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        authentication_classes=[CachedJWTAuthentication],
+        permission_classes=[IsAuthenticated],
+        parser_classes=[MultiPartParser],
+    )
+    def import_file(self, request):
+        if not getattr(request.user, "role", None) == "admin" and not request.user.is_superuser:
+            return Response({"detail": "Only admin can import registrations"}, status=403)
+
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"detail": "file is required"}, status=400)
+
+        def flag(name):
+            return str(request.data.get(name, "")).lower() in ("1", "true")
+
+        try:
+            report = import_registrations(
+                self.queryset.model,
+                upload,
+                file_format=detect_format(upload.name, request.data.get("format")),
+                dry_run=flag("dry_run"),
+                atomic=flag("atomic"),
+            )
+        except ImportFileError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        return Response(report, status=201 if report["created"] else 200)
+
+    # POST /api/<registrations>/bulk-status/  {"ids": [1, 2, 3], "status": "contacted"}
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-status",
+        authentication_classes=[CachedJWTAuthentication],
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk_status(self, request):
+        model = self.queryset.model
+        ids = request.data.get("ids")
+        new_status = request.data.get("status")
+
+        if new_status not in dict(model.STATUS_CHOICES):
+            return Response({"detail": "Invalid status"}, status=400)
+
+        if not isinstance(ids, list) or not ids:
+            return Response({"detail": "ids must be a non-empty list"}, status=400)
+
+        if len(ids) > BULK_STATUS_MAX_IDS:
+            return Response({"detail": f"At most {BULK_STATUS_MAX_IDS} ids per request"}, status=400)
+
+        try:
+            ids = list(dict.fromkeys(int(i) for i in ids))
+        except (TypeError, ValueError):
+            return Response({"detail": "ids must be integers"}, status=400)
+
+        # One SELECT for per-id results + one UPDATE ... WHERE id IN (...)
+        with transaction.atomic():
+            found = set(model.objects.filter(id__in=ids).values_list("id", flat=True))
+            updated = model.objects.filter(id__in=found).update(
+                status=new_status,
+                updated_at=timezone.now(),
+            )
+
+        # .update() skips post_save, so refresh cached stats here
+        invalidate_registration_stats(model)
+
+        return Response({
+            "status": new_status,
+            "updated": updated,
+            "results": {str(i): ("updated" if i in found else "not_found") for i in ids},
+        })
+
+    # GET /api/<registrations>/stats/
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        return Response(get_registration_stats(self.queryset.model))
+
+
+class ExhibitorRegistrationViewSet(RegistrationViewSetMixin, viewsets.ModelViewSet):
     queryset = ExhibitorRegistration.objects.all().order_by('-created_at')
     serializer_class = ExhibitorRegistrationSerializer
     permission_classes = [AllowAny]
 
 
-class VisitorRegistrationViewSet(viewsets.ModelViewSet):
+class VisitorRegistrationViewSet(RegistrationViewSetMixin, viewsets.ModelViewSet):
     queryset = VisitorRegistration.objects.all().order_by('-created_at')
     serializer_class = VisitorRegistrationSerializer
     permission_classes = [AllowAny]
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class PublicCacheMixin(ClaimsOnReadMixin):
+    """
+    Serves list/retrieve from the public response cache with ETag and
+    Last-Modified; If-None-Match / If-Modified-Since answer 304. Entries
+    are keyed by URL plus `public_cache_params` and dropped by the model
+    signals (see api.signals) whenever the resource changes.
+    """
+    public_cache_resource = None
+    public_cache_params = ("page",)
+
+    def list(self, request, *args, **kwargs):
+        return self._public_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._public_response(request, super().retrieve, *args, **kwargs)
+
+    def _public_response(self, request, handler, *args, **kwargs):
+        params = sorted(
+            (name, request.query_params.getlist(name))
+            for name in self.public_cache_params
+            if name in request.query_params
+        )
+        data, etag, last_modified = get_public_response(
+            self.public_cache_resource,
+            request.build_absolute_uri(request.path),
+            params,
+            lambda: handler(request, *args, **kwargs).data,
+        )
+
+        return _public_cache_response(request, etag, last_modified, lambda: Response(data))
+
+
+def _public_cache_response(request, etag, last_modified, make_response):
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = make_response()
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Browsers/CDNs may store it but must revalidate (cheap 304s)
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+# PUBLIC BUNDLE: GET /api/public/bundle/ (events + categories + gallery)
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def public_bundle(request):
+    # Prebuilt JSON bytes: no auth lookup, no queries, no serializer pass
+    body, etag, last_modified = get_public_bundle()
+    return _public_cache_response(
+        request,
+        etag,
+        last_modified,
+        lambda: HttpResponse(body, content_type="application/json"),
+    )
+
+
+def _read_form(request):
+    # Multipart parsing spools large files to disk: keep it off the event loop
+    data = request.data.copy()
+    return data, request.FILES
+
+
+class CategoryViewSet(AsyncViewMixin, PublicCacheMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [AllowAny]
+    public_cache_resource = "categories"
 
     http_method_names = ['get', 'post', 'delete']
 
-    def create(self, request, *args, **kwargs):
-        data = request.data.copy()
+    async def create(self, request, *args, **kwargs):
+        data, files = await sync_to_async(_read_form)(request)
 
-        file_obj = request.FILES.get("image")
+        file_obj = files.get("image")
         if file_obj:
-            url = upload_to_s3(file_obj, folder="categories")
-            data["image"] = url
+            data["image"] = await aupload_to_s3(file_obj, "categories")
+
+        return Response(await sync_to_async(self._save_category)(data))
 
+    def _save_category(self, data):
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
+        instance = serializer.save()
 
-    def perform_destroy(self, instance):
-        if instance.image:
-            delete_from_s3(instance.image)
-        instance.delete()
+        # Responsive variants are encoded in the background
+        schedule_image_variants(instance)
 
+        return serializer.data
 
-class EventViewSet(viewsets.ModelViewSet):
+    async def destroy(self, request, *args, **kwargs):
+        instance = await sync_to_async(self.get_object)()
+
+        # Shared objects (and their variants) stay until the last reference goes
+        if await adelete_from_s3(instance.image):
+            await adelete_many_from_s3(variant_urls(instance.variants))
+        await instance.adelete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class EventViewSet(PublicCacheMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by('-start_date')
     serializer_class = EventSerializer
     permission_classes = [AllowAny]
+    public_cache_resource = "events"
 
 
 # ==============================================================
@@ -687,13 +1067,54 @@ class GalleryPagination(PageNumberPagination):
     page_query_param = "p"   # IMPORTANT FIX
 
 
+# (page, section) -> (max images, error message)
+GALLERY_SECTION_LIMITS = {
+    ("about", "banner"): (1, "Banner allows only 1 image."),
+    ("about", "why_exhibit"): (10, "Max 10 images allowed."),
+    ("about", "why_choose_igtf"): (10, "Max 10 images allowed."),
+    ("gallery", "main"): (5, "Gallery main allows max 5 images."),
+}
+
+GALLERY_BATCH_MAX_FILES = 50
+
+
+def _gallery_limit_error(page, section, existing_count, adding=1):
+    limit = GALLERY_SECTION_LIMITS.get((page, section))
+    if limit and existing_count + adding > limit[0]:
+        return limit[1]
+    return None
+
 
-class GalleryImageViewSet(viewsets.ModelViewSet):
+def _hash_uploads(files):
+    # Streamed chunk by chunk; uploads never sit in memory whole
+    return [hash_upload(f) for f in files]
+
+
+def _save_gallery_batch(page, section, urls, start):
+    instances = GalleryImage.objects.bulk_create([
+        GalleryImage(page=page, section=section, image=url, display_order=start + i)
+        for i, url in enumerate(urls, start=1)
+    ])
+    # bulk_create skips post_save
+    invalidate_public_cache("gallery")
+
+    # Instances carry their variants only with IMAGE_PROCESSING_SYNC;
+    # otherwise they go out with variants={} and are filled in later
+    for instance in instances:
+        schedule_image_variants(instance)
+    return instances
+
+
+
+class GalleryImageViewSet(AsyncViewMixin, PublicCacheMixin, KeysetOptInMixin, viewsets.ModelViewSet):
     serializer_class = GalleryImageSerializer
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [IsAdminOrManager]
     queryset = GalleryImage.objects.all().order_by("page", "section", "display_order", "id")
     pagination_class = GalleryPagination
+    keyset_pagination_class = GalleryKeysetPagination
+    public_cache_resource = "gallery"
+    public_cache_params = ("page", "section", "p", "page_size", "pagination", "cursor", "count")
 
     http_method_names = ["get", "post", "delete", "head", "options"]
 
@@ -712,10 +1133,11 @@ class GalleryImageViewSet(viewsets.ModelViewSet):
         return qs.order_by("display_order", "id")
 
     # CREATE 
-    def create(self, request, *args, **kwargs):
-        page = request.data.get("page")
-        section = request.data.get("section")
-        image_file = request.FILES.get("image")
+    async def create(self, request, *args, **kwargs):
+        data, files = await sync_to_async(_read_form)(request)
+        page = data.get("page")
+        section = data.get("section")
+        image_file = files.get("image")
 
         if not page or not section:
             return Response({"error": "page and section are required"}, status=400)
@@ -723,26 +1145,34 @@ class GalleryImageViewSet(viewsets.ModelViewSet):
         if not image_file:
             return Response({"error": "Image file is required"}, status=400)
 
-        existing = GalleryImage.objects.filter(page=page, section=section)
+        # One aggregate for both the section limit and the next display_order
+        existing = await GalleryImage.objects.filter(page=page, section=section).aaggregate(
+            count=models.Count("id"),
+            max=models.Max("display_order"),
+        )
 
         # RULES
-        if page == "about" and section == "banner":
-            if existing.exists():
-                return Response({"error": "Banner allows only 1 image."}, status=400)
+        error = _gallery_limit_error(page, section, existing["count"])
+        if error:
+            return Response({"error": error}, status=400)
 
-        if page == "about" and section in ["why_exhibit", "why_choose_igtf"]:
-            if existing.count() >= 10:
-                return Response({"error": "Max 10 images allowed."}, status=400)
-
-        if page == "gallery" and section == "main":
-            if existing.count() >= 5:
-                return Response({"error": "Gallery main allows max 5 images."}, status=400)
+        # Content-addressed URLs: same URL means the same image, and the URL
+        # is known from the hash, so a duplicate is turned away before any transfer
+        content_hash = await sync_to_async(hash_upload)(image_file)
+        expected_url = await sync_to_async(content_url)("gallery", content_hash, image_file.name)
+        if await GalleryImage.objects.filter(page=page, section=section, image=expected_url).aexists():
+            return Response({"error": "This image is already in this section."}, status=400)
 
         # S3 Upload
-        image_url = upload_to_s3(image_file, "gallery")
+        image_url = await aupload_to_s3(image_file, "gallery", content_hash)
+
+        # Added by a concurrent request in the meantime
+        if await GalleryImage.objects.filter(page=page, section=section, image=image_url).aexists():
+            await adelete_from_s3(image_url)
+            return Response({"error": "This image is already in this section."}, status=400)
 
         # ORDER
-        max_order = existing.aggregate(max=models.Max("display_order"))["max"] or 0
+        max_order = existing["max"] or 0
 
         data = {
             "page": page,
@@ -750,21 +1180,96 @@ class GalleryImageViewSet(viewsets.ModelViewSet):
             "image": image_url,
             "display_order": max_order + 1,
         }
+        return Response(await sync_to_async(self._save_image)(data), status=201)
 
+    def _save_image(self, data):
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
         instance = serializer.save()
 
-        return Response(self.serializer_class(instance).data, status=201)
+        # Responsive variants are encoded in the background
+        schedule_image_variants(instance)
+
+        return self.serializer_class(instance).data
+
+    # BATCH CREATE: POST /api/gallery/batch/ (page, section, images=<file> x N)
+    @action(detail=False, methods=["post"])
+    async def batch(self, request):
+        data, files = await sync_to_async(_read_form)(request)
+        page = data.get("page")
+        section = data.get("section")
+        files = files.getlist("images") or files.getlist("image")
+
+        if not page or not section:
+            return Response({"error": "page and section are required"}, status=400)
+
+        if page not in dict(GalleryImage.PAGE_CHOICES) or section not in dict(GalleryImage.SECTION_CHOICES):
+            return Response({"error": "Invalid page or section"}, status=400)
+
+        if not files:
+            return Response({"error": "At least one image file is required"}, status=400)
+
+        if len(files) > GALLERY_BATCH_MAX_FILES:
+            return Response({"error": f"Max {GALLERY_BATCH_MAX_FILES} images per batch."}, status=400)
+
+        # Section limits checked once for the whole batch
+        existing = await GalleryImage.objects.filter(page=page, section=section).aaggregate(
+            count=models.Count("id"),
+            max=models.Max("display_order"),
+        )
+        error = _gallery_limit_error(page, section, existing["count"], adding=len(files))
+        if error:
+            return Response({"error": error}, status=400)
+
+        # Hash up front so repeated files are rejected before any transfer
+        hashes = await sync_to_async(_hash_uploads)(files)
+        if len({sha256 for sha256, _ in hashes}) < len(hashes):
+            return Response({"error": "Duplicate images in this batch."}, status=400)
+
+        expected_urls = await sync_to_async(
+            lambda: [content_url("gallery", h, f.name) for f, h in zip(files, hashes)]
+        )()
+        if await GalleryImage.objects.filter(page=page, section=section, image__in=expected_urls).aexists():
+            return Response({"error": "Some images are already in this section, no images were added."}, status=400)
+
+        # Concurrent S3 uploads (the shared client is thread-safe); order is preserved
+        limit = asyncio.Semaphore(getattr(settings, "GALLERY_UPLOAD_WORKERS", 4))
+
+        async def upload(file_obj, content_hash):
+            async with limit:
+                return await aupload_to_s3(file_obj, "gallery", content_hash)
+
+        results = await asyncio.gather(
+            *(upload(f, h) for f, h in zip(files, hashes)),
+            return_exceptions=True,
+        )
+        urls = [url for url in results if not isinstance(url, BaseException)]
+
+        if len(urls) < len(results):
+            # All-or-nothing: don't leave orphaned objects behind
+            for url in urls:
+                await adelete_from_s3(url)
+            return Response({"error": "Upload failed, no images were added."}, status=502)
+
+        # Added by a concurrent request in the meantime
+        if await GalleryImage.objects.filter(page=page, section=section, image__in=urls).aexists():
+            for url in urls:
+                await adelete_from_s3(url)
+            return Response({"error": "Some images are already in this section, no images were added."}, status=400)
+
+        start = existing["max"] or 0
+        instances = await sync_to_async(_save_gallery_batch)(page, section, urls, start)
+        return Response(self.serializer_class(instances, many=True).data, status=201)
 
     # DELETE
-    def destroy(self, request, *args, **kwargs):
-        instance = self.get_object()
+    async def destroy(self, request, *args, **kwargs):
+        instance = await sync_to_async(self.get_object)()
 
-        if instance.image:
-            delete_from_s3(instance.image)
+        # Shared objects (and their variants) stay until the last reference goes
+        if await adelete_from_s3(instance.image):
+            await adelete_many_from_s3(variant_urls(instance.variants))
 
-        instance.delete()
+        await instance.adelete()
 
         return Response({"message": "Deleted successfully."}, status=200)
 
@@ -0,0 +1,249 @@
+"""
+End-to-end API benchmark: throughput and latency of the main request paths
+against a seeded test database (see `manage.py seed_data`).
+
+Scenarios: health check, public gallery list and bundle, registration
+submit, dashboard list / filter / search / cursor page, /api/me/, login
+and cookie refresh. Each one runs `--requests` calls over `--concurrency`
+threads, every thread with its own test Client (and its own DB connection).
+
+Results are printed as JSON (and written to --output). With --baseline a
+previous result file is compared: a scenario regresses when its p95 grows
+or its throughput drops by more than --tolerance, and the script exits 1,
+so CI can run it against a stored baseline.
+
+    python -m benchmarks.bench_api --output bench.json
+    python -m benchmarks.bench_api --scenarios health,dashboard_filter --requests 500
+    python -m benchmarks.bench_api --baseline bench.json --tolerance 0.25
+    USE_SQLITE=False DB_NAME=igtf DB_USER=postgres DB_PASSWORD=... DB_HOST=127.0.0.1 \\
+        python -m benchmarks.bench_api
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import sys
+
+from benchmarks.common import BACKEND_DIR, load_test, setup_django, test_database
+
+
+BENCH_USER = "bench-admin"
+BENCH_PASSWORD = "bench-password-123"
+
+
+def expect(response, status=200):
+    assert response.status_code == status, f"{response.status_code}: {response.content[:200]!r}"
+    return response
+
+
+# ======================================================
+# SCENARIOS (name -> factory returning one thread's call)
+# ======================================================
+_ids = itertools.count()
+
+
+def health():
+    from django.test import Client
+
+    client = Client()
+    return lambda: expect(client.get("/"))
+
+
+def gallery_list():
+    from django.test import Client
+
+    client = Client()
+    return lambda: expect(client.get("/api/gallery/", {"page": "gallery", "section": "exhibition_moments"}))
+
+
+def public_bundle():
+    from django.test import Client
+
+    client = Client()
+    return lambda: expect(client.get("/api/public/bundle/"))
+
+
+def registration_submit():
+    from django.test import Client
+
+    client = Client()
+
+    def call():
+        i = next(_ids)
+        expect(client.post("/api/exhibitor-registrations/", {
+            "event_location": "Delhi",
+            "company_name": f"Bench Co {i}",
+            "contact_person_name": "Bench User",
+            "designation": "Director",
+            "email_address": f"bench{i}@example.com",
+            "contact_number": f"99{i:08d}",
+            "product_category": "Apparel",
+            "company_address": "1 Bench Road",
+        }, content_type="application/json"), 201)
+
+    return call
+
+
+def _logged_in_client():
+    from django.test import Client
+
+    client = Client()
+    response = expect(client.post(
+        "/api/login/",
+        {"username": BENCH_USER, "password": BENCH_PASSWORD},
+        content_type="application/json",
+    ))
+    client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {response.json()['access']}"
+    return client
+
+
+def _dashboard(params):
+    def factory():
+        client = _logged_in_client()
+        return lambda: expect(client.get("/api/exhibitor-registrations/", params))
+    return factory
+
+
+def me():
+    client = _logged_in_client()
+    return lambda: expect(client.get("/api/me/"))
+
+
+def login():
+    from django.test import Client
+
+    client = Client()
+    credentials = {"username": BENCH_USER, "password": BENCH_PASSWORD}
+    return lambda: expect(client.post("/api/login/", credentials, content_type="application/json"))
+
+
+def refresh():
+    client = _logged_in_client()  # leaves the refresh cookie on the client
+    return lambda: expect(client.post("/api/token/refresh-cookie/"))
+
+
+SCENARIOS = {
+    "health": health,
+    "gallery_list": gallery_list,
+    "public_bundle": public_bundle,
+    "registration_submit": registration_submit,
+    "dashboard_list": _dashboard({}),
+    "dashboard_filter": _dashboard({"status": "paid", "event_location": "Delhi"}),
+    "dashboard_search": _dashboard({"q": "acme"}),
+    "dashboard_cursor": _dashboard({"pagination": "cursor"}),
+    "me": me,
+    "login": login,
+    "refresh": refresh,
+}
+
+# Password hashing dominates these; fewer calls keep the run short
+SLOW_SCENARIOS = {"login"}
+
+
+# ======================================================
+# BASELINE COMPARISON
+# ======================================================
+def compare(results, baseline, tolerance):
+    """Returns a list of human-readable regressions (empty when none)."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "p95_ms" not in previous or "p95_ms" not in current:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["requests_per_s"] < previous["requests_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {previous['requests_per_s']}/s -> {current['requests_per_s']}/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--exhibitors", type=int, default=20_000)
+    parser.add_argument("--visitors", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=12)
+    parser.add_argument("--gallery", type=int, default=35)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    os.environ.setdefault("ALLOWED_HOSTS", "testserver")
+    # Measure the endpoints, not the rate limits (see bench_throttle)
+    os.environ.setdefault("THROTTLE_ENABLED", "False")
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    if connection.vendor == "sqlite":
+        # Threads need a shared on-disk database (the in-memory one locks up on writes)
+        connection.settings_dict["TEST"]["NAME"] = str(BACKEND_DIR / "bench_api.sqlite3")
+
+    results = {
+        "benchmark": "api",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": {
+            "exhibitors": args.exhibitors,
+            "visitors": args.visitors,
+            "events": args.events,
+            "gallery": args.gallery,
+        },
+        "scenarios": {},
+    }
+
+    with test_database():
+        from api.models import User
+
+        results["vendor"] = connection.vendor
+        call_command(
+            "seed_data",
+            exhibitors=args.exhibitors,
+            visitors=args.visitors,
+            events=args.events,
+            gallery=args.gallery,
+            stdout=io.StringIO(),
+        )
+        User.objects.create_superuser(BENCH_USER, "bench-admin@example.com", BENCH_PASSWORD)
+        connection.close()  # threads open their own
+
+        for name in names:
+            requests = args.requests
+            if name in SLOW_SCENARIOS:
+                requests = max(args.concurrency, requests // 10)
+            results["scenarios"][name] = load_test(SCENARIOS[name], requests, args.concurrency)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+
+    problems = [
+        f"{name}: {stats['errors']} errors ({stats.get('first_error')})"
+        for name, stats in results["scenarios"].items()
+        if stats["errors"]
+    ]
+    if args.baseline:
+        with open(args.baseline) as fh:
+            problems += compare(results, json.load(fh), args.tolerance)
+
+    for line in problems:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Concurrent upload throughput of ONE worker process under WSGI and ASGI.
+
+POST /api/categories/ with an image, S3 replaced by a stand-in client that
+waits --s3-ms per transfer (the network time a real upload spends idle):
+
+  wsgi_sync     WSGIHandler, one request at a time (gunicorn's default sync worker)
+  wsgi_threads  WSGIHandler on --threads threads (gunicorn -k gthread --threads N)
+  asgi          ASGIHandler with ASGI_MODE on, --concurrency requests in flight
+                on one event loop (uvicorn / gunicorn -k uvicorn.workers.UvicornWorker)
+
+The handlers are called directly, like a server would, so the numbers leave
+out HTTP parsing. Every mode runs in its own process and test database.
+
+    python -m benchmarks.bench_asgi --requests 400 --concurrency 32 --s3-ms 50
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import BACKEND_DIR, latency_stats, setup_django, test_database
+
+
+MODES = ("wsgi_sync", "wsgi_threads", "asgi")
+PATH = "/api/categories/"
+BOUNDARY = "BenchBoundary"
+
+_ids = itertools.count()
+
+
+class SlowS3:
+    """Stands in for the boto3 client: blocks like a transfer, stores nothing."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        Fileobj.read()
+        time.sleep(self.seconds)
+
+    def put_object(self, **kwargs):
+        time.sleep(self.seconds)
+
+    def delete_object(self, **kwargs):
+        time.sleep(self.seconds)
+
+    def delete_objects(self, **kwargs):
+        time.sleep(self.seconds)
+
+
+def upload_body(image):
+    from django.test.client import encode_multipart
+
+    i = next(_ids)
+    # Unique bytes per request, otherwise uploads dedupe by content hash
+    upload = io.BytesIO(image + i.to_bytes(8, "big"))
+    upload.name = f"bench-{i}.jpg"
+    return encode_multipart(BOUNDARY, {"name": f"Bench category {i}", "image": upload})
+
+
+def make_image():
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (120, 40, 200)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+# ======================================================
+# DRIVERS
+# ======================================================
+def run_wsgi(image, requests, threads):
+    from django.core.handlers.wsgi import WSGIHandler
+    from wsgiref.util import setup_testing_defaults
+
+    handler = WSGIHandler()
+    per_thread = max(1, requests // threads)
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def request():
+        body = upload_body(image)
+        environ = {
+            "REQUEST_METHOD": "POST",
+            "PATH_INFO": PATH,
+            "CONTENT_TYPE": f"multipart/form-data; boundary={BOUNDARY}",
+            "CONTENT_LENGTH": str(len(body)),
+            "HTTP_HOST": "testserver",
+            "wsgi.input": io.BytesIO(body),
+        }
+        setup_testing_defaults(environ)
+        status = []
+        response = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+        try:
+            b"".join(response)
+        finally:
+            response.close()
+        return int(status[0].split()[0])
+
+    def worker():
+        samples, failed = [], []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            code = request()
+            if code == 200:
+                samples.append((time.perf_counter() - start) * 1000)
+            else:
+                failed.append(code)
+        with lock:
+            latencies.extend(samples)
+            errors.extend(failed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(worker) for _ in range(threads)]:
+            future.result()
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_asgi(image, requests, concurrency):
+    from django.core.handlers.asgi import ASGIHandler
+
+    app = ASGIHandler()
+    latencies, errors = [], []
+
+    async def request():
+        body = upload_body(image)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": PATH,
+            "raw_path": PATH.encode(),
+            "query_string": b"",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()  # client never disconnects
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        await app(scope, receive, send)
+        return status[0]
+
+    async def main():
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with limit:
+                start = time.perf_counter()
+                code = await request()
+                if code == 200:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors.append(code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(main())
+    return latencies, errors, elapsed
+
+
+def run_mode(args):
+    os.environ.setdefault("ALLOWED_HOSTS", "testserver")
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection
+    import api.utils
+
+    if connection.vendor == "sqlite":
+        # Request threads need a shared on-disk database
+        connection.settings_dict["TEST"]["NAME"] = str(BACKEND_DIR / f"bench_asgi_{args.run_mode}.sqlite3")
+
+    # Only the upload is measured: no variant encoding, no real S3
+    settings.IMAGE_VARIANT_FORMATS = ()
+    api.utils._s3_client = SlowS3(args.s3_ms / 1000)
+    image = make_image()
+
+    with test_database():
+        if args.run_mode == "asgi":
+            latencies, errors, elapsed = run_asgi(image, args.requests, args.concurrency)
+        else:
+            threads = 1 if args.run_mode == "wsgi_sync" else args.threads
+            latencies, errors, elapsed = run_wsgi(image, args.requests, threads)
+        # Background placeholder jobs still use the test database
+        api.utils._get_image_pool().shutdown(wait=True)
+
+    result = {
+        "mode": args.run_mode,
+        "vendor": connection.vendor,
+        "requests": len(latencies) + len(errors),
+        "errors": len(errors),
+        "uploads_per_s": round(len(latencies) / elapsed, 1),
+    }
+    if latencies:
+        result.update(latency_stats(latencies))
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32, help="In-flight requests for asgi")
+    parser.add_argument("--threads", type=int, default=4, help="Threads for wsgi_threads")
+    parser.add_argument("--s3-ms", type=float, default=50, help="Simulated S3 time per transfer")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args)))
+        return
+
+    results = {
+        "benchmark": "asgi_uploads",
+        "s3_ms": args.s3_ms,
+        "concurrency": args.concurrency,
+        "threads": args.threads,
+        "modes": {},
+    }
+    for mode in args.modes.split(","):
+        env = {
+            **os.environ,
+            "ASGI_MODE": str(mode == "asgi"),
+            "DB_CONN_MODE": os.environ.get("DB_CONN_MODE", "none"),
+            "REQUEST_TIMING": "False",
+            "THROTTLE_ENABLED": "False",
+        }
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_asgi", *sys.argv[1:], "--run-mode", mode],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        results["modes"][mode] = json.loads(out.strip().splitlines()[-1])
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Request throughput for each DB connection strategy (DB_CONN_MODE):
+"none" (connect per request), "persistent" (CONN_MAX_AGE) and "pool"
+(psycopg 3 pool, Postgres only).
+
+Every mode runs in its own process against a fresh test database; worker
+threads call the WSGI handler directly (the test Client skips
+close_old_connections) with the cache disabled so each request hits the DB.
+In pool mode connections_opened counts pool checkouts (Django sends
+connection_created for each), not new server connections.
+
+    python -m benchmarks.bench_connections --requests 2000 --concurrency 8
+    USE_SQLITE=False DB_NAME=igtf DB_USER=postgres DB_PASSWORD=... DB_HOST=127.0.0.1 \\
+        python -m benchmarks.bench_connections
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.common import BACKEND_DIR, setup_django, test_database
+
+
+MODES = ("none", "persistent", "pool")
+
+
+def run_mode(args):
+    os.environ.setdefault("ALLOWED_HOSTS", "testserver")
+    setup_django()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection, connections
+    from django.db.backends.signals import connection_created
+
+    if connection.vendor == "sqlite":
+        if args.run_mode == "pool":
+            return {"mode": "pool", "skipped": "pooling needs Postgres"}
+        # In-memory test databases never close; use a file so modes differ
+        connection.settings_dict["TEST"]["NAME"] = str(BACKEND_DIR / "bench_connections.sqlite3")
+
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+
+    with test_database():
+        from api.models import Event
+
+        Event.objects.bulk_create([
+            Event(
+                title=f"Event {i}",
+                location="Delhi",
+                start_date=datetime.date(2026, 1, 1) + datetime.timedelta(days=i),
+                end_date=datetime.date(2026, 1, 2) + datetime.timedelta(days=i),
+            )
+            for i in range(20)
+        ])
+        opened.clear()
+
+        per_thread = args.requests // args.concurrency
+        latencies = []
+        lock = threading.Lock()
+
+        handler = WSGIHandler()
+        path, _, query = args.path.partition("?")
+
+        def request():
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": query,
+                "HTTP_HOST": "testserver",
+                "wsgi.input": io.BytesIO(),
+            }
+            setup_testing_defaults(environ)
+            status = []
+            body = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+            try:
+                b"".join(body)
+            finally:
+                body.close()  # fires request_finished -> close_old_connections
+            assert status[0].startswith("200"), status[0]
+
+        def worker():
+            samples = []
+            try:
+                for _ in range(per_thread):
+                    start = time.perf_counter()
+                    request()
+                    samples.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.extend(samples)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            for future in [pool.submit(worker) for _ in range(args.concurrency)]:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": args.run_mode,
+        "vendor": connection.vendor,
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        "connections_opened": len(opened),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--path", default="/api/events/")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args)))
+        return
+
+    results = []
+    for mode in args.modes.split(","):
+        env = {
+            **os.environ,
+            "DB_CONN_MODE": mode,
+            # Every request should reach the database
+            "CACHE_BACKEND": "django.core.cache.backends.dummy.DummyCache",
+            "REQUEST_TIMING": "False",
+        }
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.bench_connections",
+                "--run-mode", mode,
+                "--requests", str(args.requests),
+                "--concurrency", str(args.concurrency),
+                "--path", args.path,
+            ],
+            cwd=BACKEND_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(json.dumps({"benchmark": "db_connections", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
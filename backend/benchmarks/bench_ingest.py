@@ -0,0 +1,109 @@
+"""
+Registration submission throughput: direct saves vs the buffered journal
+(REGISTRATION_INGEST_MODE=buffered) with fsync and write durability.
+
+For buffered modes the request phase is timed on its own, then the journal
+is flushed and the flush time is reported; "end_to_end_per_s" counts both.
+
+    python -m benchmarks.bench_ingest --requests 2000 --concurrency 8
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import BACKEND_DIR, load_test, setup_django, test_database
+
+
+MODES = {
+    "direct": {"REGISTRATION_INGEST_MODE": "direct"},
+    "buffered_fsync": {"REGISTRATION_INGEST_MODE": "buffered", "REGISTRATION_JOURNAL_SYNC": "fsync"},
+    "buffered_write": {"REGISTRATION_INGEST_MODE": "buffered", "REGISTRATION_JOURNAL_SYNC": "write"},
+}
+
+_ids = itertools.count()
+
+
+def submit_worker():
+    from django.test import Client
+
+    client = Client()
+
+    def call():
+        i = next(_ids)
+        response = client.post("/api/visitor-registrations/", {
+            "event_location": "Delhi",
+            "first_name": "Bench",
+            "last_name": f"Visitor {i}",
+            "company_name": "Bench Co",
+            "email_address": f"ingest{i}@example.com",
+            "phone_number": f"98{i:08d}",
+            "industry_interest": "Textiles",
+        }, content_type="application/json")
+        assert response.status_code in (201, 202), response.status_code
+
+    return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ALLOWED_HOSTS", "testserver")
+    # Measure the endpoints, not the rate limits (see bench_throttle)
+    os.environ.setdefault("THROTTLE_ENABLED", "False")
+    setup_django()
+
+    from django.db import connection
+    from django.test import override_settings
+
+    if connection.vendor == "sqlite":
+        # Threads need a shared on-disk database (the in-memory one locks up on writes)
+        connection.settings_dict["TEST"]["NAME"] = str(BACKEND_DIR / "bench_ingest.sqlite3")
+
+    results = {"benchmark": "ingest", "concurrency": args.concurrency, "modes": {}}
+
+    with test_database(), tempfile.TemporaryDirectory() as journal_dir:
+        from api.ingest import flush_journal
+        from api.models import VisitorRegistration
+
+        results["vendor"] = connection.vendor
+        for mode in args.modes.split(","):
+            overrides = {
+                **MODES[mode],
+                "REGISTRATION_JOURNAL_DIR": journal_dir,
+                "REGISTRATION_FLUSH_IN_PROCESS": False,
+            }
+            before = VisitorRegistration.objects.count()
+
+            with override_settings(**overrides):
+                stats = load_test(submit_worker, args.requests, args.concurrency)
+                flush_started = time.perf_counter()
+                if overrides["REGISTRATION_INGEST_MODE"] == "buffered":
+                    flush_journal(now=float("inf"))
+                flush_seconds = time.perf_counter() - flush_started
+
+            stored = VisitorRegistration.objects.count() - before
+            request_seconds = stats["requests"] / stats["requests_per_s"]
+            results["modes"][mode] = {
+                **stats,
+                "stored": stored,
+                "flush_s": round(flush_seconds, 3),
+                "end_to_end_per_s": round(stored / (request_seconds + flush_seconds), 1),
+            }
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Per-upload latency: a new boto3 client per call (old upload_to_s3) vs the
+shared pooled client from api.utils.get_s3_client, plus re-uploading a file
+that is already stored (deduplicated by content hash, no S3 transfer).
+
+Runs against moto's in-process S3 by default (pip install moto), or a
+real S3-compatible endpoint such as MinIO with --endpoint-url.
+
+    python -m benchmarks.bench_s3 --uploads 50 --size-kb 256
+"""
+import argparse
+import json
+import os
+from contextlib import nullcontext
+from uuid import uuid4
+
+from benchmarks.common import measure, setup_django, test_database
+
+
+BUCKET = "igtf-bench"
+
+
+def legacy_upload(file_obj, folder="bench"):
+    # What upload_to_s3 did before: build a client on every call
+    import boto3
+    from django.conf import settings
+
+    s3 = boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
+    )
+    s3.upload_fileobj(
+        Fileobj=file_obj,
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=f"{folder}/{uuid4()}.jpg",
+        ExtraArgs={"ContentType": file_obj.content_type},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--endpoint-url", default="", help="S3-compatible endpoint; moto is used when empty")
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    setup_django()
+
+    from django.conf import settings
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from api.utils import get_s3_client, reset_s3_client, upload_to_s3
+
+    settings.AWS_ACCESS_KEY_ID = os.environ["AWS_ACCESS_KEY_ID"]
+    settings.AWS_SECRET_ACCESS_KEY = os.environ["AWS_SECRET_ACCESS_KEY"]
+    settings.AWS_STORAGE_BUCKET_NAME = BUCKET
+    settings.AWS_S3_REGION_NAME = "us-east-1"
+    settings.AWS_S3_ENDPOINT_URL = args.endpoint_url
+    settings.CLOUDFRONT_URL = ""
+
+    if args.endpoint_url:
+        backend = nullcontext()
+    else:
+        from moto import mock_aws
+        backend = mock_aws()
+
+    payload = os.urandom(args.size_kb * 1024)
+
+    def new_file():
+        # Fresh bytes each time, otherwise upload_to_s3 dedupes after the first call
+        return SimpleUploadedFile("bench.jpg", os.urandom(16) + payload, content_type="image/jpeg")
+
+    def same_file():
+        return SimpleUploadedFile("bench.jpg", payload, content_type="image/jpeg")
+
+    with backend, test_database():
+        reset_s3_client()
+        try:
+            get_s3_client().create_bucket(Bucket=BUCKET)
+        except Exception:
+            pass  # bucket already exists on a real endpoint
+
+        results = {
+            "benchmark": "s3_upload",
+            "backend": args.endpoint_url or "moto",
+            "size_kb": args.size_kb,
+            "new_client_per_upload": measure(lambda: legacy_upload(new_file()), repeat=args.uploads),
+            "shared_client": measure(lambda: upload_to_s3(new_file(), folder="bench"), repeat=args.uploads),
+            "deduplicated": measure(lambda: upload_to_s3(same_file(), folder="bench"), repeat=args.uploads),
+        }
+        reset_s3_client()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Registration search: indexed full-text search (?q=) vs the old icontains scan.
+
+    python -m benchmarks.bench_search --rows 100000
+"""
+import argparse
+import json
+
+from benchmarks.common import measure, seed_visitors, setup_django, test_database
+
+
+QUERIES = ["ravi", "acme 42", "visitor12345", "priya sharma", "zzzz"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from api.models import VisitorRegistration
+    from api.search import icontains_search, search_registrations
+
+    results = {"benchmark": "search", "rows": args.rows, "queries": {}}
+
+    with test_database() as connection:
+        results["vendor"] = connection.vendor
+        seed_visitors(args.rows)
+
+        base = VisitorRegistration.objects.all()
+        for q in QUERIES:
+            # First page only, like the list endpoint
+            indexed = measure(lambda: list(search_registrations(base, q)[:10]), repeat=args.repeat)
+            scan = measure(lambda: list(icontains_search(base, q).order_by("-created_at")[:10]), repeat=args.repeat)
+            results["queries"][q] = {
+                "matches": search_registrations(base, q).count(),
+                "indexed": indexed,
+                "icontains": scan,
+            }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
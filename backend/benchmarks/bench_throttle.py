@@ -0,0 +1,181 @@
+"""
+Rate limiting under bursts: fires concurrent requests at the throttled
+endpoints and checks that exactly the configured number get through and
+the rest are answered 429 with a Retry-After header. Also times a single
+throttle check against the configured cache.
+
+    python -m benchmarks.bench_throttle --burst 200 --limit 25 --concurrency 16
+
+Exits 1 when a scenario lets through more or fewer requests than the limit.
+Run it with CACHE_BACKEND / CACHE_LOCATION pointing at Redis to check the
+shared-cache path.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+
+from benchmarks.common import BACKEND_DIR, load_test, measure, setup_django, test_database
+
+
+_ids = itertools.count()
+
+
+def burst(path, make_body, remote_addr, requests, concurrency):
+    """Posts `requests` times from `concurrency` threads; returns (stats, status counts, 429s without Retry-After)."""
+    from django.test import Client
+
+    codes = {}
+    missing_retry_after = []
+    lock = threading.Lock()
+
+    def make_worker():
+        client = Client()
+
+        def call():
+            i = next(_ids)
+            response = client.post(path, make_body(i), content_type="application/json", REMOTE_ADDR=remote_addr(i))
+            with lock:
+                codes[response.status_code] = codes.get(response.status_code, 0) + 1
+                if response.status_code == 429 and not response.get("Retry-After"):
+                    missing_retry_after.append(i)
+
+        return call
+
+    stats = load_test(make_worker, requests, concurrency)
+    return stats, codes, len(missing_retry_after)
+
+
+def registration(i, email=None):
+    return {
+        "event_location": "Delhi",
+        "first_name": "Burst",
+        "last_name": f"Visitor {i}",
+        "company_name": "Burst Co",
+        "email_address": email or f"burst{i}@example.com",
+        "phone_number": f"98{i:08d}",
+        "industry_interest": "Textiles",
+    }
+
+
+SCENARIOS = {
+    # scope: (path, body, client IP)
+    "registration": (
+        "/api/visitor-registrations/",
+        registration,
+        lambda i: "203.0.113.10",
+    ),
+    "registration_email": (
+        "/api/visitor-registrations/",
+        lambda i: registration(i, email="same@example.com"),
+        lambda i: f"198.51.{i // 250}.{i % 250}",
+    ),
+    "otp_send": (
+        "/api/password/send-otp/",
+        lambda i: {"email": f"otp{i}@example.com", "token": "not-a-token"},
+        lambda i: "203.0.113.20",
+    ),
+    "otp_send_email": (
+        "/api/password/send-otp/",
+        lambda i: {"email": "victim@example.com", "token": "not-a-token"},
+        lambda i: f"198.51.{i // 250}.{i % 250}",
+    ),
+    "otp_verify": (
+        "/api/password/verify-otp/",
+        lambda i: {"email": f"otp{i}@example.com", "otp": "000000"},
+        lambda i: "203.0.113.30",
+    ),
+    "otp_verify_email": (
+        "/api/password/verify-otp/",
+        lambda i: {"email": "victim@example.com", "otp": f"{i % 1000000:06d}"},
+        lambda i: f"198.51.{i // 250}.{i % 250}",
+    ),
+    "login": (
+        "/api/login/",
+        lambda i: {"username": f"user{i}", "password": "wrong"},
+        lambda i: "203.0.113.40",
+    ),
+    "login_username": (
+        "/api/login/",
+        lambda i: {"username": "admin", "password": f"guess{i}"},
+        lambda i: f"198.51.{i // 250}.{i % 250}",
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--limit", type=int, default=25, help="Allowed requests per scope (rate LIMIT/hour)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ALLOWED_HOSTS", "testserver")
+    setup_django()
+
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import RequestFactory, override_settings
+
+    from api.throttling import RegistrationIPThrottle
+
+    if connection.vendor == "sqlite":
+        # Threads need a shared on-disk database (the in-memory one locks up on writes)
+        connection.settings_dict["TEST"]["NAME"] = str(BACKEND_DIR / "bench_throttle.sqlite3")
+
+    # Every scope gets LIMIT/hour; only the scope under test is enabled per scenario
+    rate = f"{args.limit}/hour"
+    results = {
+        "benchmark": "throttle",
+        "cache": settings.CACHES["default"]["BACKEND"],
+        "burst": args.burst,
+        "limit": args.limit,
+        "concurrency": args.concurrency,
+        "scenarios": {},
+    }
+    failed = False
+
+    with test_database():
+        results["vendor"] = connection.vendor
+        for scope in args.scenarios.split(","):
+            path, make_body, remote_addr = SCENARIOS[scope]
+            cache.clear()
+            rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {scope: rate}}
+            with override_settings(REST_FRAMEWORK=rest_framework):
+                stats, codes, missing = burst(path, make_body, remote_addr, args.burst, args.concurrency)
+
+            allowed = stats["requests"] - codes.get(429, 0) - stats["errors"]
+            ok = allowed == min(args.limit, stats["requests"]) and not missing and not stats["errors"]
+            failed = failed or not ok
+            results["scenarios"][scope] = {
+                **stats,
+                "allowed": allowed,
+                "throttled": codes.get(429, 0),
+                "status_codes": {str(code): count for code, count in sorted(codes.items())},
+                "missing_retry_after": missing,
+                "ok": ok,
+            }
+
+        # Cost of one check (one script call on Redis, an increment and a read elsewhere) on the configured cache
+        cache.clear()
+        request = RequestFactory().post("/api/visitor-registrations/", REMOTE_ADDR="203.0.113.99")
+        rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"registration": "1000000000/hour"}}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            throttle = RegistrationIPThrottle()
+            results["check"] = measure(lambda: throttle.allow_request(request, None), repeat=2000, warmup=50)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every benchmark runs against a throwaway test database (created with the
+normal migrations and destroyed afterwards), so the dev database is never
+touched. Run scripts from the backend directory, e.g.:
+
+    python -m benchmarks.bench_search --rows 100000
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Creates a migrated test database for the duration of the block.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn, repeat=20, warmup=2):
+    """
+    Runs fn() `repeat` times and returns latency stats in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {"runs": repeat, **latency_stats(samples)}
+
+
+def latency_stats(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def load_test(make_worker, requests, concurrency):
+    """
+    Runs `requests` calls spread over `concurrency` threads. make_worker()
+    is called once per thread and returns the callable to time (so each
+    thread can hold its own client / cookies). Returns throughput and
+    latency stats; a call that raises counts as an error.
+    """
+    from django.db import connections
+
+    per_thread = max(1, requests // concurrency)
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        call = make_worker()
+        samples, failed = [], []
+        try:
+            for _ in range(per_thread):
+                start = time.perf_counter()
+                try:
+                    call()
+                except Exception as e:
+                    failed.append(repr(e))
+                    continue
+                samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            connections.close_all()
+        with lock:
+            latencies.extend(samples)
+            errors.extend(failed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "requests": len(latencies) + len(errors),
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+    }
+    if latencies:
+        result.update(latency_stats(latencies))
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+def seed_visitors(count, batch_size=5000):
+    # Same rows as `manage.py seed_data --visitors N`
+    from api.management.commands.seed_data import bulk_insert, visitor_rows
+    from api.models import VisitorRegistration
+
+    return bulk_insert(VisitorRegistration, visitor_rows(count), batch_size)
@@ -0,0 +1,8 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Async views on (api.async_views); see ASGI_MODE in settings
+os.environ.setdefault('ASGI_MODE', 'True')
+
+application = get_asgi_application()
@@ -56,11 +56,30 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per-request timing (Server-Timing header, JSON log lines, /api/metrics/timings/)
+REQUEST_TIMING = config("REQUEST_TIMING", default=False, cast=bool)
+REQUEST_TIMING_WINDOW = config("REQUEST_TIMING_WINDOW", default=1000, cast=int)
+if REQUEST_TIMING:
+    # Outermost so the timings cover every other middleware
+    MIDDLEWARE.insert(0, "api.middleware.RequestTimingMiddleware")
+
+# Prometheus metrics at /metrics. Under gunicorn set PROMETHEUS_MULTIPROC_DIR
+# (an empty, writable directory) so all workers report into one scrape.
+# Scrapes need "Authorization: Bearer <METRICS_TOKEN>"; unset = /metrics answers 403.
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "api.middleware.PrometheusMetricsMiddleware")
+
 # ==============================================
 # URL SETTINGS
 # ==============================================
 ROOT_URLCONF = "config.urls"
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+# Set by config/asgi.py: views built on api.async_views.AsyncViewMixin run
+# as coroutines (upload/delete endpoints await S3 without holding a thread)
+ASGI_MODE = config("ASGI_MODE", default=False, cast=bool)
 
 # ==============================================
 # TEMPLATES
@@ -106,6 +125,7 @@ CORS_ALLOW_HEADERS = [
     "authorization",
     "content-type",
     "dnt",
+    "idempotency-key",
     "origin",
     "user-agent",
     "x-csrftoken",
@@ -148,6 +168,24 @@ FRONTEND_URL = config('FRONTEND_URL', default=FRONTEND_URL)
 # ==============================================
 USE_SQLITE = config("USE_SQLITE", cast=bool, default=True)
 
+# Connection strategy:
+#   "none"       - new connection per request (Django's default)
+#   "persistent" - keep each worker's connection for DB_CONN_MAX_AGE seconds,
+#                  pinged before reuse when DB_CONN_HEALTH_CHECKS is on
+#   "pool"       - psycopg 3 connection pool per worker (Postgres only)
+# Under ASGI every request runs its sync code in a new thread, so persistent
+# connections would pile up (one per finished thread): default to "none" there.
+DB_CONN_MODE = config("DB_CONN_MODE", default="none" if ASGI_MODE else "persistent")
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool)
+DB_CONNECT_TIMEOUT = config("DB_CONNECT_TIMEOUT", default=5, cast=int)  # seconds
+DB_STATEMENT_TIMEOUT = config("DB_STATEMENT_TIMEOUT", default=0, cast=int)  # ms, 0 = off
+DB_POOL_MIN_SIZE = config("DB_POOL_MIN_SIZE", default=1, cast=int)
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", default=4, cast=int)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=10, cast=int)  # seconds waiting for a free connection
+DB_POOL_MAX_IDLE = config("DB_POOL_MAX_IDLE", default=300, cast=int)
+DB_POOL_MAX_LIFETIME = config("DB_POOL_MAX_LIFETIME", default=1800, cast=int)
+
 if USE_SQLITE:
     DATABASES = {
         "default": {
@@ -164,9 +202,63 @@ else:
             "PASSWORD": config("DB_PASSWORD"),
             "HOST": config("DB_HOST"),
             "PORT": config("DB_PORT", default="5432"),
+            "OPTIONS": {
+                "connect_timeout": DB_CONNECT_TIMEOUT,
+            },
         }
     }
 
+    if DB_STATEMENT_TIMEOUT:
+        DATABASES["default"]["OPTIONS"]["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT}"
+
+    if DB_CONN_MODE == "pool":
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+            "max_idle": DB_POOL_MAX_IDLE,
+            "max_lifetime": DB_POOL_MAX_LIFETIME,
+        }
+
+# Django refuses CONN_MAX_AGE together with a pool
+_persistent = DB_CONN_MODE == "persistent"
+DATABASES["default"]["CONN_MAX_AGE"] = DB_CONN_MAX_AGE if _persistent else 0
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = _persistent and DB_CONN_HEALTH_CHECKS
+
+# ==============================================
+# CACHE
+# Local memory by default; set CACHE_BACKEND / CACHE_LOCATION to a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) so every
+# gunicorn worker sees the same entries.
+# ==============================================
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default="igtf-default"),
+    }
+}
+
+# Seconds between real DB probes behind the health check endpoint
+HEALTH_CHECK_INTERVAL = config("HEALTH_CHECK_INTERVAL", default=30, cast=int)
+
+# Upper bound for cached public category/event/gallery responses. Changes
+# invalidate them immediately in every worker only with a shared CACHE_BACKEND.
+PUBLIC_CACHE_TIMEOUT = config("PUBLIC_CACHE_TIMEOUT", default=300, cast=int)
+
+# Upper bound on stale dashboard stats. Writes drop the cached stats at once
+# in every worker only with a shared CACHE_BACKEND; with the per-process
+# default, other workers catch up when their entry expires.
+REGISTRATION_STATS_CACHE_TIMEOUT = config("REGISTRATION_STATS_CACHE_TIMEOUT", default=60, cast=int)
+
+# OTP storage shared by all workers. DatabaseOTPStore works everywhere;
+# api.otp.CacheOTPStore needs a shared CACHE_BACKEND (Redis, DB cache...)
+OTP_STORE = {
+    "BACKEND": config("OTP_STORE_BACKEND", default="api.otp.DatabaseOTPStore"),
+    "CACHE_ALIAS": "default",  # CacheOTPStore only
+    "TTL": 300,  # seconds
+    "MAX_ATTEMPTS": 5,
+}
+
 # ==============================================
 # PASSWORD VALIDATION
 # ==============================================
@@ -205,6 +297,23 @@ AWS_S3_REGION_NAME = config("AWS_S3_REGION_NAME", default="")
 AWS_S3_CUSTOM_DOMAIN = config("AWS_S3_CUSTOM_DOMAIN", default="")
 AWS_LOCATION = config("AWS_LOCATION", default="")
 
+# Shared boto3 client / transfer tuning (api.utils.get_s3_client)
+AWS_S3_ENDPOINT_URL = config("AWS_S3_ENDPOINT_URL", default="")  # MinIO / local S3 stand-in
+AWS_S3_MAX_POOL_CONNECTIONS = config("AWS_S3_MAX_POOL_CONNECTIONS", default=20, cast=int)
+AWS_S3_MULTIPART_THRESHOLD_MB = config("AWS_S3_MULTIPART_THRESHOLD_MB", default=8, cast=int)
+AWS_S3_MULTIPART_CHUNKSIZE_MB = config("AWS_S3_MULTIPART_CHUNKSIZE_MB", default=8, cast=int)
+AWS_S3_MAX_CONCURRENCY = config("AWS_S3_MAX_CONCURRENCY", default=4, cast=int)
+
+# Parallel S3 uploads per gallery batch request
+GALLERY_UPLOAD_WORKERS = config("GALLERY_UPLOAD_WORKERS", default=4, cast=int)
+
+# Responsive image variants (api.utils.schedule_image_variants)
+IMAGE_VARIANT_WIDTHS = (480, 960, 1600)
+IMAGE_VARIANT_FORMATS = ("webp", "avif")  # formats Pillow can't encode are skipped
+IMAGE_VARIANT_QUALITY = 75
+IMAGE_PROCESSING_WORKERS = config("IMAGE_PROCESSING_WORKERS", default=2, cast=int)
+IMAGE_PROCESSING_SYNC = config("IMAGE_PROCESSING_SYNC", default=False, cast=bool)
+
 if AWS_STORAGE_BUCKET_NAME:
     DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
     MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/{AWS_LOCATION}/"
@@ -222,14 +331,36 @@ AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "max-age=86400"}
 # ==============================================
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Per-endpoint sliding-window limits (api/throttling.py) kept in the "default"
+    # cache: limits hold across workers/instances only with a shared CACHE_BACKEND.
+    # An empty rate turns that scope off; THROTTLE_ENABLED=False turns off all.
+    "DEFAULT_THROTTLE_RATES": {
+        "registration": config("THROTTLE_REGISTRATION", default="30/min"),
+        "registration_email": config("THROTTLE_REGISTRATION_EMAIL", default="10/hour"),
+        "otp_send": config("THROTTLE_OTP_SEND", default="10/hour"),
+        "otp_send_email": config("THROTTLE_OTP_SEND_EMAIL", default="5/hour"),
+        "otp_verify": config("THROTTLE_OTP_VERIFY", default="30/hour"),
+        "otp_verify_email": config("THROTTLE_OTP_VERIFY_EMAIL", default="10/hour"),
+        "login": config("THROTTLE_LOGIN", default="20/min"),
+        "login_username": config("THROTTLE_LOGIN_USERNAME", default="10/min"),
+    },
+    # Trusted proxies appending to X-Forwarded-For in front of gunicorn, so
+    # throttles key on the real client IP and not on a client-supplied header.
+    # Default 0 (REMOTE_ADDR only): a count above the real number of proxies
+    # lets clients pick their IP and walk past every limit. Behind a proxy
+    # all clients then share one IP bucket, so set it: 2 on Elastic
+    # Beanstalk (load balancer + nginx), 1 behind nginx only.
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
 }
+if not config("THROTTLE_ENABLED", default=True, cast=bool):
+    REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] = {}
 
 # ==============================================
 # SIMPLE JWT SETTINGS
@@ -243,6 +374,12 @@ SIMPLE_JWT = {
     # "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Per-process cache of the authenticated User (api/authentication.py):
+# seconds an entry is trusted (0 = query on every request) and max entries.
+# Read-only dashboard endpoints skip the lookup and use the token claims.
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=30, cast=int)
+AUTH_USER_CACHE_SIZE = config("AUTH_USER_CACHE_SIZE", default=1024, cast=int)
+
 # ==============================================
 # EMAIL CONFIG
 # ==============================================
@@ -253,7 +390,49 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 
+# Views only queue mail; `manage.py send_queued_mail --loop` delivers it
+EMAIL_QUEUE_MAX_ATTEMPTS = config("EMAIL_QUEUE_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_QUEUE_RETRY_DELAY = config("EMAIL_QUEUE_RETRY_DELAY", default=30, cast=int)  # seconds, doubles per attempt
+# A batch claimed by a worker that died is picked up again after this many seconds
+EMAIL_QUEUE_LEASE_SECONDS = config("EMAIL_QUEUE_LEASE_SECONDS", default=300, cast=int)
+# Sent/failed rows (bodies already cleared) are deleted by the worker after this many days
+EMAIL_QUEUE_RETENTION_DAYS = config("EMAIL_QUEUE_RETENTION_DAYS", default=7, cast=int)
+
+# ==============================================
+# REGISTRATION INGESTION (api.ingest)
+# "direct" saves each submission in the request. "buffered" validates it,
+# appends it to a local journal and answers 202; a flusher bulk-inserts
+# closed journal segments every REGISTRATION_FLUSH_INTERVAL seconds.
+# ==============================================
+# Replays of POSTs with the same Idempotency-Key header within this window get the first response
+REGISTRATION_IDEMPOTENCY_TTL = config("REGISTRATION_IDEMPOTENCY_TTL", default=600, cast=int)  # seconds
+REGISTRATION_INGEST_MODE = config("REGISTRATION_INGEST_MODE", default="direct")
+REGISTRATION_JOURNAL_DIR = config("REGISTRATION_JOURNAL_DIR", default=str(BASE_DIR / "var" / "registration-journal"))
+# fsync: on disk before the 202 (survives a host crash); write: handed to the OS (survives a worker crash)
+REGISTRATION_JOURNAL_SYNC = config("REGISTRATION_JOURNAL_SYNC", default="fsync")
+REGISTRATION_JOURNAL_SEGMENT_SECONDS = config("REGISTRATION_JOURNAL_SEGMENT_SECONDS", default=1.0, cast=float)
+REGISTRATION_FLUSH_BATCH_SIZE = config("REGISTRATION_FLUSH_BATCH_SIZE", default=1000, cast=int)
+REGISTRATION_FLUSH_INTERVAL = config("REGISTRATION_FLUSH_INTERVAL", default=1.0, cast=float)
+# Each web process flushes the journal directory itself; turn off when a
+# dedicated `manage.py flush_registrations --loop` runs on the same host
+REGISTRATION_FLUSH_IN_PROCESS = config("REGISTRATION_FLUSH_IN_PROCESS", default=True, cast=bool)
+
 # ==============================================
 # DEFAULT AUTO FIELD
 # ==============================================
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# ==============================================
+# LOGGING
+# ==============================================
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # One JSON line per request when REQUEST_TIMING is on
+        "api.timing": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
@@ -0,0 +1,19 @@
+# Picked up automatically by `gunicorn config.wsgi` (see Procfile)
+import glob
+import os
+
+
+def on_starting(server):
+    # Stale per-worker metric files from a previous run would be merged in
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for name in glob.glob(os.path.join(path, "*.db")):
+            os.remove(name)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -14,46 +14,29 @@ export default function AboutPage() {
 
   type GalleryItem = { image: string };
 
-  const loadImages = async (
-    section: string,
-    setter: (v: string[]) => void
-  ) => {
-    try {
-      const res = await fetch(
-        `${process.env.NEXT_PUBLIC_API_BASE_URL}/gallery/?page=about&section=${section}`,
-        { cache: "no-store" }
-      );
-
-      if (!res.ok) return;
-
-      const data = await res.json();
-
-      const items: GalleryItem[] = Array.isArray(data)
-        ? data
-        : (data.results ?? []);
-
-      setter(items.map((img) => img.image));
-    } catch (err) {
-    }
-  };
-
   useEffect(() => {
-    // Load Banner
+    // One prebuilt response instead of a request per section
     (async () => {
       try {
         const res = await fetch(
-          `${process.env.NEXT_PUBLIC_API_BASE_URL}/gallery/?page=about&section=banner`,
-          { cache: "no-store" }
+          `${process.env.NEXT_PUBLIC_API_BASE_URL}/public/bundle/`,
+          { cache: "no-cache" }
         );
+
+        if (!res.ok) return;
+
         const data = await res.json();
-        const items = Array.isArray(data) ? data : data.results ?? [];
-        if (items.length > 0) setBanner(items[0].image);
+        const about: Record<string, GalleryItem[]> = data?.gallery?.about ?? {};
+        const images = (section: string) =>
+          (about[section] ?? []).map((img) => img.image);
+
+        const banners = images("banner");
+        if (banners.length > 0) setBanner(banners[0]);
+        setWhyExhibitImages(images("why_exhibit"));
+        setWhyChooseImages(images("why_choose_igtf"));
       } catch (err) {
       }
     })();
-
-    loadImages("why_exhibit", setWhyExhibitImages);
-    loadImages("why_choose_igtf", setWhyChooseImages);
   }, []);
 
   return (
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Navbar } from "@/components/navbar";
 import { ChatBot } from "@/components/chat-bot";
 import { Calendar, Clock, MapPin } from "lucide-react";
@@ -51,6 +51,8 @@ export default function ExhibitionPage() {
 
   const [events, setEvents] = useState<EventData[]>([]);
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // One key per submission: double-clicks and retries reuse it, edits start a new one
+  const idempotencyKey = useRef<string | null>(null);
   const [loadingEvents, setLoadingEvents] = useState(true);
 
   // ------------------------------------------------------------------
@@ -115,6 +117,7 @@ export default function ExhibitionPage() {
 
   const handleChange = (e: any) => {
     const { name, value } = e.target;
+    idempotencyKey.current = null;
     setFormData((prev) => ({
       ...prev,
       [name]: value,
@@ -124,11 +127,15 @@ export default function ExhibitionPage() {
   const handleSubmit = async (e: any) => {
     e.preventDefault();
     setIsSubmitting(true);
+    const key = (idempotencyKey.current ??= crypto.randomUUID());
 
     try {
       const response = await fetch(API_URL, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: {
+          "Content-Type": "application/json",
+          "Idempotency-Key": key,
+        },
         body: JSON.stringify(formData),
       });
 
@@ -136,6 +143,7 @@ export default function ExhibitionPage() {
 
       if (response.ok) {
         toast.success("Registration submitted successfully!");
+        idempotencyKey.current = null;
 
         setFormData({
           company_name: "",
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Navbar } from "@/components/navbar";
 import { Footer } from "@/components/footer";
 import { ChatBot } from "@/components/chat-bot";
@@ -32,6 +32,8 @@ export default function VisitorsPage() {
   });
 
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // One key per submission: double-clicks and retries reuse it, edits start a new one
+  const idempotencyKey = useRef<string | null>(null);
   const [events, setEvents] = useState<any[]>([]);
 
   useEffect(() => {
@@ -61,6 +63,7 @@ export default function VisitorsPage() {
     e: React.ChangeEvent<HTMLInputElement | HTMLSelectElement>
   ) => {
     const { name, value } = e.target;
+    idempotencyKey.current = null;
     setFormData((prev) => ({
       ...prev,
       [name]: value,
@@ -70,17 +73,22 @@ export default function VisitorsPage() {
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setIsSubmitting(true);
+    const key = (idempotencyKey.current ??= crypto.randomUUID());
 
     try {
       const response = await fetch(API_URL, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: {
+          "Content-Type": "application/json",
+          "Idempotency-Key": key,
+        },
         body: JSON.stringify(formData),
         mode: "cors",
       });
 
       if (response.ok) {
         toast.success("Registration submitted successfully!");
+        idempotencyKey.current = null;
 
         setFormData({
           first_name: "",
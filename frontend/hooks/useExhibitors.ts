@@ -9,6 +9,8 @@ export function useExhibitors(enabled: boolean) {
   const authFetch = useAuthFetch();
 
   const [exhibitors, setExhibitors] = useState<ExhibitorRegistration[]>([]);
+  const [statusCounts, setStatusCounts] = useState<Record<string, number>>({});
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
   const [isUpdating, setIsUpdating] = useState(false);
 
@@ -45,6 +47,14 @@ export function useExhibitors(enabled: boolean) {
       }));
 
       setExhibitors(normalized);
+
+      // Counts come from the server so they cover every page
+      const statsRes = await authFetch(`${EXHIBITORS_URL}stats/`);
+      if (statsRes.ok) {
+        const statsData = await statsRes.json();
+        setStatusCounts(statsData.status ?? {});
+        setTotal(statsData.total ?? 0);
+      }
     } catch (err) {
       setExhibitors([]);
     } finally {
@@ -102,13 +112,11 @@ export function useExhibitors(enabled: boolean) {
   // STATS
   // -------------------------------------------------------------
   const stats = {
-    totalExhibitors: exhibitors.length,
-    paidExhibitors: exhibitors.filter((e) => e.status === "paid").length,
-    contactedExhibitors: exhibitors.filter((e) => e.status === "contacted")
-      .length,
-    pendingExhibitors: exhibitors.filter((e) => e.status === "pending").length,
-    rejectedExhibitors: exhibitors.filter((e) => e.status === "rejected")
-      .length,
+    totalExhibitors: total,
+    paidExhibitors: statusCounts.paid ?? 0,
+    contactedExhibitors: statusCounts.contacted ?? 0,
+    pendingExhibitors: statusCounts.pending ?? 0,
+    rejectedExhibitors: statusCounts.rejected ?? 0,
   };
 
   return {
@@ -14,6 +14,8 @@ export function useVisitors(enabled: boolean) {
   const VISITORS_URL = `${BASE}/visitor-registrations/`;
 
   const [visitors, setVisitors] = useState<VisitorRegistration[]>([]);
+  const [statusCounts, setStatusCounts] = useState<Record<string, number>>({});
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
   const [isUpdating, setIsUpdating] = useState(false);
 
@@ -41,6 +43,14 @@ export function useVisitors(enabled: boolean) {
         : [];
 
       setVisitors(list);
+
+      // Counts come from the server so they cover every page
+      const statsRes = await authFetch(`${VISITORS_URL}stats/`);
+      if (statsRes.ok) {
+        const statsData = await statsRes.json();
+        setStatusCounts(statsData.status ?? {});
+        setTotal(statsData.total ?? 0);
+      }
     } catch (err) {
       setVisitors([]);
     } finally {
@@ -92,11 +102,11 @@ export function useVisitors(enabled: boolean) {
   // STATS
   // ---------------------------------------------------------
   const stats = {
-    totalVisitors: visitors.length,
-    pendingVisitors: visitors.filter((v) => v.status === "pending").length,
-    contactedVisitors: visitors.filter((v) => v.status === "contacted").length,
-    paidVisitors: visitors.filter((v) => v.status === "paid").length,
-    rejectedVisitors: visitors.filter((v) => v.status === "rejected").length,
+    totalVisitors: total,
+    pendingVisitors: statusCounts.pending ?? 0,
+    contactedVisitors: statusCounts.contacted ?? 0,
+    paidVisitors: statusCounts.paid ?? 0,
+    rejectedVisitors: statusCounts.rejected ?? 0,
   };
 
   return {
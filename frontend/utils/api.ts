@@ -9,6 +9,7 @@ export const URLS = {
   EVENTS: `${BASE_URL}/events/`,
   CATEGORIES: `${BASE_URL}/categories/`,
   GALLERY: `${BASE_URL}/gallery/`,
+  PUBLIC_BUNDLE: `${BASE_URL}/public/bundle/`,
 };
 
 // --- Helper ---